@@ -1,10 +1,16 @@
 import json
+import logging
+import os
+import threading
+import time
 import uuid
 from datetime import timedelta
 
 from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
+from django.utils.encoding import force_str
+from django_redis import get_redis_connection
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.settings import api_settings
@@ -12,6 +18,8 @@ from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
 from users.models import User
 
+logger = logging.getLogger(__name__)
+
 # Grace period in seconds - old tokens still work during this window after refresh
 REFRESH_GRACE_PERIOD = 60
 
@@ -20,6 +28,51 @@ GRACE_KEY_PREFIX = "jwt:grace:"
 REVOKED_KEY_PREFIX = "jwt:revoked:"
 WHITELIST_KEY_PREFIX = "jwt:whitelist:"
 
+# Pub/sub channel used to evict revoked sessions from every process' local cache
+REVOCATION_CHANNEL = "jwt:revocations"
+
+_MISSING = object()
+
+
+class _LocalTTLCache:
+    """
+    Minimal in-process cache with per-entry expiry.
+    Used to avoid a Redis round trip for every authenticated request,
+    so entries may be stale for up to their TTL.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._data: dict[str, tuple[float, object]] = {}
+
+    def get(self, key: str, default=_MISSING):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+
+        return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        if len(self._data) >= self.max_size:
+            self._data.clear()
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_local_enforce_at = _LocalTTLCache()
+_listener_pid: int | None = None
+_listener_lock = threading.Lock()
+
 
 def _get_grace_key(session_id: str) -> str:
     """Grace period cache key - ensures one set of tokens per session."""
@@ -47,11 +100,80 @@ def is_token_whitelisted(session_id: str, iat: int) -> bool:
     return cache.get(key) is not None
 
 
+def _listen_for_revocations() -> None:
+    """
+    Evicts locally cached sessions as revocations are published by any process.
+    Reconnects on failure, dropping the whole local cache since messages
+    may have been missed while disconnected.
+    """
+
+    while True:
+        try:
+            pubsub = get_redis_connection("default").pubsub(
+                ignore_subscribe_messages=True
+            )
+            pubsub.subscribe(REVOCATION_CHANNEL)
+
+            for message in pubsub.listen():
+                _local_enforce_at.delete(force_str(message["data"]))
+        except Exception:
+            logger.exception("JWT revocation listener disconnected")
+
+        _local_enforce_at.clear()
+        time.sleep(1)
+
+
+def _ensure_revocation_listener() -> None:
+    """
+    Lazily starts the pub/sub listener thread.
+    Tracks the pid so forked workers start their own listener.
+    """
+
+    global _listener_pid
+
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+
+    with _listener_lock:
+        if _listener_pid == pid:
+            return
+
+        _local_enforce_at.clear()
+        threading.Thread(
+            target=_listen_for_revocations,
+            name="jwt-revocation-listener",
+            daemon=True,
+        ).start()
+        _listener_pid = pid
+
+
 def get_session_enforce_at(session_id: str) -> int | None:
-    """Get the enforcement timestamp for session revocation."""
+    """
+    Get the enforcement timestamp for session revocation.
+
+    Values are cached in process memory for JWT_SESSION_LOCAL_CACHE_TTL seconds.
+    Logouts are broadcast to all processes to evict their entries early, but
+    delivery is best effort: a revocation is only guaranteed to take effect
+    everywhere within the local TTL.
+    """
+    local_ttl = settings.JWT_SESSION_LOCAL_CACHE_TTL
+
+    if local_ttl:
+        _ensure_revocation_listener()
+        value = _local_enforce_at.get(session_id)
+
+        if value is not _MISSING:
+            return value
+
     key = _get_revoked_key(session_id)
     value = cache.get(key)
-    return int(value) if value is not None else None
+    value = int(value) if value is not None else None
+
+    if local_ttl:
+        _local_enforce_at.set(session_id, value, local_ttl)
+
+    return value
 
 
 def set_session_enforce_at(session_id: str, enforce_at: int) -> None:
@@ -63,6 +185,8 @@ def set_session_enforce_at(session_id: str, enforce_at: int) -> None:
     ttl = int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds())
     cache.set(key, enforce_at, timeout=ttl)
 
+    _local_enforce_at.delete(session_id)
+
 
 def is_token_revoked(token) -> bool:
     """
@@ -216,11 +340,19 @@ def refresh_tokens_with_grace_period(refresh_token_str: str) -> dict:
 
 def revoke_session(session_id: str) -> None:
     """
-    Immediately revoke all tokens for a session (no grace period).
+    Revoke all tokens for a session (no grace period).
+    Other processes pick it up within JWT_SESSION_LOCAL_CACHE_TTL seconds.
     Call this on logout.
     """
     set_session_enforce_at(session_id, 0)
 
+    try:
+        get_redis_connection("default").publish(REVOCATION_CHANNEL, session_id)
+    except Exception:
+        # Other processes will still pick the revocation up once
+        # their local entry expires
+        logger.exception("Failed to broadcast session revocation")
+
 
 def revoke_all_user_tokens(user: User) -> None:
     """
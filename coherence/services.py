@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 from typing import Iterable
 
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 
 from coherence.models import (
@@ -12,8 +13,7 @@ from coherence.models import (
     LinkType,
     AggregateCoherenceLinkVote,
 )
-from questions.models import Question
-from questions.services.forecasts import get_user_last_forecasts_map
+from questions.models import Forecast, Question
 from users.models import User
 
 
@@ -103,29 +103,90 @@ def get_links_for_question(question: Question, user: User):
     return links
 
 
+def get_last_forecast_times_map(
+    user_ids: Iterable[int], question_ids: Iterable[int]
+) -> dict[tuple[int, int], datetime]:
+    """
+    Start time of the latest forecast per (user_id, question_id) pair,
+    fetched in a single window-function query
+    """
+
+    qs = (
+        Forecast.objects.filter(author_id__in=user_ids, question_id__in=question_ids)
+        .annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F("author_id"), F("question_id")],
+                order_by=[F("start_time").desc(), F("id").desc()],
+            )
+        )
+        .filter(row_number=1)
+        .values_list("author_id", "question_id", "start_time")
+    )
+
+    return {
+        (user_id, question_id): start_time for user_id, question_id, start_time in qs
+    }
+
+
+def get_stale_links(
+    links: Iterable[CoherenceLink], last_datetime: datetime
+) -> list[CoherenceLink]:
+    """
+    Links whose author updated their question1 forecast after `last_datetime`
+    without updating their forecast on question2 since then
+    """
+
+    links = list(links)
+    last_forecast_times = get_last_forecast_times_map(
+        {link.user_id for link in links},
+        {q_id for link in links for q_id in (link.question1_id, link.question2_id)},
+    )
+
+    stale_links = []
+
+    for link in links:
+        question_forecast_time = last_forecast_times.get(
+            (link.user_id, link.question1_id)
+        )
+
+        if not question_forecast_time or last_datetime > question_forecast_time:
+            continue
+
+        linked_forecast_time = last_forecast_times.get(
+            (link.user_id, link.question2_id)
+        )
+
+        if not linked_forecast_time or linked_forecast_time < question_forecast_time:
+            stale_links.append(link)
+
+    return stale_links
+
+
 def get_stale_linked_questions(
     links: list[CoherenceLink], question: Question, user: User, last_datetime: datetime
 ):
-    questions = [link.question2 for link in links]
-
-    # In order to avoid making a separate query
-    questions.append(question)
-    last_forecast_map = get_user_last_forecasts_map(questions, user=user)
-    question_last_forecast = last_forecast_map.get(question, None)
+    questions = list({link.question2: None for link in links})
+    last_forecast_times = get_last_forecast_times_map(
+        [user.id], [question.id] + [q.id for q in questions]
+    )
+    question_forecast_time = last_forecast_times.get((user.id, question.id))
 
-    if not question_last_forecast:
+    if not question_forecast_time or last_datetime > question_forecast_time:
         return []
 
-    question_forecast_time = question_last_forecast.start_time
-    if last_datetime > question_forecast_time:
-        return []
+    stale_questions = []
+
+    for linked_question in questions:
+        if linked_question.id == question.id:
+            continue
+
+        linked_forecast_time = last_forecast_times.get((user.id, linked_question.id))
+
+        if not linked_forecast_time or linked_forecast_time < question_forecast_time:
+            stale_questions.append(linked_question)
 
-    return [
-        current_question
-        for current_question, last_forecast in last_forecast_map.items()
-        if current_question.id != question.id
-        and (not last_forecast or last_forecast.start_time < question_forecast_time)
-    ]
+    return stale_questions
 
 
 @transaction.atomic
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.16 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+def backfill_children_count(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE comments_comment c
+            SET children_count = sub.cnt
+            FROM (SELECT parent_id, COUNT(*) AS cnt
+                  FROM comments_comment
+                  WHERE parent_id IS NOT NULL
+                    AND is_soft_deleted = false
+                  GROUP BY parent_id) sub
+            WHERE c.id = sub.parent_id
+            """
+        )
+        print(f"\n  children_count: {cursor.rowcount} rows updated")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0026_comment_key_factor_votes_score"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="children_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["root", "created_at"], name="comment_root_created_at_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_children_count, migrations.RunPython.noop),
+    ]
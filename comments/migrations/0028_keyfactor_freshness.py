@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+def backfill_freshness(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH decay AS (
+                SELECT kf.id,
+                       kf.base_rate_id IS NOT NULL AS is_base_rate,
+                       GREATEST(
+                           GREATEST(
+                               EXTRACT(
+                                   EPOCH FROM NOW() - CASE
+                                       WHEN kf.question_id IS NOT NULL THEN q.open_time
+                                       ELSE p.open_time
+                                   END
+                               )::float / 86400,
+                               0
+                           ) / CASE WHEN kf.driver_id IS NOT NULL THEN 5 ELSE 10 END,
+                           14
+                       ) AS half_life
+                FROM comments_keyfactor kf
+                JOIN comments_comment c ON c.id = kf.comment_id
+                JOIN posts_post p ON p.id = c.on_post_id
+                LEFT JOIN questions_question q ON q.id = kf.question_id
+            ),
+            votes AS (
+                SELECT d.id,
+                       d.is_base_rate,
+                       v.score,
+                       POWER(
+                           2,
+                           -EXTRACT(EPOCH FROM NOW() - v.created_at)::float
+                           / 86400
+                           / d.half_life
+                       ) AS weight
+                FROM decay d
+                LEFT JOIN comments_keyfactorvote v ON v.key_factor_id = d.id
+            ),
+            stats AS (
+                SELECT id,
+                       is_base_rate,
+                       COUNT(score) AS votes_count,
+                       COALESCE(SUM(score), 0) AS scores_sum,
+                       COALESCE(SUM(weight), 0) AS weights_sum,
+                       COALESCE(SUM(score * weight), 0) AS strengths_sum
+                FROM votes
+                GROUP BY id, is_base_rate
+            )
+            UPDATE comments_keyfactor kf
+            SET freshness = CASE
+                WHEN s.is_base_rate THEN
+                    GREATEST(s.scores_sum::float / GREATEST(s.votes_count, 1), 0)
+                ELSE
+                    (s.strengths_sum + 2 * GREATEST(3 - s.weights_sum, 0))
+                    / GREATEST(s.weights_sum, 3)
+            END
+            FROM stats s
+            WHERE kf.id = s.id
+            """
+        )
+        print(f"\n  freshness: {cursor.rowcount} rows updated")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0027_comment_children_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="keyfactor",
+            name="freshness",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_freshness, migrations.RunPython.noop),
+    ]
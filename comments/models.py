@@ -15,6 +15,7 @@ from django.db.models import (
     Exists,
     Value,
     Func,
+    F,
 )
 from django.db.models.functions import Coalesce
 from django.db.models.lookups import Exact
@@ -48,7 +49,8 @@ class CommentQuerySet(models.QuerySet):
         return self.prefetch_related("included_forecast")
 
     def annotate_cmm_info(self, user):
-        changed_my_mind_count = Count("changedmymindentry")
+        # Denormalized counter, maintained by `Comment.update_cmm_count`
+        changed_my_mind_count = F("cmm_count")
         user_has_changed_my_mind = Value(False, output_field=BooleanField())
 
         if user and user.is_authenticated:
@@ -117,6 +119,9 @@ class Comment(TimeStampedModel, TranslatedModel):
     # Denormalized fields
     vote_score = models.IntegerField(default=0, db_index=True, editable=False)
     cmm_count = models.IntegerField(default=0, db_index=True, editable=False)
+    # Number of direct replies that are not soft-deleted.
+    # Soft-deleted comments with live replies are still displayed in the feed
+    children_count = models.IntegerField(default=0, editable=False)
     key_factor_votes_score = models.FloatField(default=0, db_index=True, editable=False)
     text_original_search_vector = SearchVectorField(null=True, editable=False)
 
@@ -142,6 +147,11 @@ class Comment(TimeStampedModel, TranslatedModel):
                 fields=["created_at"],
                 name="comment_created_at_idx",
             ),
+            # Fetching whole threads for a page of root comments
+            models.Index(
+                fields=["root", "created_at"],
+                name="comment_root_created_at_idx",
+            ),
             GinIndex(
                 fields=["text_original_search_vector"],
                 name="comment_text_search_vector_idx",
@@ -166,6 +176,29 @@ class Comment(TimeStampedModel, TranslatedModel):
                 )
             )
 
+        if self.parent_id and (not update_fields or "is_soft_deleted" in update_fields):
+            Comment.update_children_count(self.parent_id)
+
+    @classmethod
+    def update_children_count(cls, comment_id: int):
+        """
+        Recounts live direct replies of the given comment in a single statement,
+        so concurrent replies/deletions can't leave the counter drifting
+        """
+
+        cls.objects.filter(pk=comment_id).update(
+            children_count=Coalesce(
+                Subquery(
+                    cls.objects.filter(parent_id=comment_id, is_soft_deleted=False)
+                    .values("parent_id")
+                    .annotate(count=Count("id"))
+                    .values("count")[:1],
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+        )
+
     def update_vote_score(self):
         score = self.comment_votes.aggregate(total=Coalesce(Sum("direction"), 0))[
             "total"
@@ -334,6 +367,9 @@ class KeyFactorNews(TimeStampedModel):
 class KeyFactor(TimeStampedModel):
     comment = models.ForeignKey(Comment, models.CASCADE, related_name="key_factors")
     votes_score = models.FloatField(default=0, db_index=True, editable=False)
+    # Denormalized time-decayed votes score.
+    # Refreshed on every vote and periodically by the decay job
+    freshness = models.FloatField(default=0, editable=False)
     is_active = models.BooleanField(default=True, db_index=True)
 
     # If KeyFactor is specifically linked to the subquestion
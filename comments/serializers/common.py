@@ -218,7 +218,7 @@ def serialize_comment_many(
 
     # Get original ordering of the comments
     ids = [p.pk for p in comments]
-    qs = Comment.objects.filter(pk__in=[c.pk for c in comments])
+    qs = Comment.objects.filter(pk__in=ids)
 
     qs = qs.select_related(
         "included_forecast__question", "author", "on_post"
@@ -229,8 +229,9 @@ def serialize_comment_many(
     qs = qs.annotate_cmm_info(current_user)
 
     # Restore the original ordering
+    positions = {pk: idx for idx, pk in enumerate(ids)}
     objects = list(qs.all())
-    objects.sort(key=lambda obj: ids.index(obj.id))
+    objects.sort(key=lambda obj: positions[obj.id])
 
     # Extracting staff users
     post_staff_users_map = get_posts_staff_users(
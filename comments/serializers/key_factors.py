@@ -1,4 +1,3 @@
-from collections import Counter
 from typing import Iterable
 
 from rest_framework import serializers
@@ -8,14 +7,10 @@ from comments.models import (
     KeyFactor,
     KeyFactorDriver,
     ImpactDirection,
-    KeyFactorVote,
     KeyFactorBaseRate,
     KeyFactorNews,
 )
-from comments.services.key_factors.common import (
-    get_votes_for_key_factors,
-    calculate_key_factors_freshness,
-)
+from comments.services.key_factors.common import get_key_factors_vote_counts
 from questions.models import Question
 from users.models import User
 from users.serializers import BaseUserSerializer
@@ -24,27 +19,24 @@ from utils.dtypes import generate_map_from_list
 
 def serialize_key_factor_votes(
     key_factor: KeyFactor,
-    vote_scores: list[KeyFactorVote],
+    vote_counts: dict[int, int],
     user_vote: int = None,
     user_vote_reason: str = None,
 ):
-    pivot_votes = Counter([v.score for v in vote_scores])
-
     return {
         "score": key_factor.votes_score,
         "aggregated_data": [
-            {"score": score, "count": count} for score, count in pivot_votes.items()
+            {"score": score, "count": count} for score, count in vote_counts.items()
         ],
         "user_vote": user_vote,
         "user_vote_reason": user_vote_reason,
-        "count": len(vote_scores),
+        "count": sum(vote_counts.values()),
     }
 
 
 def serialize_key_factor(
     key_factor: KeyFactor,
-    vote_scores: list[KeyFactorVote] = None,
-    freshness: float = None,
+    vote_counts: dict[int, int] = None,
     question: Question = None,
     question_type: Question.QuestionType = None,
     unit: str = None,
@@ -56,7 +48,7 @@ def serialize_key_factor(
         "created_at": key_factor.created_at.isoformat(),
         "vote": serialize_key_factor_votes(
             key_factor,
-            vote_scores or [],
+            vote_counts or {},
             user_vote=key_factor.user_vote,
             user_vote_reason=key_factor.user_vote_reason,
         ),
@@ -71,7 +63,7 @@ def serialize_key_factor(
             else None
         ),
         "question_option": key_factor.question_option,
-        "freshness": freshness or 0,
+        "freshness": key_factor.freshness,
         # Type-specific fields
         "driver": (
             KeyFactorDriverSerializer(key_factor.driver).data
@@ -119,11 +111,8 @@ def serialize_key_factors_many(
     objects = list(qs.all())
     objects.sort(key=lambda obj: ids.index(obj.id))
 
-    # Extract user votes
-    votes_map = get_votes_for_key_factors(objects)
-
-    # Generate freshness
-    freshness_map = calculate_key_factors_freshness(objects, votes_map)
+    # Aggregate votes
+    vote_counts_map = get_key_factors_vote_counts(objects)
 
     # Fetch post questions
     post_questions_map = generate_map_from_list(
@@ -149,8 +138,7 @@ def serialize_key_factors_many(
         serialized_data.append(
             serialize_key_factor(
                 key_factor,
-                vote_scores=votes_map.get(key_factor.id),
-                freshness=freshness_map.get(key_factor),
+                vote_counts=vote_counts_map.get(key_factor.id),
                 question=key_factor.question,
                 question_type=question_type,
                 unit=unit,
@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta
 
 from django.contrib.postgres.search import SearchQuery, SearchRank
-from django.db.models import F, Q, Case, When, Value, IntegerField, Exists, OuterRef
+from django.db.models import F, Q, Case, When, Value, IntegerField
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from comments.constants import TimeWindow
@@ -62,29 +63,29 @@ def get_comments_feed(
 
         # Prioritize threads with unread comments for the current user
         if last_viewed_at:
-            unread_comments = Comment.objects.filter(
-                on_post=post,
-                created_at__gt=last_viewed_at,
-                is_soft_deleted=False,
-                is_private=False,
+            # Evaluated as a subquery of the feed query
+            unread_root_ids = (
+                Comment.objects.filter(
+                    on_post=post,
+                    created_at__gt=last_viewed_at,
+                    is_soft_deleted=False,
+                    is_private=False,
+                )
+                .annotate(thread_id=Coalesce("root_id", "id"))
+                .values("thread_id")
             )
-            unread_root_ids = {
-                root_id or comment_id
-                for root_id, comment_id in unread_comments.values_list("root_id", "id")
-            }
 
-            if unread_root_ids:
-                qs = qs.annotate(
-                    has_unread_thread=Case(
-                        When(
-                            Q(pk__in=unread_root_ids) | Q(root_id__in=unread_root_ids),
-                            then=Value(1),
-                        ),
-                        default=Value(0),
-                        output_field=IntegerField(),
+            qs = qs.annotate(
+                has_unread_thread=Case(
+                    When(
+                        Q(pk__in=unread_root_ids) | Q(root_id__in=unread_root_ids),
+                        then=Value(1),
                     ),
-                )
-                order_by_args.append("-has_unread_thread")
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+            )
+            order_by_args.append("-has_unread_thread")
 
     # author and author_is_staff are treated as OR conditions
     if author is not None and author_is_staff:
@@ -108,12 +109,8 @@ def get_comments_feed(
         )
 
     if include_deleted is None:
-        qs = qs.filter(
-            Q(is_soft_deleted=False)
-            | Exists(
-                Comment.objects.filter(parent_id=OuterRef("pk"), is_soft_deleted=False)
-            )
-        )
+        # Keep deleted comments which still have live replies
+        qs = qs.filter(Q(is_soft_deleted=False) | Q(children_count__gt=0))
 
     if include_deleted is False:
         qs = qs.filter(is_soft_deleted=False)
@@ -1,7 +1,8 @@
 from collections import defaultdict
 from typing import Iterable
 
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Count, Min
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
@@ -16,11 +17,11 @@ from comments.models import (
     KeyFactorNews,
 )
 from misc.models import ITNArticle
+from posts.models import Post
 from posts.services.common import get_post_permission_for_user
 from projects.permissions import ObjectPermission
 from questions.models import Question
 from users.models import User
-from utils.datetime import timedelta_to_days
 
 
 @transaction.atomic
@@ -48,26 +49,33 @@ def key_factor_vote(
         list(key_factor.votes.values_list("score", flat=True))
     )
     key_factor.save(update_fields=["votes_score"])
+    key_factor.freshness = update_key_factors_freshness([key_factor.id])[key_factor.id]
 
     key_factor.comment.update_key_factor_votes_score()
 
     return key_factor.votes_score
 
 
-def get_votes_for_key_factors(
+def get_key_factors_vote_counts(
     key_factors: Iterable[KeyFactor],
-) -> dict[int, list[KeyFactorVote]]:
+) -> dict[int, dict[int, int]]:
     """
-    Generates map of user votes for a set of KeyFactors
+    Generates map of KeyFactor id -> {vote score: votes count},
+    scores are ordered by their first vote
     """
 
-    votes = KeyFactorVote.objects.filter(key_factor__in=key_factors)
-    votes_map = defaultdict(list)
+    rows = (
+        KeyFactorVote.objects.filter(key_factor__in=key_factors)
+        .values("key_factor_id", "score")
+        .annotate(count=Count("id"), first_vote_id=Min("id"))
+        .order_by("first_vote_id")
+    )
+    counts_map = defaultdict(dict)
 
-    for vote in votes:
-        votes_map[vote.key_factor_id].append(vote)
+    for row in rows:
+        counts_map[row["key_factor_id"]][row["score"]] = row["count"]
 
-    return votes_map
+    return counts_map
 
 
 @transaction.atomic
@@ -159,6 +167,7 @@ def create_key_factor(
     # Save object and validate
     obj.full_clean()
     obj.save()
+    obj.freshness = update_key_factors_freshness([obj.id])[obj.id]
 
     return obj
 
@@ -269,79 +278,104 @@ def delete_key_factor(key_factor: KeyFactor):
         comment.delete()
 
 
-def get_key_factor_question_lifetime(key_factor: KeyFactor) -> float:
-    post = key_factor.comment.on_post
-    question = key_factor.question
-
-    open_time = post.open_time
-
-    if question:
-        open_time = question.open_time
-
-    if not open_time:
-        return 0.0
-
-    lifetime = timedelta_to_days(timezone.now() - open_time)
-
-    return lifetime if lifetime > 0 else 0.0
+# Recomputes the time-decayed votes score of the given key factors in a single
+# statement and stores it into the denormalized `freshness` column:
+#
+# - Driver and News votes decay with a half-life of the question lifetime
+#   divided by 5 (Drivers) or 10 (News), but at least 14 days.
+#   Missing votes are filled with the default strength of 2 up to 3 votes
+# - BaseRate freshness doesn't decay over time, it's just the average of votes
+UPDATE_KEY_FACTORS_FRESHNESS_SQL = """
+WITH decay AS (
+    SELECT kf.id,
+           kf.base_rate_id IS NOT NULL AS is_base_rate,
+           GREATEST(
+               -- NULL open_time means lifetime of 0 days
+               GREATEST(
+                   EXTRACT(
+                       EPOCH FROM %(now)s - CASE
+                           WHEN kf.question_id IS NOT NULL THEN q.open_time
+                           ELSE p.open_time
+                       END
+                   )::float / 86400,
+                   0
+               ) / CASE WHEN kf.driver_id IS NOT NULL THEN 5 ELSE 10 END,
+               14
+           ) AS half_life
+    FROM {key_factor_table} kf
+    JOIN {comment_table} c ON c.id = kf.comment_id
+    JOIN {post_table} p ON p.id = c.on_post_id
+    LEFT JOIN {question_table} q ON q.id = kf.question_id
+    WHERE kf.id = ANY(%(ids)s)
+),
+votes AS (
+    SELECT d.id,
+           d.is_base_rate,
+           v.score,
+           POWER(
+               2, -EXTRACT(EPOCH FROM %(now)s - v.created_at)::float / 86400 / d.half_life
+           ) AS weight
+    FROM decay d
+    LEFT JOIN {vote_table} v ON v.key_factor_id = d.id
+),
+stats AS (
+    SELECT id,
+           is_base_rate,
+           COUNT(score) AS votes_count,
+           COALESCE(SUM(score), 0) AS scores_sum,
+           COALESCE(SUM(weight), 0) AS weights_sum,
+           COALESCE(SUM(score * weight), 0) AS strengths_sum
+    FROM votes
+    GROUP BY id, is_base_rate
+)
+UPDATE {key_factor_table} kf
+SET freshness = CASE
+    WHEN s.is_base_rate THEN
+        GREATEST(s.scores_sum::float / GREATEST(s.votes_count, 1), 0)
+    ELSE
+        (s.strengths_sum + 2 * GREATEST(3 - s.weights_sum, 0))
+        / GREATEST(s.weights_sum, 3)
+END
+FROM stats s
+WHERE kf.id = s.id
+RETURNING kf.id, kf.freshness
+""".format(
+    key_factor_table=KeyFactor._meta.db_table,
+    comment_table=Comment._meta.db_table,
+    post_table=Post._meta.db_table,
+    question_table=Question._meta.db_table,
+    vote_table=KeyFactorVote._meta.db_table,
+)
 
 
-def calculate_freshness_votes_decay(
-    key_factor: KeyFactor, votes: list[KeyFactorVote], lifetime_denominator: int
-) -> float:
-    now = timezone.now()
-    lifetime = get_key_factor_question_lifetime(key_factor)
-
-    weights_sum = 0
-    strengths_sum = 0
+def update_key_factors_freshness(key_factor_ids: Iterable[int]) -> dict[int, float]:
+    """
+    Refreshes the denormalized freshness of KeyFactors.
+    Returns map of KeyFactor id -> freshness
+    """
 
-    for vote in votes:
-        weight = 2 ** (
-            -timedelta_to_days(now - vote.created_at)
-            / max(lifetime / lifetime_denominator, 14)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPDATE_KEY_FACTORS_FRESHNESS_SQL,
+            {"ids": list(key_factor_ids), "now": timezone.now()},
         )
-        weights_sum += weight
-        strengths_sum += vote.score * weight
 
-    return (strengths_sum + 2 * max(3 - weights_sum, 0)) / max(weights_sum, 3)
+        return dict(cursor.fetchall())
 
 
-def calculate_freshness_base_rate(
-    key_factor: KeyFactor, votes: list[KeyFactorVote]
-) -> float:
+def update_all_key_factors_freshness(batch_size: int = 1000) -> int:
     """
-    Calculates freshness for BaseRate KeyFactors.
-    BaseRate freshness doesn't decay over time, it's just the average of votes.
+    Periodic job applying time decay to the freshness of active KeyFactors
     """
-    if not votes:
-        return 0.0
-
-    avg = sum(v.score for v in votes) / len(votes)
-
-    return max(0.0, avg)
-
-
-def calculate_freshness(key_factor: KeyFactor, votes: list[KeyFactorVote]) -> float:
-    if key_factor.driver_id:
-        return calculate_freshness_votes_decay(key_factor, votes, 5)
-    elif key_factor.news_id:
-        return calculate_freshness_votes_decay(key_factor, votes, 10)
-    elif key_factor.base_rate_id:
-        return calculate_freshness_base_rate(key_factor, votes)
-
-    raise ValidationError("Key Factor does not support freshness calculation")
 
+    ids = list(
+        KeyFactor.objects.filter_active().order_by("id").values_list("id", flat=True)
+    )
 
-def calculate_key_factors_freshness(
-    key_factors: Iterable[KeyFactor], votes_map: dict[int, list[KeyFactorVote]]
-) -> dict[KeyFactor, float]:
-    """
-    Generates freshness of KeyFactors
-    """
+    for offset in range(0, len(ids), batch_size):
+        update_key_factors_freshness(ids[offset : offset + batch_size])
 
-    return {
-        kf: calculate_freshness(kf, votes_map.get(kf.id) or []) for kf in key_factors
-    }
+    return len(ids)
 
 
 def get_key_factor_vote_type_and_choices(key_factor: KeyFactor) -> tuple[str, list]:
@@ -1,5 +1,5 @@
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Q, Count
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import serializers, status
@@ -50,23 +50,33 @@ class RootCommentsPagination(LimitOffsetPagination):
     total_count: int
 
     def paginate_queryset(self, queryset, request, view=None):
-        # All comments from the queryset
-        self.total_count = self.get_count(queryset)
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
 
-        root_qs = queryset.filter(root__isnull=True)
+        self.offset = self.get_offset(request)
 
-        # Fetches only root comments
-        root_objects = super().paginate_queryset(root_qs, request, view=view)
-
-        # Re-apply filter to the original queryset
-        # To keep original ordering
-        paginated_data = list(
-            queryset.filter(
-                Q(root__in=root_objects) | Q(pk__in=[x.pk for x in root_objects])
-            )
+        # All comments and root comments counted in a single pass
+        counts = queryset.aggregate(
+            total=Count("pk"), roots=Count("pk", filter=Q(root__isnull=True))
         )
+        self.total_count = counts["total"]
+        self.count = counts["roots"]
+
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+
+        # Page of root comments, inlined as a subquery
+        root_ids = queryset.filter(root__isnull=True).values("pk")[
+            self.offset : self.offset + self.limit
+        ]
 
-        return paginated_data
+        # Roots and their whole threads in one query, keeping the original ordering
+        return list(queryset.filter(Q(pk__in=root_ids) | Q(root_id__in=root_ids)))
 
     def get_paginated_response(self, data):
         return Response(
@@ -19,6 +19,7 @@ from comments.services.key_factors.common import (
     key_factor_vote,
     delete_key_factor,
     get_key_factor_vote_type_and_choices,
+    get_key_factors_vote_counts,
 )
 from comments.services.key_factors.suggestions import generate_key_factors_for_comment
 from notifications.services import send_key_factor_report_notification_to_staff
@@ -56,7 +57,7 @@ def key_factor_vote_view(request: Request, pk: int):
     return Response(
         serialize_key_factor_votes(
             key_factor,
-            list(key_factor.votes.all()),
+            get_key_factors_vote_counts([key_factor])[key_factor.id],
             user_vote=vote,
             user_vote_reason=vote_reason,
         )
@@ -90,6 +90,7 @@ MIDDLEWARE = [
     "utils.middlewares.HealthCheckMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "utils.middlewares.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "utils.middlewares.LocaleOverrideMiddleware",
@@ -108,6 +109,13 @@ if DEBUG:
     INSTALLED_APPS += ["debug_toolbar"]
     MIDDLEWARE += ["debug_toolbar.middleware.DebugToolbarMiddleware"]
 
+# Fraction of requests to profile, see `endpoint_stats` command
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+
+if PROFILING_SAMPLE_RATE:
+    # Right after the health check, so latency includes other middlewares
+    MIDDLEWARE.insert(1, "utils.middlewares.ProfilingMiddleware")
+
 # Cors configuration
 CORS_ORIGIN_WHITELIST = [
     "http://127.0.0.1:3000",
@@ -144,6 +152,15 @@ DATABASES = {
     },
 }
 
+# Optional read replica, serving reads of code marked with `utils.db.use_replica`
+if os.environ.get("DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = dj_database_url.config(
+        env="DATABASE_REPLICA_URL", conn_max_age=600
+    )
+
+DATABASE_REPLICA_ENABLED = "replica" in DATABASES
+DATABASE_ROUTERS = ["utils.db.ReplicaRouter"]
+
 # REST Framework
 # https://www.django-rest-framework.org/
 
@@ -159,7 +176,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "utils.renderers.ORJSONRenderer",
         *(["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
     ],
     "EXCEPTION_HANDLER": "utils.exceptions.custom_exception_handler",
@@ -204,6 +221,10 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("authentication.jwt_session.SessionAccessToken",),
     **get_jwt_encryption_config(),
 }
+# Seconds a session revocation timestamp is kept in process memory on top of Redis.
+# Revocations are also broadcast over Redis pub/sub, so this only bounds how long
+# a missed invalidation can go unnoticed. Set to 0 to always read from Redis.
+JWT_SESSION_LOCAL_CACHE_TTL = int(os.environ.get("JWT_SESSION_LOCAL_CACHE_TTL", 5))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -367,6 +388,7 @@ DRAMATIQ_BROKER = {
         "dramatiq.middleware.Retries",
         "django_dramatiq.middleware.AdminMiddleware",
         "django_dramatiq.middleware.DbConnectionsMiddleware",
+        "utils.dramatiq.CronJobTelemetryMiddleware",
     ],
 }
 
@@ -429,6 +451,9 @@ AWS_QUERYSTRING_AUTH = False
 AWS_STORAGE_BUCKET_POST_VERSION_HISTORY = os.environ.get(
     "AWS_STORAGE_BUCKET_POST_VERSION_HISTORY"
 )
+# Local directory to store posts’ version history instead of S3.
+# Intended for development and tests.
+POST_VERSION_HISTORY_LOCAL_PATH = os.environ.get("POST_VERSION_HISTORY_LOCAL_PATH")
 
 # Cloudflare captcha
 # https://developers.cloudflare.com/turnstile/get-started/server-side-validation/
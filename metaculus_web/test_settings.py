@@ -1,4 +1,6 @@
 from .settings import *  # noqa
+import os
+
 import dj_database_url
 
 DATABASES = {
@@ -9,4 +11,13 @@ DATABASES = {
     },
 }
 
+# Replica tests run against a second local database, set with TEST_DATABASE_REPLICA_URL
+if os.environ.get("TEST_DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = dj_database_url.config(
+        env="TEST_DATABASE_REPLICA_URL", conn_max_age=600
+    )
+
+# Enabled only by tests which have access to the replica database
+DATABASE_REPLICA_ENABLED = False
+
 TEST = True
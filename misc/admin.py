@@ -2,7 +2,7 @@ from django import forms
 from django.contrib import admin
 from django.core.exceptions import ValidationError
 
-from .models import AdTile, Bulletin, SidebarItem, UserDataAccess
+from .models import AdTile, Bulletin, CronJobRun, SidebarItem, UserDataAccess
 
 
 class AdTileAdminForm(forms.ModelForm):
@@ -127,3 +127,24 @@ class UserDataAccessAdmin(admin.ModelAdmin):
     list_display = ("user", "created_at", "project", "post")
     search_fields = ("user__username", "user__email", "project__name", "post__title")
     autocomplete_fields = ("user", "project", "post")
+
+
+@admin.register(CronJobRun)
+class CronJobRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "job_id",
+        "started_at",
+        "status",
+        "duration",
+        "db_queries",
+        "rows_processed",
+    )
+    list_filter = ("status", "job_id")
+    search_fields = ("job_id",)
+    date_hierarchy = "started_at"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -1,5 +1,6 @@
 import logging
 import time
+from functools import partial
 
 from misc.models import ITNArticle
 from misc.services.itn import (
@@ -7,8 +8,9 @@ from misc.services.itn import (
     sync_itn_news,
     clear_old_itn_news,
     check_itn_enabled,
-    generate_related_posts_for_article,
+    generate_related_posts_for_articles,
     assign_article_clusters,
+    post_vectors_matrix,
 )
 from utils.management import parallel_command_executor
 
@@ -22,9 +24,6 @@ def index_itn_articles__worker(ids, worker_idx):
         try:
             update_article_embedding_vector(article)
 
-            # Generate list of similar posts
-            generate_related_posts_for_article(article)
-
             if idx % 100 == 0:
                 logger.info(
                     f"[W{worker_idx}] ITN Articles sync: Processed {idx}/{len(ids)} records"
@@ -33,6 +32,26 @@ def index_itn_articles__worker(ids, worker_idx):
             logger.exception("Error during generation of the vector")
 
 
+def match_itn_articles__worker(post_ids, post_vectors_path, ids, worker_idx):
+    generate_related_posts_for_articles(ids, post_ids, post_vectors_path)
+
+    logger.info(f"[W{worker_idx}] ITN Articles matching: Processed {len(ids)} records")
+
+
+def match_itn_articles(article_ids: list[int], num_processes: int = 1):
+    """
+    Matches ITN articles against all eligible posts.
+    Post vectors are loaded once and memory-mapped by every worker process.
+    """
+
+    with post_vectors_matrix() as (post_ids, post_vectors_path):
+        parallel_command_executor(
+            article_ids,
+            partial(match_itn_articles__worker, post_ids, post_vectors_path),
+            num_processes=num_processes,
+        )
+
+
 def sync_itn_articles(num_processes: int = 1):
     if not check_itn_enabled():
         return
@@ -60,6 +79,10 @@ def sync_itn_articles(num_processes: int = 1):
         num_processes=num_processes,
     )
 
+    # Generate list of similar posts
+    logger.info("Matching ITN articles with posts")
+    match_itn_articles(article_ids, num_processes=num_processes)
+
     # Group near-duplicate articles and refresh per-article match counts. Both
     # feed the news hotness score (near-duplicate de-duplication and the breadth
     # penalty respectively) and are computed here, after all matches exist.
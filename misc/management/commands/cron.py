@@ -1,18 +1,25 @@
 import logging
-from functools import wraps
+from functools import partial, wraps
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 from django import db
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from dramatiq import Actor
 from django_dramatiq.tasks import delete_old_tasks
 
+from comments.services.key_factors.common import update_all_key_factors_freshness
 from comments.tasks import (
     update_current_top_comments_of_week,
     job_finalize_and_send_weekly_top_comments,
 )
 from misc.jobs import sync_itn_articles
+from misc.services.cron import (
+    delete_old_cron_job_runs,
+    send_cron_job,
+    track_cron_job,
+)
 from notifications.jobs import (
     job_send_notification_groups,
     job_send_open_status_notifications,
@@ -24,6 +31,7 @@ from posts.jobs import (
     job_check_post_open_event,
 )
 from posts.services.hotness import compute_feed_hotness
+from posts.tasks import warm_cache_onboarding_feed
 from questions.jobs import job_close_question, job_check_cp_revealed
 from questions.tasks import check_and_schedule_forecast_widrawal_due_notifications
 from scoring.jobs import (
@@ -34,6 +42,9 @@ from scoring.jobs import (
 from scoring.utils import update_medal_points_and_ranks
 from projects.tasks import warm_cache_feed_project_tiles
 from scoring.tasks import warm_cache_metaculus_stats
+from users.services.common import refresh_recent_commenters
+from users.services.profile_stats import refresh_stale_users_stats
+from utils.data_exports import delete_expired_data_exports
 
 
 logger = logging.getLogger(__name__)
@@ -65,199 +76,241 @@ def close_old_connections(func):
     return func_wrapper
 
 
+def add_cron_job(scheduler: BlockingScheduler, func, *, id: str, **kwargs):
+    """
+    Schedules the job wrapped with `close_old_connections`.
+    Runs are recorded into CronJobRun and skipped if the previous one is still
+    in progress: inline jobs are tracked by `track_cron_job`, actors are tracked
+    by CronJobTelemetryMiddleware in the worker running them.
+    """
+
+    if isinstance(func, Actor):
+        func = partial(send_cron_job, func, id)
+    else:
+        func = track_cron_job(id)(func)
+
+    scheduler.add_job(
+        close_old_connections(func),
+        id=id,
+        max_instances=1,
+        replace_existing=True,
+        **kwargs,
+    )
+
+
 class Command(BaseCommand):
     help = "Cron Runner"
 
     def handle(self, *args, **options):
         """
-        Always wrap cron jobs with `close_old_connections`
+        Always schedule cron jobs with `add_cron_job`
         The `close_old_connections` decorator ensures that database connections, that have become
-        unusable or are obsolete, are closed before and after your job has run. You should use it
-        to wrap any jobs that you schedule that access the Django database in any way.
+        unusable or are obsolete, are closed before and after your job has run.
+        `add_cron_job` also records every run into CronJobRun (see `cron_job_stats` command)
+        and skips runs overlapping with the previous one.
         """
 
         scheduler = BlockingScheduler(timezone=settings.TIME_ZONE)
 
         # Dramatiq old tasks cleanup
-        scheduler.add_job(
-            close_old_connections(delete_old_tasks.send),
+        add_cron_job(
+            scheduler,
+            delete_old_tasks,
             kwargs={"max_task_age": 60 * 60 * 24},
             trigger=CronTrigger.from_crontab("0 0 * * *"),  # Every day at 00:00 UTC
             id="dramatiq_delete_old_tasks",
-            max_instances=1,
-            replace_existing=True,
+        )
+
+        # Cron job telemetry cleanup
+        add_cron_job(
+            scheduler,
+            delete_old_cron_job_runs,
+            trigger=CronTrigger.from_crontab("30 0 * * *"),  # Every day at 00:30 UTC
+            id="misc_delete_old_cron_job_runs",
+        )
+
+        # Expired data export files cleanup
+        add_cron_job(
+            scheduler,
+            delete_expired_data_exports,
+            trigger=CronTrigger.from_crontab("*/15 * * * *"),  # Every 15 minutes
+            id="utils_delete_expired_data_exports",
         )
 
         #
         # Post Jobs
         #
-        scheduler.add_job(
-            close_old_connections(job_compute_movement.send),
+        add_cron_job(
+            scheduler,
+            job_compute_movement,
             trigger=CronTrigger.from_crontab(
                 "7 * * * *"
             ),  # Every hour at :07 (offset from :00/:15/:30/:45 hotness job to avoid posts_post deadlocks)
             id="posts_job_compute_movement",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(compute_feed_hotness),
+        add_cron_job(
+            scheduler,
+            compute_feed_hotness,
             trigger=CronTrigger.from_crontab("*/15 * * * *"),  # Every 15 minutes
             id="posts_compute_hotness",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(job_subscription_notify_date.send),
+        add_cron_job(
+            scheduler,
+            job_subscription_notify_date,
             trigger=CronTrigger.from_crontab("30 * * * *"),  # Every Hour at :30
             id="posts_job_subscription_notify_date",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(job_subscription_notify_milestone.send),
+        add_cron_job(
+            scheduler,
+            job_subscription_notify_milestone,
             trigger=CronTrigger.from_crontab("0 12 * * *"),  # Every Day at 12 PM
             id="posts_job_subscription_notify_milestone",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(job_check_post_open_event.send),
+        add_cron_job(
+            scheduler,
+            job_check_post_open_event,
             trigger=CronTrigger.from_crontab("45 * * * *"),  # Every Hour at :45
             id="posts_job_check_post_open_event",
-            max_instances=1,
-            replace_existing=True,
         )
 
         #
         # Question jobs
         #
-        scheduler.add_job(
-            close_old_connections(job_close_question.send),
+        add_cron_job(
+            scheduler,
+            job_close_question,
             trigger=CronTrigger.from_crontab("* * * * *"),  # Every Minute
             id="questions_job_close_question",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(job_check_cp_revealed.send),
+        add_cron_job(
+            scheduler,
+            job_check_cp_revealed,
             trigger=CronTrigger.from_crontab("* * * * *"),  # Every Minute
             id="questions_job_check_cp_revealed",
-            max_instances=1,
-            replace_existing=True,
         )
 
         #
         # Notification jobs
         #
-        scheduler.add_job(
-            close_old_connections(job_send_notification_groups.send),
+        add_cron_job(
+            scheduler,
+            job_send_notification_groups,
             trigger=CronTrigger.from_crontab("0 0 * * *"),  # Every day at 00:00 UTC
             id="notifications_job_send_notification_groups",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(job_send_open_status_notifications.send),
+        add_cron_job(
+            scheduler,
+            job_send_open_status_notifications,
             trigger=CronTrigger.from_crontab("*/30 * * * *"),  # Every 30 minutes
             id="notifications_job_send_open_status_notifications",
-            max_instances=1,
-            replace_existing=True,
         )
 
         #
         # ITN Sync Job
         #
-        scheduler.add_job(
-            close_old_connections(sync_itn_articles),
+        add_cron_job(
+            scheduler,
+            sync_itn_articles,
             trigger=CronTrigger.from_crontab("0 1 * * *"),  # Every day at 01:00 UTC
             id="misc_sync_itn_articles",
-            max_instances=1,
-            replace_existing=True,
         )
 
         #
         # Forecast Auto Withdrawal Job
         #
-        scheduler.add_job(
-            close_old_connections(
-                check_and_schedule_forecast_widrawal_due_notifications.send
-            ),
+        add_cron_job(
+            scheduler,
+            check_and_schedule_forecast_widrawal_due_notifications,
             trigger=CronTrigger.from_crontab("0 0 * * *"),  # Every day at 00:00 UTC
             id="forecast_auto_withdrawal",
-            max_instances=1,
-            replace_existing=True,
         )
 
         # Weekly Top Comments every Sunday at 12:00 UTC
-        scheduler.add_job(
-            close_old_connections(job_finalize_and_send_weekly_top_comments.send),
+        add_cron_job(
+            scheduler,
+            job_finalize_and_send_weekly_top_comments,
             trigger=CronTrigger.from_crontab("0 12 * * 6"),
             id="weekly_top_comments_finalize_and_send",
-            max_instances=1,
-            replace_existing=True,
         )
 
         #
         # Scoring Jobs
         #
-        scheduler.add_job(
-            close_old_connections(update_global_comment_and_question_leaderboards),
+        add_cron_job(
+            scheduler,
+            update_global_comment_and_question_leaderboards,
             trigger=CronTrigger.from_crontab("0 2 * * *"),  # Every day at 02:00 UTC
             id="global_comment_and_question_leaderboards",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(finalize_leaderboards),
+        add_cron_job(
+            scheduler,
+            finalize_leaderboards,
             trigger=CronTrigger.from_crontab("0 3 * * *"),  # Every day at 03:00 UTC
             id="finalize_leaderboards",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(update_medal_points_and_ranks),
+        add_cron_job(
+            scheduler,
+            update_medal_points_and_ranks,
             trigger=CronTrigger.from_crontab("0 4 * * *"),  # Every day at 04:00 UTC
             id="update_medal_points_and_ranks",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(update_custom_leaderboards),
+        add_cron_job(
+            scheduler,
+            update_custom_leaderboards,
             trigger=CronTrigger.from_crontab("0 5 * * *"),  # Every day at 05:00 UTC
             id="update_custom_leaderboards",
-            max_instances=1,
-            replace_existing=True,
+        )
+        add_cron_job(
+            scheduler,
+            refresh_stale_users_stats,
+            trigger=CronTrigger.from_crontab("0 6 * * *"),  # Every day at 06:00 UTC
+            id="refresh_stale_users_stats",
+        )
+        add_cron_job(
+            scheduler,
+            refresh_recent_commenters,
+            trigger=CronTrigger.from_crontab("10 * * * *"),  # Every hour at :10
+            id="refresh_recent_commenters",
         )
 
         #
         # Comment Jobs
         #
+        add_cron_job(
+            scheduler,
+            update_all_key_factors_freshness,
+            trigger=CronTrigger.from_crontab("20 * * * *"),  # Every hour at :20
+            id="comments_update_key_factors_freshness",
+        )
+
         if settings.WEEKLY_TOP_COMMENTS_SEND_EMAILS:
-            scheduler.add_job(
-                close_old_connections(update_current_top_comments_of_week.send),
+            add_cron_job(
+                scheduler,
+                update_current_top_comments_of_week,
                 trigger=CronTrigger.from_crontab("0 * * * *"),  # Every hour
                 id="update_current_top_comments_of_week",
-                max_instances=1,
-                replace_existing=True,
             )
 
         #
         # Cache warm-up jobs
         #
-        scheduler.add_job(
-            close_old_connections(warm_cache_feed_project_tiles.send),
+        add_cron_job(
+            scheduler,
+            warm_cache_feed_project_tiles,
             trigger=CronTrigger.from_crontab("*/15 * * * *"),  # Every 15 minutes
             id="warm_cache_feed_project_tiles",
-            max_instances=1,
-            replace_existing=True,
         )
-        scheduler.add_job(
-            close_old_connections(warm_cache_metaculus_stats.send),
+        add_cron_job(
+            scheduler,
+            warm_cache_onboarding_feed,
+            trigger=CronTrigger.from_crontab("*/15 * * * *"),  # Every 15 minutes
+            id="warm_cache_onboarding_feed",
+        )
+        add_cron_job(
+            scheduler,
+            warm_cache_metaculus_stats,
             trigger=CronTrigger.from_crontab("0 */12 * * *"),  # Every 12 hours
             id="warm_cache_metaculus_stats",
-            max_instances=1,
-            replace_existing=True,
         )
 
         try:
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from misc.services.cron import get_cron_job_stats
+
+
+def _format(value, precision: int = 2) -> str:
+    return "-" if value is None else f"{value:.{precision}f}"
+
+
+class Command(BaseCommand):
+    help = "Show runtime percentiles of cron jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=7,
+            help="Number of days of cron job runs to aggregate (default: 7)",
+        )
+
+    def handle(self, *args, days: int = 7, **options):
+        stats = get_cron_job_stats(timezone.now() - timedelta(days=days))
+
+        header = (
+            f"{'job':<55} {'runs':>6} {'failed':>6} {'skipped':>7} "
+            f"{'p50, s':>9} {'p95, s':>9} {'max, s':>9} {'queries':>9} {'rows':>10}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for row in stats:
+            self.stdout.write(
+                f"{row['job_id']:<55} {row['runs']:>6} {row['failed']:>6} "
+                f"{row['skipped']:>7} {_format(row['p50']):>9} "
+                f"{_format(row['p95']):>9} {_format(row['max']):>9} "
+                f"{_format(row['avg_queries'], 0):>9} "
+                f"{_format(row['avg_rows'], 0):>10}"
+            )
@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand
+
+from misc.services.profiling import get_endpoint_stats, reset_endpoint_stats
+
+SORT_CHOICES = ("db_time", "avg_db_time", "avg_queries", "avg_latency")
+
+
+def _format(value, precision: int = 2) -> str:
+    return "-" if value is None else f"{value:.{precision}f}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the worst endpoints of requests sampled by ProfilingMiddleware, "
+        "and their repeated queries (possible N+1)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of endpoints to show (default: 20)",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=SORT_CHOICES,
+            default="db_time",
+            help="Sort endpoints by this metric, descending (default: db_time)",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Delete collected stats",
+        )
+
+    def handle(
+        self,
+        *args,
+        limit: int = 20,
+        sort: str = "db_time",
+        reset: bool = False,
+        **options,
+    ):
+        if reset:
+            reset_endpoint_stats()
+            self.stdout.write("Endpoint stats were reset")
+            return
+
+        stats = sorted(get_endpoint_stats(), key=lambda row: -row[sort])
+        stats = stats[:limit]
+
+        header = (
+            f"{'endpoint':<60} {'requests':>8} {'db total, s':>11} "
+            f"{'queries':>8} {'db, ms':>8} {'latency, ms':>11} {'cache hits':>10}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for row in stats:
+            self.stdout.write(
+                f"{row['view_name']:<60} {row['requests']:>8} "
+                f"{_format(row['db_time']):>11} {_format(row['avg_queries'], 1):>8} "
+                f"{_format(row['avg_db_time'] * 1000, 1):>8} "
+                f"{_format(row['avg_latency'] * 1000, 1):>11} "
+                f"{_format(row['cache_hit_ratio']):>10}"
+            )
+
+        repeated = [row for row in stats if row["repeated_queries"]]
+
+        if repeated:
+            self.stdout.write("\nRepeated queries (possible N+1):")
+
+        for row in repeated:
+            self.stdout.write(f"\n{row['view_name']}")
+
+            for query in row["repeated_queries"]:
+                self.stdout.write(
+                    f"  {_format(query['executions_per_request'], 1):>8}x per request: "
+                    f"{query['sql'][:200]}"
+                )
@@ -6,8 +6,8 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.utils.timezone import make_aware
 
+from misc.jobs import match_itn_articles
 from misc.models import ITNArticle
-from misc.services.itn import generate_related_posts_for_article
 
 logger = logging.getLogger(__name__)
 
@@ -22,27 +22,30 @@ class Command(BaseCommand):
             help="Minimum created_at date in YYYY-MM-DD format",
             default=(timezone.now() - timedelta(days=1)).strftime("%Y-%m-%d"),
         )
+        parser.add_argument(
+            "--num_processes",
+            type=int,
+            default=1,
+            help="Number of processes to use for processing (default: 1)",
+        )
 
-    def handle(self, *args, **options):
+    def handle(self, *args, num_processes: int = 1, **options):
         min_created_at_str = options["min_created_at"]
         min_created_at = datetime.strptime(min_created_at_str, "%Y-%m-%d")
 
-        articles = ITNArticle.objects.filter(created_at__gt=make_aware(min_created_at))
-        articles_count = articles.count()
+        article_ids = list(
+            ITNArticle.objects.filter(
+                created_at__gt=make_aware(min_created_at)
+            ).values_list("id", flat=True)
+        )
         tm = time.time()
 
         logger.info(
-            f"Generating PostArticle relations from {articles_count} ITN Articles"
+            f"Generating PostArticle relations from {len(article_ids)} ITN Articles"
         )
-        chunk_size = 100
 
-        for idx, article in enumerate(articles.iterator(chunk_size)):
-            generate_related_posts_for_article(article)
+        match_itn_articles(article_ids, num_processes=num_processes)
 
-            if idx % 100 == 0:
-                logger.info(
-                    f"Processed {idx + 1}/{articles_count} ITN Articles in {round(time.time() - tm, 2)} seconds"
-                )
-                tm = time.time()
-
-        logger.info("Done generating PostArticle relations")
+        logger.info(
+            f"Done generating PostArticle relations in {round(time.time() - tm, 2)} seconds"
+        )
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.16 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_clusters(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO misc_itnarticlecluster (representative_id, last_article_at)
+            SELECT a.cluster_id, MAX(a.created_at)
+            FROM misc_itnarticle a
+            WHERE a.cluster_id IS NOT NULL
+              AND EXISTS (
+                SELECT 1 FROM misc_itnarticle r WHERE r.id = a.cluster_id
+              )
+            GROUP BY a.cluster_id
+            """
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misc", "0011_itnarticle_cluster_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ITNArticleCluster",
+            fields=[
+                (
+                    "representative",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="represented_cluster",
+                        serialize=False,
+                        to="misc.itnarticle",
+                    ),
+                ),
+                ("last_article_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_clusters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misc", "0012_itnarticlecluster"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CronJobRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("job_id", models.CharField(max_length=200)),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("success", "Success"),
+                            ("failed", "Failed"),
+                            ("skipped", "Skipped"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("duration", models.FloatField(help_text="Run duration in seconds")),
+                ("db_queries", models.PositiveIntegerField(default=0)),
+                (
+                    "rows_processed",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Number of rows reported by the job",
+                        null=True,
+                    ),
+                ),
+                ("error", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["job_id", "-started_at"], name="misc_cronjobrun_job_idx"
+                    ),
+                    models.Index(
+                        fields=["started_at"], name="misc_cronjobrun_started_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
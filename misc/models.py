@@ -1,6 +1,7 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models.fields.files import ImageFieldFile
+from django.utils import timezone
 from django.utils.html import strip_tags
 from pgvector.django import VectorField
 
@@ -34,6 +35,26 @@ class ITNArticle(TimeStampedModel):
     cluster_id = models.BigIntegerField(null=True, blank=True, db_index=True)
 
 
+class ITNArticleCluster(models.Model):
+    """
+    Near-duplicate cluster of ITN articles, keyed by its representative article.
+
+    Only clusters with recent coverage are matched against new articles, so each
+    clustering run loads the (small) set of fresh representatives plus the new
+    articles instead of every embedded article.
+    """
+
+    # Cluster id is the id of its representative article
+    representative = models.OneToOneField(
+        ITNArticle,
+        models.CASCADE,
+        primary_key=True,
+        related_name="represented_cluster",
+    )
+    # Creation time of the latest article assigned to the cluster
+    last_article_at = models.DateTimeField(db_index=True)
+
+
 class PostArticleQuerySet(models.QuerySet):
     def annotate_article_post_count(self):
         """Annotate each match with the number of distinct posts its article is
@@ -302,3 +323,36 @@ class SidebarItem(TimeStampedModel):
 
     def __str__(self):
         return self.display_name
+
+
+class CronJobRun(models.Model):
+    """
+    Telemetry of a single cron job run
+    """
+
+    class Status(models.TextChoices):
+        SUCCESS = "success"
+        FAILED = "failed"
+        # Previous run of the same job was still in progress
+        SKIPPED = "skipped"
+
+    job_id = models.CharField(max_length=200)
+    started_at = models.DateTimeField(default=timezone.now)
+    status = models.CharField(max_length=16, choices=Status.choices)
+    duration = models.FloatField(help_text="Run duration in seconds")
+    db_queries = models.PositiveIntegerField(default=0)
+    rows_processed = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Number of rows reported by the job"
+    )
+    error = models.TextField(default="", blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["job_id", "-started_at"], name="misc_cronjobrun_job_idx"
+            ),
+            models.Index(fields=["started_at"], name="misc_cronjobrun_started_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} at {self.started_at}"
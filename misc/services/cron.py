@@ -0,0 +1,168 @@
+import logging
+import time
+import traceback
+from datetime import datetime, timedelta
+from contextlib import ExitStack
+from functools import wraps
+from typing import Callable
+
+from django.db import connection
+from dramatiq import Actor
+from django.db.models import Avg, Count, F, Max, Q
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import LockError
+
+from misc.models import CronJobRun
+from utils.models import PercentileCont
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting executed queries
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+
+        return execute(sql, params, many, context)
+
+
+class CronJobTracker:
+    """
+    Records duration, DB query count, outcome and rows processed
+    of a single cron job run into CronJobRun.
+
+    Holds a per-job Redis lock while the job runs, so overlapping runs
+    (e.g. from another scheduler instance or a backed up queue) are skipped.
+    The lock expires after `lock_timeout` seconds in case the process dies.
+    """
+
+    def __init__(self, job_id: str, lock_timeout: int = 3600):
+        self.run = CronJobRun(job_id=job_id, duration=0)
+        self.lock = get_redis_connection("default").lock(
+            f"cron:lock:{job_id}", timeout=lock_timeout, blocking=False
+        )
+        self.counter = QueryCounter()
+        self.stack = ExitStack()
+        self.started = 0.0
+
+    def start(self) -> bool:
+        """
+        Returns False if the previous run of the job is still in progress
+        """
+
+        if not self.lock.acquire():
+            logger.warning(f"Cron job {self.run.job_id} is already running, skipping")
+            self.run.status = CronJobRun.Status.SKIPPED
+            self._save()
+
+            return False
+
+        self.stack.enter_context(connection.execute_wrapper(self.counter))
+        self.started = time.perf_counter()
+
+        return True
+
+    def finish(self, result=None, exception: BaseException = None):
+        self.run.duration = time.perf_counter() - self.started
+        self.stack.close()
+        self.run.db_queries = self.counter.count
+
+        if exception is not None:
+            self.run.status = CronJobRun.Status.FAILED
+            self.run.error = "".join(traceback.format_exception(exception))
+        else:
+            self.run.status = CronJobRun.Status.SUCCESS
+
+            if isinstance(result, int) and not isinstance(result, bool):
+                self.run.rows_processed = result
+
+        self._save()
+
+        try:
+            self.lock.release()
+        except LockError:
+            logger.warning(f"Cron job {self.run.job_id} outlived its lock timeout")
+
+    def _save(self):
+        # Telemetry should never break the job itself
+        try:
+            self.run.save()
+        except Exception:
+            logger.exception(f"Failed to record cron job run of {self.run.job_id}")
+
+
+def track_cron_job(job_id: str, lock_timeout: int = 3600):
+    """
+    Decorator tracking every run of the job with CronJobTracker.
+    Jobs may return the number of processed rows to have it recorded.
+    """
+
+    def decorator(func: Callable):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tracker = CronJobTracker(job_id, lock_timeout=lock_timeout)
+
+            if not tracker.start():
+                return
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                tracker.finish(exception=e)
+                raise
+
+            tracker.finish(result=result)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def send_cron_job(actor: Actor, job_id: str, *args, **kwargs):
+    """
+    Enqueues the actor, so its run is tracked by
+    `utils.dramatiq.CronJobTelemetryMiddleware`
+    """
+
+    return actor.send_with_options(args=args, kwargs=kwargs, cron_job_id=job_id)
+
+
+def get_cron_job_stats(since: datetime) -> list[dict]:
+    """
+    Runtime percentiles and outcome counts per job
+    """
+
+    finished = ~Q(status=CronJobRun.Status.SKIPPED)
+
+    return list(
+        CronJobRun.objects.filter(started_at__gte=since)
+        .values("job_id")
+        .annotate(
+            runs=Count("id"),
+            failed=Count("id", filter=Q(status=CronJobRun.Status.FAILED)),
+            skipped=Count("id", filter=Q(status=CronJobRun.Status.SKIPPED)),
+            p50=PercentileCont("duration", 0.5, filter=finished),
+            p95=PercentileCont("duration", 0.95, filter=finished),
+            max=Max("duration", filter=finished),
+            avg_queries=Avg("db_queries", filter=finished),
+            avg_rows=Avg("rows_processed", filter=finished),
+        )
+        .order_by(F("p95").desc(nulls_last=True), "job_id")
+    )
+
+
+def delete_old_cron_job_runs(days: int = 90) -> int:
+    deleted, _ = CronJobRun.objects.filter(
+        started_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+
+    return deleted
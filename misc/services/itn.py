@@ -7,15 +7,17 @@ import stat
 import tempfile
 import threading
 from datetime import UTC, timedelta
+from itertools import batched
 
 import mysql.connector
 import numpy as np
 import paramiko
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from pgvector.django import CosineDistance
 
-from misc.models import ITNArticle, PostArticle
+from misc.models import ITNArticle, ITNArticleCluster, PostArticle
 from posts.models import Post
 from utils.db import paginate_cursor
 from utils.openai import chunked_tokens, generate_text_embed_vector
@@ -25,6 +27,8 @@ MAX_RELEVANT_DISTANCE = 0.5
 # same story and grouped into one cluster, so repeated coverage of an event does
 # not add up multiple times in the news hotness score.
 ARTICLE_CLUSTER_MAX_DISTANCE = 0.1
+# Clusters without new coverage for this long no longer absorb new articles
+ARTICLE_CLUSTER_FRESHNESS = timedelta(days=3)
 SSH_CONNECT_TIMEOUT_S = 10
 SSH_KEEPALIVE_S = 30
 MYSQL_CONNECT_TIMEOUT_S = 10
@@ -230,6 +234,130 @@ def update_article_embedding_vector(obj: ITNArticle):
     obj.save()
 
 
+def _normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scales rows to unit length in place, so cosine distance is 1 - dot product.
+    Zero vectors stay zero and therefore never match anything.
+    """
+
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors
+
+
+@contextlib.contextmanager
+def post_vectors_matrix():
+    """
+    Dumps the normalized embedding vectors of posts eligible for ITN matching
+    into a temporary .npy file and yields `(post_ids, path)`.
+
+    Worker processes memory-map the file, so post vectors are read from the
+    database once per run and shared through the OS page cache.
+    """
+
+    posts = (
+        Post.objects.filter_public()
+        .filter_published()
+        # Skip generation for notebooks
+        .filter_questions()
+        .filter(embedding_vector__isnull=False)
+        .order_by("pk")
+        .values_list("pk", "embedding_vector")
+    )
+    posts_count = posts.count()
+    post_ids = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "post_vectors.npy")
+        matrix = None
+
+        for pk, vector in posts.iterator(chunk_size=500):
+            if matrix is None:
+                matrix = np.lib.format.open_memmap(
+                    path, mode="w+", dtype=np.float32, shape=(posts_count, len(vector))
+                )
+
+            # Posts published after counting are picked up by the next run
+            if len(post_ids) >= posts_count:
+                break
+
+            matrix[len(post_ids)] = vector
+            post_ids.append(pk)
+
+        if matrix is None:
+            np.save(path, np.zeros((0, 0), dtype=np.float32))
+        else:
+            _normalize_vectors(matrix)
+            matrix.flush()
+            del matrix
+
+        yield post_ids, path
+
+
+def generate_related_posts_for_articles(
+    article_ids: list[int],
+    post_ids: list[int],
+    post_vectors_path: str,
+    batch_size: int = 256,
+):
+    """
+    Generates related posts for a list of ITN Articles using the matrix
+    produced by `post_vectors_matrix`, and saves them to the PostArticle cache table.
+
+    Each batch of articles is matched against all posts with a single matrix product
+    instead of a sequential scan of post vectors per article.
+    """
+
+    if not post_ids:
+        return
+
+    post_vectors = np.load(post_vectors_path, mmap_mode="r")
+
+    articles = (
+        ITNArticle.objects.filter(pk__in=article_ids, embedding_vector__isnull=False)
+        .order_by("pk")
+        .values_list("pk", "embedding_vector")
+        .iterator(chunk_size=batch_size)
+    )
+
+    for batch in batched(articles, batch_size):
+        try:
+            _match_articles(batch, post_ids, post_vectors)
+        except Exception:
+            # A single bad embedding fails the whole batch, so retry one by one
+            for article in batch:
+                try:
+                    _match_articles([article], post_ids, post_vectors)
+                except Exception:
+                    logger.exception(f"Failed to match ITN article {article[0]}")
+
+
+def _match_articles(
+    articles: list[tuple[int, list[float]]],
+    post_ids: list[int],
+    post_vectors: np.ndarray,
+):
+    article_pks = [pk for pk, _ in articles]
+    article_vectors = _normalize_vectors(
+        np.array([vector for _, vector in articles], dtype=np.float32)
+    )
+
+    distances = 1 - article_vectors @ post_vectors.T
+    rows, cols = np.nonzero(distances <= MAX_RELEVANT_DISTANCE)
+
+    PostArticle.objects.bulk_create(
+        [
+            PostArticle(
+                article_id=article_pks[row],
+                post_id=post_ids[col],
+                distance=float(distances[row, col]),
+            )
+            for row, col in zip(rows, cols)
+        ],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+
+
 def generate_related_posts_for_article(article: ITNArticle):
     """
     Generates related posts for the given ITN Article
@@ -287,60 +415,123 @@ def generate_related_articles_for_post(post: Post):
     )
 
 
-def assign_article_clusters():
+def assign_article_clusters(batch_size: int = 500):
     """Group near-duplicate articles (same story, different outlets/rewrites) so
     that repeated coverage counts only once towards a post's news hotness.
 
-    Uses single-link assignment against already-clustered articles: each not yet
-    clustered article joins the cluster of its nearest neighbour within
-    ARTICLE_CLUSTER_MAX_DISTANCE, or starts its own cluster otherwise. Processed
-    oldest-first so earlier articles act as cluster representatives.
+    Each not yet clustered article joins the cluster whose representative is
+    nearest within ARTICLE_CLUSTER_MAX_DISTANCE, or starts its own cluster
+    otherwise. Processed oldest-first so earlier articles act as cluster
+    representatives.
+
+    Runs incrementally: only representatives of clusters with coverage in the
+    last ARTICLE_CLUSTER_FRESHNESS and the new articles are loaded. New articles
+    are compared against the stored representatives in batched matrix products;
+    only the clusters started within the current batch are checked one by one.
 
     Distances are computed in memory: embeddings are 3072-dimensional, above
     pgvector's index limit, so in SQL every neighbour lookup is a sequential scan
     of the whole table.
     """
-    articles = list(
-        ITNArticle.objects.filter(embedding_vector__isnull=False)
+    new_articles = (
+        ITNArticle.objects.filter(embedding_vector__isnull=False, cluster_id=None)
         # Articles synced in the same batch share a timestamp, so break ties on id
         # to keep cluster representatives stable between runs
         .order_by("created_at", "id")
-        .values_list("pk", "cluster_id", "embedding_vector")
-        # Streamed: buffering every 3072-dim vector client-side costs a few hundred
-        # MB more than the vectors themselves
-        .iterator(chunk_size=500)
+        .values_list("pk", "created_at", "embedding_vector")
+        .iterator(chunk_size=batch_size)
     )
-    if not articles:
-        return
 
-    pks = [pk for pk, _, _ in articles]
-    # 0 marks an article that has no cluster yet, so it can't represent one either
-    cluster_ids = np.array([cluster_id or 0 for _, cluster_id, _ in articles])
-    # Cosine distance is 1 - dot product once the vectors are normalised
-    vectors = np.stack([vector for _, _, vector in articles])
-    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    clusters = list(
+        ITNArticleCluster.objects.filter(
+            last_article_at__gte=timezone.now() - ARTICLE_CLUSTER_FRESHNESS,
+            representative__embedding_vector__isnull=False,
+        ).values_list("pk", "last_article_at", "representative__embedding_vector")
+    )
+    cluster_ids = [pk for pk, _, _ in clusters]
+    cluster_last_article_at = {pk: last_at for pk, last_at, _ in clusters}
+    representatives = (
+        _normalize_vectors(np.stack([vector for _, _, vector in clusters]))
+        if clusters
+        else None
+    )
+    min_similarity = 1 - ARTICLE_CLUSTER_MAX_DISTANCE
+
+    for batch in batched(new_articles, batch_size):
+        vectors = _normalize_vectors(np.stack([vector for _, _, vector in batch]))
+
+        # Nearest stored representative of every article in a single product
+        if representatives is not None:
+            similarities = vectors @ representatives.T
+            nearest = similarities.argmax(axis=1)
+            nearest_similarity = similarities[np.arange(len(batch)), nearest]
+        else:
+            nearest = nearest_similarity = None
+
+        batch_cluster_ids: list[int] = []
+        batch_representatives: list[np.ndarray] = []
+        created_clusters: list[ITNArticleCluster] = []
+        updated_cluster_ids: set[int] = set()
+        assigned = []
+
+        for idx, (pk, created_at, _) in enumerate(batch):
+            best_cluster_id, best_similarity = None, -np.inf
+
+            if nearest is not None:
+                best_cluster_id = cluster_ids[nearest[idx]]
+                best_similarity = nearest_similarity[idx]
+
+            # Clusters started earlier in this batch
+            if batch_representatives:
+                batch_similarities = np.stack(batch_representatives) @ vectors[idx]
+                batch_nearest = batch_similarities.argmax()
+
+                if batch_similarities[batch_nearest] > best_similarity:
+                    best_cluster_id = batch_cluster_ids[batch_nearest]
+                    best_similarity = batch_similarities[batch_nearest]
+
+            if best_similarity >= min_similarity:
+                cluster_id = best_cluster_id
+                updated_cluster_ids.add(cluster_id)
+            else:
+                cluster_id = pk
+                batch_cluster_ids.append(pk)
+                batch_representatives.append(vectors[idx])
+                created_clusters.append(
+                    ITNArticleCluster(representative_id=pk, last_article_at=created_at)
+                )
 
-    unclustered = np.flatnonzero(cluster_ids == 0)
-    for idx in unclustered:
-        # Nearest neighbour among the articles clustered so far, which includes the
-        # ones assigned by earlier iterations
-        candidates = np.where(cluster_ids > 0, vectors @ vectors[idx], -np.inf)
-        nearest = candidates.argmax()
-
-        cluster_ids[idx] = (
-            cluster_ids[nearest]
-            if candidates[nearest] >= 1 - ARTICLE_CLUSTER_MAX_DISTANCE
-            else pks[idx]
-        )
+            cluster_last_article_at[cluster_id] = created_at
+            assigned.append(ITNArticle(pk=pk, cluster_id=cluster_id))
 
-    ITNArticle.objects.bulk_update(
-        [
-            ITNArticle(pk=pks[idx], cluster_id=int(cluster_ids[idx]))
-            for idx in unclustered
-        ],
-        fields=["cluster_id"],
-        batch_size=1000,
-    )
+        # Clusters are stored together with their articles, so a failed run
+        # never leaves articles pointing at missing clusters
+        with transaction.atomic():
+            ITNArticleCluster.objects.bulk_create(created_clusters, batch_size=1000)
+            ITNArticle.objects.bulk_update(
+                assigned, fields=["cluster_id"], batch_size=1000
+            )
+            ITNArticleCluster.objects.bulk_update(
+                [
+                    ITNArticleCluster(
+                        representative_id=pk,
+                        last_article_at=cluster_last_article_at[pk],
+                    )
+                    for pk in updated_cluster_ids
+                ],
+                fields=["last_article_at"],
+                batch_size=1000,
+            )
+
+        # New clusters become regular candidates for the following batches
+        if batch_representatives:
+            cluster_ids.extend(batch_cluster_ids)
+            batch_matrix = np.stack(batch_representatives)
+            representatives = (
+                batch_matrix
+                if representatives is None
+                else np.vstack([representatives, batch_matrix])
+            )
 
 
 def get_post_similar_articles(post: Post):
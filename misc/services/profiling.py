@@ -0,0 +1,227 @@
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.core.cache import caches
+from django.db import connections
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS_KEY = "profiling:endpoints"
+QUERY_SHAPES_KEY = "profiling:query_shapes"
+PROFILING_STATS_TTL = 7 * 24 * 3600
+# Identical query shapes executed at least this many times in a request
+# are reported as possible N+1 queries
+REPEATED_QUERY_THRESHOLD = 5
+
+_MISS = object()
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS_LIST_RE = re.compile(r"%s(?:\s*,\s*%s)+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def get_endpoint_key(view_name: str) -> str:
+    return f"profiling:endpoint:{view_name}"
+
+
+def get_repeated_queries_key(view_name: str) -> str:
+    return f"profiling:repeated_queries:{view_name}"
+
+
+def get_query_shape(sql: str) -> str:
+    """
+    Normalizes SQL so queries differing only by their parameters share the same shape
+    """
+
+    sql = _STRING_LITERAL_RE.sub("?", sql)
+    sql = _NUMBER_LITERAL_RE.sub("?", sql)
+    sql = _PLACEHOLDERS_LIST_RE.sub("%s, ...", sql)
+
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+class RequestProfiler:
+    """
+    Collects query count, DB time, query shapes, cache hits/misses and latency
+    of a single request, and aggregates them per endpoint in Redis.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.query_shapes = Counter()
+        self.stack = ExitStack()
+        self.started = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.query_shapes[get_query_shape(sql)] += 1
+
+    def _track_cache(self):
+        # Cache backends are per thread, so only this request's calls are counted
+        backend = caches["default"]
+        get, get_many = backend.get, backend.get_many
+
+        def tracked_get(key, default=None, *args, **kwargs):
+            value = get(key, _MISS, *args, **kwargs)
+
+            if value is _MISS:
+                self.cache_misses += 1
+                return default
+
+            self.cache_hits += 1
+            return value
+
+        def tracked_get_many(keys, *args, **kwargs):
+            keys = list(keys)
+            values = get_many(keys, *args, **kwargs)
+            self.cache_hits += len(values)
+            self.cache_misses += len(keys) - len(values)
+
+            return values
+
+        backend.get, backend.get_many = tracked_get, tracked_get_many
+
+        def restore():
+            del backend.get, backend.get_many
+
+        self.stack.callback(restore)
+
+    def start(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+
+        self._track_cache()
+        self.started = time.perf_counter()
+
+    def finish(self, view_name: str):
+        latency = time.perf_counter() - self.started
+        self.stack.close()
+
+        # Telemetry should never break the request itself
+        try:
+            self._record(view_name, latency)
+        except Exception:
+            logger.exception(f"Failed to record profile of {view_name}")
+
+    def _record(self, view_name: str, latency: float):
+        endpoint_key = get_endpoint_key(view_name)
+        repeated_queries_key = get_repeated_queries_key(view_name)
+
+        pipe = get_redis_connection("default").pipeline(transaction=False)
+        pipe.sadd(ENDPOINTS_KEY, view_name)
+        pipe.hincrby(endpoint_key, "requests", 1)
+        pipe.hincrby(endpoint_key, "queries", self.queries)
+        pipe.hincrbyfloat(endpoint_key, "db_time", self.db_time)
+        pipe.hincrby(endpoint_key, "cache_hits", self.cache_hits)
+        pipe.hincrby(endpoint_key, "cache_misses", self.cache_misses)
+        pipe.hincrbyfloat(endpoint_key, "latency", latency)
+
+        for shape, count in self.query_shapes.items():
+            if count >= REPEATED_QUERY_THRESHOLD:
+                shape_hash = hashlib.md5(shape.encode()).hexdigest()
+                pipe.hset(QUERY_SHAPES_KEY, shape_hash, shape)
+                pipe.zincrby(repeated_queries_key, count, shape_hash)
+
+        for key in (ENDPOINTS_KEY, QUERY_SHAPES_KEY, endpoint_key):
+            pipe.expire(key, PROFILING_STATS_TTL)
+
+        pipe.expire(repeated_queries_key, PROFILING_STATS_TTL)
+        pipe.execute()
+
+
+def get_endpoint_stats(repeated_queries_limit: int = 3) -> list[dict]:
+    """
+    Per endpoint averages of sampled requests, sorted by total DB time.
+    Includes the most repeated query shapes of each endpoint
+    """
+
+    redis = get_redis_connection("default")
+    view_names = sorted(v.decode() for v in redis.smembers(ENDPOINTS_KEY))
+
+    pipe = redis.pipeline(transaction=False)
+    for view_name in view_names:
+        pipe.hgetall(get_endpoint_key(view_name))
+        pipe.zrevrange(
+            get_repeated_queries_key(view_name),
+            0,
+            repeated_queries_limit - 1,
+            withscores=True,
+        )
+    results = pipe.execute()
+
+    stats = []
+    shape_hashes = set()
+
+    for view_name, data, repeated in zip(
+        view_names, results[::2], results[1::2], strict=True
+    ):
+        data = {k.decode(): float(v) for k, v in data.items()}
+        requests = int(data.get("requests", 0))
+
+        if not requests:
+            continue
+
+        cache_lookups = data["cache_hits"] + data["cache_misses"]
+        stats.append(
+            {
+                "view_name": view_name,
+                "requests": requests,
+                "db_time": data["db_time"],
+                "avg_queries": data["queries"] / requests,
+                "avg_db_time": data["db_time"] / requests,
+                "avg_latency": data["latency"] / requests,
+                "cache_hit_ratio": (
+                    data["cache_hits"] / cache_lookups if cache_lookups else None
+                ),
+                "repeated_queries": [
+                    (shape_hash.decode(), score / requests)
+                    for shape_hash, score in repeated
+                ],
+            }
+        )
+        shape_hashes.update(h for h, _ in stats[-1]["repeated_queries"])
+
+    shape_hashes = list(shape_hashes)
+    shapes = (
+        dict(zip(shape_hashes, redis.hmget(QUERY_SHAPES_KEY, shape_hashes)))
+        if shape_hashes
+        else {}
+    )
+
+    for row in stats:
+        row["repeated_queries"] = [
+            {
+                "sql": (shapes.get(shape_hash) or b"").decode(),
+                "executions_per_request": executions,
+            }
+            for shape_hash, executions in row["repeated_queries"]
+        ]
+
+    return sorted(stats, key=lambda row: (-row["db_time"], row["view_name"]))
+
+
+def reset_endpoint_stats():
+    redis = get_redis_connection("default")
+    view_names = [v.decode() for v in redis.smembers(ENDPOINTS_KEY)]
+
+    redis.delete(
+        ENDPOINTS_KEY,
+        QUERY_SHAPES_KEY,
+        *(get_endpoint_key(v) for v in view_names),
+        *(get_repeated_queries_key(v) for v in view_names),
+    )
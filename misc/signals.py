@@ -3,9 +3,11 @@ import logging
 from anymail.exceptions import AnymailCancelSend
 from anymail.signals import pre_send
 from django.conf import settings
+from django.db.models.signals import post_migrate, pre_migrate
 from django.dispatch import receiver
 
 from users.models import User
+from utils.db import set_migrating_db_alias
 
 logger = logging.getLogger(__name__)
 
@@ -54,3 +56,13 @@ def _filter_staff(emails: list[str], staff_emails: set[str]) -> list[str]:
         for email in emails
         if email.lower() in staff_emails or email.lower().endswith("@metaculus.com")
     ]
+
+
+@receiver(pre_migrate)
+def handle_pre_migrate(sender, using, **kwargs):
+    set_migrating_db_alias(using)
+
+
+@receiver(post_migrate)
+def handle_post_migrate(sender, using, **kwargs):
+    set_migrating_db_alias(None)
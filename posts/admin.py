@@ -10,9 +10,13 @@ from django.utils.safestring import mark_safe
 from posts.models import Post, Notebook
 from posts.services.common import soft_delete_post, trigger_update_post_translations
 from posts.services.hotness import explain_post_hotness
-from posts.tasks import run_post_generate_history_snapshot
+from posts.services.versioning import PostVersionService
 from projects.models import Project
 from projects.services.subscriptions import notify_post_added_to_project
+from projects.services.timeline import (
+    schedule_posts_projects_timeline_refresh,
+    schedule_projects_timeline_refresh,
+)
 from questions.models import Question
 from questions.services.forecasts import build_question_forecasts
 from utils.csv_utils import export_all_data_for_questions
@@ -229,9 +233,14 @@ class PostAdmin(CustomTranslationAdmin):
         ):
             notify_post_added_to_project(obj, obj.default_project)
 
-        run_post_generate_history_snapshot.send(obj.id, request.user.id)
+        PostVersionService.schedule_snapshot(obj.id, request.user.id)
         obj.update_pseudo_materialized_fields()
 
+        # Post dates and projects affect timelines of the old and new projects
+        schedule_posts_projects_timeline_refresh([obj])
+        if old_default_project_id is not None:
+            schedule_projects_timeline_refresh([old_default_project_id])
+
     def save_related(self, request, form, formsets, change):
         old_project_ids = set()
         if change:
@@ -239,13 +248,16 @@ class PostAdmin(CustomTranslationAdmin):
 
         super().save_related(request, form, formsets, change)
 
+        new_project_ids = set(form.instance.projects.values_list("id", flat=True))
+
         if change:
-            new_project_ids = set(form.instance.projects.values_list("id", flat=True))
             added_ids = new_project_ids - old_project_ids
             if added_ids:
                 for project in Project.objects.filter(id__in=added_ids):
                     notify_post_added_to_project(form.instance, project)
 
+        schedule_projects_timeline_refresh(old_project_ids ^ new_project_ids)
+
 
 @admin.register(Notebook)
 class NotebookAdmin(CustomTranslationAdmin):
@@ -11,8 +11,11 @@ from django.utils import timezone
 from projects.services.subscriptions import (
     notify_project_subscriptions_post_status_change,
 )
-from questions.models import Question
-from questions.services.lifecycle import handle_question_open
+from questions.models import Question, QuestionLifecycleEvent
+from questions.services.lifecycle import (
+    handle_questions_open,
+    process_due_lifecycle_events,
+)
 from questions.services.movement import compute_question_movement
 from utils.models import ModelBatchUpdater
 
@@ -107,20 +110,11 @@ def job_check_post_open_event():
             post.published_at_triggered = True
             post.save(update_fields=["published_at_triggered"])
 
-    questions_qs = Question.objects.filter(
-        post__in=Post.objects.filter_published(),
-        open_time__lte=timezone.now(),
-        open_time_triggered=False,
-    ).filter(
-        Q(actual_close_time__isnull=True) | Q(actual_close_time__gte=timezone.now())
+    process_due_lifecycle_events(
+        QuestionLifecycleEvent.EventType.OPEN,
+        handle_questions_open,
+        Q(post__in=Post.objects.filter_published())
+        & (
+            Q(actual_close_time__isnull=True) | Q(actual_close_time__gte=timezone.now())
+        ),
     )
-
-    for question in questions_qs:
-        try:
-            handle_question_open(question)
-        except Exception:
-            logger.exception("Failed to handle question open")
-        finally:
-            # Mark as triggered
-            question.open_time_triggered = True
-            question.save(update_fields=["open_time_triggered"])
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0032_post_news_hotness"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostVersion",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="latest_version",
+                        serialize=False,
+                        to="posts.post",
+                    ),
+                ),
+                ("snapshot_hash", models.CharField(max_length=64)),
+                ("snapshot_key", models.CharField(max_length=255)),
+                (
+                    "uploaded_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+    ]
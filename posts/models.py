@@ -1068,6 +1068,21 @@ class PostActivityBoost(TimeStampedModel):
     score = models.IntegerField()
 
 
+class PostVersion(models.Model):
+    """
+    Latest post version snapshot uploaded to the version history storage.
+    Keeps the snapshot hash locally, so unchanged posts can be skipped
+    without reading the storage back.
+    """
+
+    post = models.OneToOneField(
+        Post, models.CASCADE, primary_key=True, related_name="latest_version"
+    )
+    snapshot_hash = models.CharField(max_length=64)
+    snapshot_key = models.CharField(max_length=255)
+    uploaded_at = models.DateTimeField(default=timezone.now)
+
+
 class Vote(TimeStampedModel):
     class VoteDirection(models.IntegerChoices):
         UP = 1
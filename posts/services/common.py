@@ -21,7 +21,11 @@ from projects.services.common import (
     get_site_main_project,
     move_project_forecasting_end_date,
 )
-from questions.models import Question
+from projects.services.timeline import (
+    schedule_posts_projects_timeline_refresh,
+    schedule_projects_timeline_refresh,
+)
+from questions.models import Question, QuestionLifecycleEvent
 from questions.services.common import (
     create_conditional,
     create_group_of_questions,
@@ -44,9 +48,10 @@ from utils.translation import (
     queryset_filter_outdated_translations,
     update_translations_for_model,
 )
+from .onboarding import invalidate_onboarding_feed
 from .search import generate_post_content_for_embedding_vectorization
 from .versioning import PostVersionService
-from ..tasks import run_post_indexing, run_post_generate_history_snapshot
+from ..tasks import run_post_indexing
 
 logger = logging.getLogger(__name__)
 
@@ -210,6 +215,7 @@ def create_post(
 
     # Invalidate projects cache
     invalidate_projects_questions_count_cache(obj.get_related_projects())
+    schedule_posts_projects_timeline_refresh([obj])
 
     return obj
 
@@ -282,6 +288,8 @@ def update_post(
 
     # Content for embedding generation before update
     original_embedding_content = generate_post_content_for_embedding_vectorization(post)
+    # Projects the post might be moved out of
+    original_projects = post.get_related_projects()
 
     # Updating non-side effect fields
     post, _ = model_update(
@@ -329,6 +337,10 @@ def update_post(
     post.sync_question_post_fk()
     post.update_pseudo_materialized_fields()
 
+    schedule_projects_timeline_refresh(
+        project.id for project in original_projects + post.get_related_projects()
+    )
+
     # Compare the text content before and after the post update for embedding generation
     # If the content has changed, re-run the post indexing process
     if original_embedding_content != generate_post_content_for_embedding_vectorization(
@@ -336,10 +348,7 @@ def update_post(
     ):
         run_post_indexing.send(post.id)
 
-    if PostVersionService.check_is_enabled():
-        run_post_generate_history_snapshot(
-            post.id, updated_by.id if updated_by else None
-        )
+    PostVersionService.schedule_snapshot(post.id, updated_by.id if updated_by else None)
 
     return post
 
@@ -454,6 +463,7 @@ def approve_post(
             "scheduled_resolve_time",
         ],
     )
+    QuestionLifecycleEvent.sync(questions)
 
     update_global_leaderboard_tags(post)
 
@@ -469,13 +479,13 @@ def approve_post(
 
     # Invalidate project questions count cache since approval affects visibility
     invalidate_projects_questions_count_cache(post.get_related_projects())
+    schedule_posts_projects_timeline_refresh([post])
 
     # Translate approved post
     trigger_update_post_translations(post, with_comments=False, force=False)
 
     # Log initial post version
-    if PostVersionService.check_is_enabled():
-        run_post_generate_history_snapshot(post.id, post.author_id)
+    PostVersionService.schedule_snapshot(post.id, post.author_id)
 
 
 @transaction.atomic
@@ -510,6 +520,8 @@ def send_back_to_review(post: Post):
     post.curation_status = Post.CurationStatus.PENDING
     post.open_time = None
     post.save(update_fields=["curation_status", "open_time"])
+    invalidate_onboarding_feed([post])
+    schedule_posts_projects_timeline_refresh([post])
 
 
 def soft_delete_post(post: Post):
@@ -519,6 +531,8 @@ def soft_delete_post(post: Post):
     post.curation_status = Post.CurationStatus.DELETED
     post.save(update_fields=["curation_status"])
     delete_scheduled_post_notifications(post)
+    invalidate_onboarding_feed([post])
+    schedule_posts_projects_timeline_refresh([post])
 
 
 def get_posts_staff_users(
@@ -544,6 +558,7 @@ def make_repost(post: Post, project: Project):
 
     if post.default_project != project:
         post.projects.add(project)
+        schedule_projects_timeline_refresh([project.id])
 
 
 def vote_post(post: Post, user: User, direction: int):
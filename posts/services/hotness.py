@@ -325,6 +325,8 @@ def compute_feed_hotness():
 
     logger.info(f"Finished computing hotness in {round(time.time() - tm, 3)} seconds.")
 
+    return total
+
 
 def handle_post_boost(user: User, post: Post, direction: Vote.VoteDirection):
     if direction == Vote.VoteDirection.UP:
@@ -1,6 +1,9 @@
 import random
 from dataclasses import dataclass, field
+from typing import Iterable
 
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import DateTimeField, Exists, ExpressionWrapper, F, OuterRef, Q
 from django.db.models.functions import Now
 from django.utils import timezone
@@ -14,6 +17,12 @@ from questions.models import Question
 ONBOARDING_PROJECT_ID = 32812
 MAX_TOPICS = 4
 
+ONBOARDING_FEED_CACHE_KEY = "onboarding_feed"
+# Bump whenever the structure of the materialized feed changes
+ONBOARDING_FEED_CACHE_VERSION = 1
+# Safety net only: the feed is refreshed by a periodic job
+ONBOARDING_FEED_CACHE_TIMEOUT = 3600
+
 
 @dataclass
 class CategoryBucket:
@@ -182,3 +191,72 @@ def _build_topics(
         post_ids.extend([basic_post.id, factors_post.id])
 
     return {"topics": topics, "post_ids": post_ids}
+
+
+def build_onboarding_feed() -> dict:
+    """
+    Builds the onboarding feed response with serialized posts
+    """
+
+    from posts.serializers import serialize_post_many
+
+    result = get_onboarding_feed()
+    posts = (
+        serialize_post_many(result["post_ids"], with_cp=True, with_key_factors=True)
+        if result["post_ids"]
+        else []
+    )
+
+    return {**result, "posts": posts}
+
+
+def refresh_onboarding_feed_cache() -> dict:
+    feed = build_onboarding_feed()
+    cache.set(
+        ONBOARDING_FEED_CACHE_KEY,
+        feed,
+        ONBOARDING_FEED_CACHE_TIMEOUT,
+        version=ONBOARDING_FEED_CACHE_VERSION,
+    )
+
+    return feed
+
+
+def get_materialized_onboarding_feed() -> dict:
+    """
+    Serves the feed materialized by the periodic job with a single cache read,
+    building it only if missing
+    """
+
+    feed = cache.get(ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION)
+
+    if feed is None:
+        feed = refresh_onboarding_feed_cache()
+
+    return feed
+
+
+def invalidate_onboarding_feed(posts: Iterable[Post]):
+    """
+    Drops the materialized feed if it includes any of the given posts
+    (e.g. once they close or get unpublished) and schedules its rebuild.
+    Runs once the current transaction commits, so the rebuild can't
+    cache the posts' pre-commit state
+    """
+
+    from posts.tasks import warm_cache_onboarding_feed
+
+    post_ids = {post.id for post in posts}
+
+    def invalidate():
+        feed = cache.get(
+            ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION
+        )
+
+        if feed and post_ids & set(feed["post_ids"]):
+            cache.delete(
+                ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION
+            )
+            warm_cache_onboarding_feed.send()
+
+    transaction.on_commit(invalidate)
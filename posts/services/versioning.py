@@ -1,14 +1,92 @@
+import hashlib
 import json
-import time
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
 
 from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
-from django.utils import translation
+from django.utils import timezone, translation
+from django_redis import get_redis_connection
 
 from questions.models import Question, GroupOfQuestions, Conditional
 from users.models import User
 from utils.aws import get_boto_client
-from ..models import Post, Notebook
+from ..models import Post, Notebook, PostVersion
+
+# Redis hash of post_id -> id of the last editor, for posts awaiting a snapshot
+PENDING_SNAPSHOTS_KEY = "post_versions:pending"
+# Set while a snapshot task is scheduled, so bursts of edits enqueue it only once
+SNAPSHOTS_SCHEDULED_KEY = "post_versions:scheduled"
+# How long edits are collected before snapshots are taken (ms)
+SNAPSHOTS_COALESCE_DELAY = 30_000
+# Expires the scheduled flag in case the task message was lost (ms)
+SNAPSHOTS_SCHEDULED_TTL = 600_000
+
+UPLOAD_BATCH_SIZE = 100
+
+
+class PostVersionStorage:
+    """
+    Storage backend of the post version history
+    """
+
+    def put_many(self, objects: dict[str, str]):
+        """
+        Stores JSON documents, keyed by their path
+        """
+
+        raise NotImplementedError()
+
+
+class S3PostVersionStorage(PostVersionStorage):
+    def __init__(self, bucket: str, max_workers: int = 8):
+        self.bucket = bucket
+        self.max_workers = max_workers
+
+    def put_many(self, objects: dict[str, str]):
+        # S3 has no batch upload, so objects are uploaded concurrently
+        # sharing a single (thread-safe) client
+        s3 = get_boto_client("s3")
+
+        def put_object(item: tuple[str, str]):
+            key, body = item
+
+            s3.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=body,
+                ContentType="application/json",
+            )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Consume results to propagate upload errors
+            list(executor.map(put_object, objects.items()))
+
+
+class LocalPostVersionStorage(PostVersionStorage):
+    def __init__(self, root: str):
+        self.root = root
+
+    def put_many(self, objects: dict[str, str]):
+        for key, body in objects.items():
+            path = os.path.join(self.root, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            with open(path, "w") as f:
+                f.write(body)
+
+
+def get_post_version_storage() -> PostVersionStorage | None:
+    """
+    Version tracking is disabled if no storage is configured
+    """
+
+    if settings.POST_VERSION_HISTORY_LOCAL_PATH:
+        return LocalPostVersionStorage(settings.POST_VERSION_HISTORY_LOCAL_PATH)
+
+    if settings.AWS_STORAGE_BUCKET_POST_VERSION_HISTORY:
+        return S3PostVersionStorage(settings.AWS_STORAGE_BUCKET_POST_VERSION_HISTORY)
 
 
 def drop_keys(obj: dict, drop: list):
@@ -123,7 +201,8 @@ class PostVersionService:
         )
 
         data["questions"] = [
-            cls._get_question_snapshot(q) for q in group.questions.all().order_by("id")
+            cls._get_question_snapshot(q)
+            for q in sorted(group.questions.all(), key=lambda q: q.id)
         ]
         return data
 
@@ -153,73 +232,155 @@ class PostVersionService:
 
     @classmethod
     def check_is_enabled(cls):
-        return bool(settings.AWS_STORAGE_BUCKET_POST_VERSION_HISTORY)
+        return get_post_version_storage() is not None
+
+    @classmethod
+    def hash_obj(cls, obj: dict) -> str:
+        obj = obj.copy()
+        drop = ["edited_at", "updated_by_user_id"]
+
+        return json.dumps(drop_keys(obj, drop), sort_keys=True, cls=DjangoJSONEncoder)
 
     @classmethod
-    def upload_snapshot_to_s3(cls, post: Post, snapshot: dict):
+    def get_snapshot_hash(cls, snapshot: dict) -> str:
         """
-        Uploads the snapshot to S3 as a JSON file.
-        Path: post_versions/{post_id}/{timestamp}.json
+        Hash of the snapshot, ignoring metadata fields that always change.
         """
 
-        s3 = get_boto_client("s3")
+        return hashlib.sha256(cls.hash_obj(snapshot).encode()).hexdigest()
 
-        key = f"post_versions/{post.id}/{round(time.time() * 1000)}.json"
+    @classmethod
+    def schedule_snapshot(cls, post_id: int, updated_by_id: int | None = None):
+        """
+        Marks the post as edited and schedules a snapshot.
+        Edits made before the scheduled run are coalesced into a single snapshot
+        of the post's latest state, attributed to the last editor.
+        """
 
-        s3.put_object(
-            Bucket=settings.AWS_STORAGE_BUCKET_POST_VERSION_HISTORY,
-            Key=key,
-            Body=json.dumps(snapshot, cls=DjangoJSONEncoder),
-            ContentType="application/json",
-        )
+        from posts.tasks import run_post_generate_history_snapshots
+
+        if not cls.check_is_enabled():
+            return
+
+        redis = get_redis_connection("default")
+
+        with redis.pipeline() as pipe:
+            pipe.hset(PENDING_SNAPSHOTS_KEY, post_id, updated_by_id or "")
+            pipe.set(SNAPSHOTS_SCHEDULED_KEY, 1, nx=True, px=SNAPSHOTS_SCHEDULED_TTL)
+            _, is_scheduled = pipe.execute()
+
+        if is_scheduled:
+            run_post_generate_history_snapshots.send_with_options(
+                delay=SNAPSHOTS_COALESCE_DELAY
+            )
 
     @classmethod
-    def get_latest_snapshot_from_s3(cls, post: Post) -> dict | None:
-        s3 = get_boto_client("s3")
-        prefix = f"post_versions/{post.id}/"
+    def pop_pending_snapshots(cls) -> dict[int, int | None]:
+        """
+        Atomically takes all scheduled snapshots, mapped to the last editor id
+        """
 
-        response = s3.list_objects_v2(
-            Bucket=settings.AWS_STORAGE_BUCKET_POST_VERSION_HISTORY,
-            Prefix=prefix,
-        )
-        contents = response.get("Contents", [])
-        if not contents:
-            return None
+        redis = get_redis_connection("default")
 
-        # Sort by Key (which contains timestamp) descending
-        latest_obj = sorted(contents, key=lambda x: x["Key"], reverse=True)[0]
+        with redis.pipeline() as pipe:
+            pipe.hgetall(PENDING_SNAPSHOTS_KEY)
+            pipe.delete(PENDING_SNAPSHOTS_KEY, SNAPSHOTS_SCHEDULED_KEY)
+            pending, _ = pipe.execute()
 
-        obj = s3.get_object(
-            Bucket=settings.AWS_STORAGE_BUCKET_POST_VERSION_HISTORY,
-            Key=latest_obj["Key"],
-        )
-        return json.loads(obj["Body"].read().decode("utf-8"))
+        return {
+            int(post_id): int(updated_by_id) if updated_by_id else None
+            for post_id, updated_by_id in pending.items()
+        }
 
     @classmethod
-    def hash_obj(cls, obj: dict) -> str:
-        obj = obj.copy()
-        drop = ["edited_at", "updated_by_user_id"]
+    def generate_and_upload_pending(cls):
+        pending = cls.pop_pending_snapshots()
+        if not pending:
+            return
 
-        return json.dumps(drop_keys(obj, drop), sort_keys=True, cls=DjangoJSONEncoder)
+        users = User.objects.in_bulk({x for x in pending.values() if x})
+        posts = (
+            Post.objects.filter(pk__in=pending)
+            .select_related(
+                "question",
+                "group_of_questions",
+                "conditional__question_yes",
+                "conditional__question_no",
+                "notebook",
+            )
+            .prefetch_related("group_of_questions__questions")
+        )
+
+        try:
+            for batch in batched(
+                posts.iterator(chunk_size=UPLOAD_BATCH_SIZE), UPLOAD_BATCH_SIZE
+            ):
+                cls.generate_and_upload_many(
+                    [(post, users.get(pending[post.id])) for post in batch]
+                )
+        except Exception:
+            # Put snapshots back, so they are picked up by the retry.
+            # Newer edits take precedence
+            redis = get_redis_connection("default")
+
+            with redis.pipeline() as pipe:
+                for post_id, updated_by_id in pending.items():
+                    pipe.hsetnx(PENDING_SNAPSHOTS_KEY, post_id, updated_by_id or "")
+                pipe.execute()
+
+            raise
 
     @classmethod
-    def _snapshots_are_equal(cls, s1: dict, s2: dict) -> bool:
+    def generate_and_upload_many(cls, items: list[tuple[Post, User | None]]):
         """
-        Compares two snapshots, ignoring metadata fields that always change.
+        Uploads snapshots of the given posts in one batch,
+        skipping posts which haven't changed since their latest snapshot.
         """
-        # Create copies to avoid modifying originals
 
-        return cls.hash_obj(s1) == cls.hash_obj(s2)
-
-    @classmethod
-    def generate_and_upload(cls, post: Post, updated_by: User = None):
-        if not cls.check_is_enabled():
+        storage = get_post_version_storage()
+        if not storage or not items:
             return
 
-        snapshot = cls.get_post_version_snapshot(post, updated_by)
-        latest_snapshot = cls.get_latest_snapshot_from_s3(post)
+        latest_hashes = dict(
+            PostVersion.objects.filter(
+                post_id__in=[post.id for post, _ in items]
+            ).values_list("post_id", "snapshot_hash")
+        )
+
+        now = timezone.now()
+        timestamp = round(now.timestamp() * 1000)
+        objects = {}
+        versions = []
+
+        for post, updated_by in items:
+            snapshot = cls.get_post_version_snapshot(post, updated_by)
+            snapshot_hash = cls.get_snapshot_hash(snapshot)
+
+            if latest_hashes.get(post.id) == snapshot_hash:
+                continue
+
+            key = f"post_versions/{post.id}/{timestamp}.json"
+            objects[key] = json.dumps(snapshot, cls=DjangoJSONEncoder)
+            versions.append(
+                PostVersion(
+                    post=post,
+                    snapshot_hash=snapshot_hash,
+                    snapshot_key=key,
+                    uploaded_at=now,
+                )
+            )
 
-        if latest_snapshot and cls._snapshots_are_equal(snapshot, latest_snapshot):
+        if not objects:
             return
 
-        cls.upload_snapshot_to_s3(post, snapshot)
+        storage.put_many(objects)
+        PostVersion.objects.bulk_create(
+            versions,
+            update_conflicts=True,
+            unique_fields=["post"],
+            update_fields=["snapshot_hash", "snapshot_key", "uploaded_at"],
+        )
+
+    @classmethod
+    def generate_and_upload(cls, post: Post, updated_by: User = None):
+        cls.generate_and_upload_many([(post, updated_by)])
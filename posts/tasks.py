@@ -3,9 +3,9 @@ import logging
 import dramatiq
 
 from misc.services.itn import generate_related_articles_for_post
-from users.models import User
 from utils.dramatiq import concurrency_retries, task_concurrent_limit
 from .models import Post
+from .services.onboarding import refresh_onboarding_feed_cache
 from .services.search import update_post_search_embedding_vector
 from .services.subscriptions import notify_post_cp_change
 from .services.versioning import PostVersionService
@@ -62,8 +62,14 @@ def run_post_indexing(post_id):
 
 
 @dramatiq.actor(max_retries=1)
-def run_post_generate_history_snapshot(post_id: int, updated_by_id: int):
-    updated_by = User.objects.get(pk=updated_by_id) if updated_by_id else None
-    post = Post.objects.get(pk=post_id)
+def run_post_generate_history_snapshots():
+    """
+    Uploads snapshots of all posts edited since the previous run
+    """
 
-    PostVersionService.generate_and_upload(post, updated_by=updated_by)
+    PostVersionService.generate_and_upload_pending()
+
+
+@dramatiq.actor
+def warm_cache_onboarding_feed():
+    refresh_onboarding_feed_cache()
@@ -47,7 +47,7 @@ from posts.services.hotness import (
     explain_post_news_hotness,
 )
 from posts.services.notes import update_private_note, get_private_notes_feed
-from posts.services.onboarding import get_onboarding_feed
+from posts.services.onboarding import get_materialized_onboarding_feed
 from posts.services.spam_detection import check_and_handle_post_spam
 from posts.services.subscriptions import update_post_subscriptions
 from posts.utils import check_can_edit_post, get_post_slug
@@ -56,6 +56,7 @@ from projects.permissions import ObjectPermission
 from projects.services.common import get_project_permission_for_user
 from questions.serializers.common import QuestionApproveSerializer
 from utils.csv_utils import export_data_for_questions
+from utils.db import use_replica
 from utils.files import validate_and_upload_image
 from utils.paginator import CountlessLimitOffsetPagination, LimitOffsetPagination
 from utils.tasks import email_data_task
@@ -70,6 +71,7 @@ spam_error = ValidationError(
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@use_replica()
 def posts_list_api_view(request):
     paginator = CountlessLimitOffsetPagination()
     qs = Post.objects.all()
@@ -125,6 +127,7 @@ def posts_list_api_view(request):
 @cache_page(60 * 30)
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@use_replica()
 def posts_list_homeage_api_view(request):
     """
     Cached view of homepage posts
@@ -621,16 +624,12 @@ def random_post_id(request):
     return Response({"id": post.id, "post_slug": get_post_slug(post)})
 
 
-@cache_page(60 * 30)
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def onboarding_feed_api_view(_request):
-    result = get_onboarding_feed()
-    if not result["post_ids"]:
-        return Response({"topics": [], "posts": []})
+    feed = get_materialized_onboarding_feed()
 
-    posts = serialize_post_many(result["post_ids"], with_cp=True, with_key_factors=True)
-    return Response({"topics": result["topics"], "posts": posts})
+    return Response({"topics": feed["topics"], "posts": feed["posts"]})
 
 
 @api_view(["POST"])
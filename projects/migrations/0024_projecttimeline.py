@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0023_alter_project_bot_leaderboard_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectTimeline",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="timeline",
+                        serialize=False,
+                        to="projects.project",
+                    ),
+                ),
+                ("last_spot_scoring_time", models.DateTimeField(null=True)),
+                ("latest_actual_resolve_time", models.DateTimeField(null=True)),
+                ("latest_scheduled_resolve_time", models.DateTimeField(null=True)),
+                ("latest_close_time", models.DateTimeField(null=True)),
+                ("all_questions_resolved", models.BooleanField(default=True)),
+                ("project_close_date", models.DateTimeField(null=True)),
+                ("project_forecasting_end_date", models.DateTimeField(null=True)),
+                ("updated_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -540,6 +540,31 @@ class ProjectSubscription(TimeStampedModel):
         ]
 
 
+class ProjectTimeline(models.Model):
+    """
+    Aggregated timeline of project questions,
+    refreshed by question lifecycle hooks. See `projects.services.timeline`
+    """
+
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, primary_key=True, related_name="timeline"
+    )
+
+    last_spot_scoring_time = models.DateTimeField(null=True)
+    latest_actual_resolve_time = models.DateTimeField(null=True)
+    latest_scheduled_resolve_time = models.DateTimeField(null=True)
+    # Latest close time of questions closing before the project forecasting end date,
+    # so questions are all closed once it has passed
+    latest_close_time = models.DateTimeField(null=True)
+    all_questions_resolved = models.BooleanField(default=True)
+
+    # Project dates the timeline was calculated with
+    project_close_date = models.DateTimeField(null=True)
+    project_forecasting_end_date = models.DateTimeField(null=True)
+
+    updated_at = models.DateTimeField()
+
+
 class ProjectIndex(TimeStampedModel):
     class IndexType(models.TextChoices):
         DEFAULT = "default"
@@ -9,7 +9,7 @@ from rest_framework.exceptions import ValidationError
 from projects.models import Project, ProjectUserPermission, ProjectIndex
 from projects.serializers.communities import CommunitySerializer
 from projects.services.cache import get_projects_questions_count_cached
-from projects.services.common import get_timeline_data_for_projects
+from projects.services.timeline import get_timeline_data_for_projects
 from projects.services.indexes import get_multi_year_index_data, get_default_index_data
 from users.serializers import UserPublicSerializer
 
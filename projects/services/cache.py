@@ -1,6 +1,7 @@
 from django.core.cache import cache
 
 from projects.models import Project
+from utils.cache import cache_per_object
 from .common import ProjectQuestionCounts, get_questions_count_for_projects
 
 QUESTIONS_COUNT_CACHE_PREFIX = "project_questions_count:v2"
@@ -13,34 +14,23 @@ def get_projects_questions_count_cache_key(project_id: int) -> str:
     return f"{QUESTIONS_COUNT_CACHE_PREFIX}:{project_id}"
 
 
+@cache_per_object(
+    get_projects_questions_count_cache_key, timeout=QUESTIONS_COUNT_CACHE_TIMEOUT
+)
 def get_projects_questions_count_cached(
     project_ids: list[int],
 ) -> dict[int, ProjectQuestionCounts]:
-    key_map: dict[int, str] = {
-        pid: get_projects_questions_count_cache_key(pid) for pid in project_ids
+    db_counts = get_questions_count_for_projects(project_ids)
+
+    return {
+        pid: db_counts.get(
+            pid,
+            ProjectQuestionCounts(
+                questions_count=0, questions_count_including_subquestions=0
+            ),
+        )
+        for pid in project_ids
     }
-    cache_data: dict[str, ProjectQuestionCounts] = cache.get_many(key_map.values())
-    result: dict[int, ProjectQuestionCounts] = {
-        pid: cache_data[key] for pid, key in key_map.items() if key in cache_data
-    }
-
-    missing_ids = [pid for pid in project_ids if pid not in result]
-
-    if missing_ids:
-        db_counts = get_questions_count_for_projects(missing_ids)
-
-        for pid in missing_ids:
-            result[pid] = db_counts.get(
-                pid,
-                ProjectQuestionCounts(
-                    questions_count=0, questions_count_including_subquestions=0
-                ),
-            )
-
-        to_cache = {key_map[pid]: result[pid] for pid in missing_ids}
-        cache.set_many(to_cache, timeout=QUESTIONS_COUNT_CACHE_TIMEOUT)
-
-    return result
 
 
 def invalidate_projects_questions_count_cache(projects: list[Project]) -> None:
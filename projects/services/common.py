@@ -16,7 +16,7 @@ from projects.permissions import ObjectPermission
 from questions.constants import QuestionStatus
 from questions.models import Question
 from users.models import User
-from utils.cache import cache_per_object, cached_singleton
+from utils.cache import cached_singleton
 from utils.dtypes import generate_map_from_list
 
 
@@ -206,94 +206,6 @@ def get_questions_by_project(
     }
 
 
-def _calculate_timeline_data(project: Project, questions: Iterable[Question]) -> dict:
-    all_questions_resolved = True
-    all_questions_closed = True
-
-    spot_scoring_times = []
-    actual_resolve_times = []
-    scheduled_resolve_times = []
-
-    project_close_date = project.close_date or make_aware(datetime.max)
-    project_forecasting_end_date = project.forecasting_end_date or project_close_date
-
-    for question in questions:
-        if all_questions_resolved:
-            all_questions_resolved = (
-                question.actual_resolve_time
-                # Or treat as resolved as scheduled resolution is in the future
-                or question.scheduled_resolve_time > project_close_date
-            )
-
-        # Determine questions closure
-        if all_questions_closed:
-            close_time = question.actual_close_time or question.scheduled_close_time
-            all_questions_closed = (
-                close_time <= timezone.now()
-                or close_time > project_forecasting_end_date
-            )
-
-        spot_scoring_time = question.get_spot_scoring_time()
-        if spot_scoring_time:
-            spot_scoring_times.append(spot_scoring_time)
-
-        if question.actual_resolve_time:
-            actual_resolve_times.append(question.actual_resolve_time)
-
-        if question.scheduled_resolve_time:
-            scheduled_resolve_time = (
-                question.actual_resolve_time or question.scheduled_resolve_time
-            )
-            scheduled_resolve_times.append(scheduled_resolve_time)
-
-    def get_max(data: list):
-        return max([x for x in data if x <= project_close_date], default=None)
-
-    return {
-        "last_spot_scoring_time": get_max(spot_scoring_times),
-        "latest_actual_resolve_time": get_max(actual_resolve_times),
-        "latest_scheduled_resolve_time": get_max(scheduled_resolve_times),
-        "all_questions_resolved": all_questions_resolved,
-        "all_questions_closed": all_questions_closed,
-    }
-
-
-def get_project_timeline_data(project: Project):
-    questions = Question.objects.filter(
-        post_id__in=list(
-            Post.objects.filter_projects(project)
-            .filter(curation_status=Post.CurationStatus.APPROVED)
-            .values_list("id", flat=True)
-        )
-    )
-
-    return _calculate_timeline_data(project, questions)
-
-
-@cache_per_object(timeout=60 * 15)
-def get_timeline_data_for_projects(project_ids: list[int]) -> dict[int, dict]:
-    projects = Project.objects.in_bulk(project_ids)
-
-    question_qs = Question.objects.only(
-        "id",
-        "post_id",
-        "cp_reveal_time",
-        "spot_scoring_time",
-        "actual_resolve_time",
-        "scheduled_resolve_time",
-        "actual_close_time",
-        "scheduled_close_time",
-    )
-    questions_by_project = get_questions_by_project(
-        project_ids, question_qs=question_qs
-    )
-
-    return {
-        pid: _calculate_timeline_data(project, questions_by_project.get(pid, []))
-        for pid, project in projects.items()
-    }
-
-
 # Path segment -> candidate Project types for project-promoting URLs.
 # The /tournament/ prefix serves both tournaments and question series.
 _URL_TYPES_BY_PATH = {
@@ -331,7 +243,7 @@ class FeedTileRule(TextChoices):
     ALL_QUESTIONS_RESOLVED = "ALL_QUESTIONS_RESOLVED"
 
 
-@cached_singleton(timeout=60 * 20)
+@cached_singleton(timeout=60 * 20, stale_timeout=60 * 10)
 def get_feed_project_tiles() -> list[dict]:
     now = timezone.now()
 
@@ -0,0 +1,214 @@
+from datetime import timedelta
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from posts.models import Post
+from projects.models import Project, ProjectTimeline
+from questions.models import Question
+
+# Stored timelines are recalculated on read once they get older,
+# so changes missed by the refresh hooks don't go unnoticed forever
+PROJECT_TIMELINE_MAX_AGE = timedelta(hours=1)
+
+PROJECTS_TIMELINE_SQL = """
+WITH project_questions AS (
+    SELECT p.default_project_id AS project_id, q.id AS question_id
+    FROM {post} p
+    JOIN {question} q ON q.post_id = p.id
+    WHERE p.default_project_id = ANY(%(project_ids)s)
+      AND p.curation_status = %(approved)s
+    UNION
+    SELECT pp.project_id, q.id
+    FROM {post_projects} pp
+    JOIN {post} p ON p.id = pp.post_id
+    JOIN {question} q ON q.post_id = p.id
+    WHERE pp.project_id = ANY(%(project_ids)s)
+      AND p.curation_status = %(approved)s
+),
+timelines AS (
+    SELECT
+        pr.id AS project_id,
+        pr.close_date,
+        pr.forecasting_end_date,
+        COALESCE(pr.close_date, 'infinity') AS max_date,
+        COALESCE(pr.forecasting_end_date, pr.close_date, 'infinity')
+            AS max_close_time,
+        -- Same as `Question.get_spot_scoring_time`
+        COALESCE(
+            q.spot_scoring_time,
+            CASE WHEN q.cp_reveal_time > q.open_time THEN q.cp_reveal_time END,
+            q.actual_close_time,
+            q.scheduled_close_time
+        ) AS spot_scoring_time,
+        q.actual_resolve_time,
+        q.scheduled_resolve_time,
+        COALESCE(q.actual_resolve_time, q.scheduled_resolve_time)
+            AS resolve_time,
+        COALESCE(q.actual_close_time, q.scheduled_close_time) AS close_time
+    FROM {project} pr
+    LEFT JOIN project_questions pq ON pq.project_id = pr.id
+    LEFT JOIN {question} q ON q.id = pq.question_id
+    WHERE pr.id = ANY(%(project_ids)s)
+)
+SELECT
+    project_id,
+    MAX(spot_scoring_time) FILTER (WHERE spot_scoring_time <= max_date),
+    MAX(actual_resolve_time) FILTER (WHERE actual_resolve_time <= max_date),
+    MAX(resolve_time) FILTER (
+        WHERE scheduled_resolve_time IS NOT NULL AND resolve_time <= max_date
+    ),
+    MAX(close_time) FILTER (WHERE close_time <= max_close_time),
+    -- Questions scheduled to resolve after the project closes are treated as resolved
+    COALESCE(
+        BOOL_AND(
+            actual_resolve_time IS NOT NULL OR scheduled_resolve_time > max_date
+        ),
+        TRUE
+    ),
+    close_date,
+    forecasting_end_date
+FROM timelines
+GROUP BY project_id, close_date, forecasting_end_date
+""".format(
+    post=Post._meta.db_table,
+    post_projects=Post.projects.through._meta.db_table,
+    question=Question._meta.db_table,
+    project=Project._meta.db_table,
+)
+
+
+def refresh_projects_timeline(project_ids: Iterable[int]) -> dict[int, ProjectTimeline]:
+    """
+    Recalculates timelines of the given projects with a single grouped aggregate
+    """
+
+    project_ids = list(set(project_ids))
+
+    if not project_ids:
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            PROJECTS_TIMELINE_SQL,
+            {
+                "project_ids": project_ids,
+                "approved": Post.CurationStatus.APPROVED,
+            },
+        )
+        rows = cursor.fetchall()
+
+    now = timezone.now()
+    timelines = [
+        ProjectTimeline(
+            project_id=project_id,
+            last_spot_scoring_time=last_spot_scoring_time,
+            latest_actual_resolve_time=latest_actual_resolve_time,
+            latest_scheduled_resolve_time=latest_scheduled_resolve_time,
+            latest_close_time=latest_close_time,
+            all_questions_resolved=all_questions_resolved,
+            project_close_date=project_close_date,
+            project_forecasting_end_date=project_forecasting_end_date,
+            updated_at=now,
+        )
+        for (
+            project_id,
+            last_spot_scoring_time,
+            latest_actual_resolve_time,
+            latest_scheduled_resolve_time,
+            latest_close_time,
+            all_questions_resolved,
+            project_close_date,
+            project_forecasting_end_date,
+        ) in rows
+    ]
+
+    ProjectTimeline.objects.bulk_create(
+        timelines,
+        update_conflicts=True,
+        unique_fields=["project"],
+        update_fields=[
+            f.name for f in ProjectTimeline._meta.concrete_fields if not f.primary_key
+        ],
+    )
+
+    return {timeline.project_id: timeline for timeline in timelines}
+
+
+def schedule_projects_timeline_refresh(project_ids: Iterable[int]):
+    """
+    Refreshes timelines of the given projects in the background
+    once the current transaction commits
+    """
+
+    from projects.tasks import refresh_projects_timeline_task
+
+    project_ids = sorted(set(project_ids))
+
+    if project_ids:
+        transaction.on_commit(lambda: refresh_projects_timeline_task.send(project_ids))
+
+
+def schedule_posts_projects_timeline_refresh(posts: Iterable[Post]):
+    """
+    Schedules refresh of all projects the given posts belong to
+    """
+
+    posts = list(posts)
+    project_ids = {post.default_project_id for post in posts}
+    project_ids.update(
+        Post.projects.through.objects.filter(post__in=posts).values_list(
+            "project_id", flat=True
+        )
+    )
+
+    schedule_projects_timeline_refresh(project_ids)
+
+
+def serialize_project_timeline(timeline: ProjectTimeline) -> dict:
+    return {
+        "last_spot_scoring_time": timeline.last_spot_scoring_time,
+        "latest_actual_resolve_time": timeline.latest_actual_resolve_time,
+        "latest_scheduled_resolve_time": timeline.latest_scheduled_resolve_time,
+        "all_questions_resolved": timeline.all_questions_resolved,
+        "all_questions_closed": (
+            not timeline.latest_close_time
+            or timeline.latest_close_time <= timezone.now()
+        ),
+    }
+
+
+def get_timeline_data_for_projects(project_ids: list[int]) -> dict[int, dict]:
+    """
+    Returns stored project timelines.
+    Missing, expired ones, or calculated before project dates were changed, are refreshed
+    """
+
+    projects = Project.objects.filter(pk__in=project_ids).select_related("timeline")
+    timelines = {}
+    outdated_ids = []
+
+    for project in projects:
+        timeline = getattr(project, "timeline", None)
+
+        if (
+            timeline
+            and timeline.project_close_date == project.close_date
+            and timeline.project_forecasting_end_date == project.forecasting_end_date
+            and timeline.updated_at > timezone.now() - PROJECT_TIMELINE_MAX_AGE
+        ):
+            timelines[project.id] = timeline
+        else:
+            outdated_ids.append(project.id)
+
+    timelines.update(refresh_projects_timeline(outdated_ids))
+
+    return {
+        project_id: serialize_project_timeline(timeline)
+        for project_id, timeline in timelines.items()
+    }
+
+
+def get_project_timeline_data(project: Project) -> dict:
+    return get_timeline_data_for_projects([project.id])[project.id]
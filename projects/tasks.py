@@ -1,8 +1,21 @@
 import dramatiq
 
+from projects.models import Project
 from projects.services.common import get_feed_project_tiles
+from projects.services.timeline import refresh_projects_timeline
 
 
 @dramatiq.actor
 def warm_cache_feed_project_tiles() -> None:
     get_feed_project_tiles.refresh_cache()
+
+
+@dramatiq.actor
+def refresh_projects_timeline_task(project_ids: list[int]):
+    # Most posts also belong to the site main project and categories,
+    # but timelines are only served for tournaments
+    refresh_projects_timeline(
+        Project.objects.filter(pk__in=project_ids)
+        .filter_tournament()
+        .values_list("id", flat=True)
+    )
@@ -30,10 +30,10 @@ from projects.services.common import (
     get_project_permission_for_user,
     invite_user_to_project,
     get_site_main_project,
-    get_project_timeline_data,
     get_feed_project_tiles,
 )
 from projects.services.subscriptions import subscribe_project, unsubscribe_project
+from projects.services.timeline import get_project_timeline_data
 from questions.models import Question
 from scoring.constants import LeaderboardScoreTypes
 from scoring.models import Leaderboard
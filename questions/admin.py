@@ -14,7 +14,9 @@ from django_better_admin_arrayfield.admin.mixins import DynamicArrayMixin
 from rest_framework.exceptions import ValidationError as DRFValidationError
 
 from posts.models import Post
-from posts.tasks import run_post_generate_history_snapshot
+from posts.services.onboarding import invalidate_onboarding_feed
+from posts.services.versioning import PostVersionService
+from projects.services.timeline import schedule_posts_projects_timeline_refresh
 from questions.constants import UnsuccessfulResolutionType
 from questions.models import (
     AggregateForecast,
@@ -605,8 +607,10 @@ class QuestionAdmin(CustomTranslationAdmin, DynamicArrayMixin):
         super().save_model(request, obj, form, change)
 
         if obj.post_id:
-            run_post_generate_history_snapshot.send(obj.post_id, request.user.id)
+            PostVersionService.schedule_snapshot(obj.post_id, request.user.id)
             obj.post.update_pseudo_materialized_fields()
+            # Question dates feed the timelines of the post projects
+            schedule_posts_projects_timeline_refresh([obj.post])
 
     def get_actions(self, request):
         actions = super().get_actions(request)
@@ -799,13 +803,15 @@ class QuestionAdmin(CustomTranslationAdmin, DynamicArrayMixin):
     )
 
     def mark_post_as_deleted(self, request, queryset: QuerySet[Question]):
-        updated = 0
+        deleted_posts = []
         for obj in queryset:
             post = obj.get_post()
             if post is not None:
                 post.curation_status = Post.CurationStatus.DELETED
                 post.save()
-                updated += 1
+                deleted_posts.append(post)
+        invalidate_onboarding_feed(deleted_posts)
+        updated = len(deleted_posts)
         self.message_user(request, f"Marked {updated} post(s) as DELETED.")
 
     mark_post_as_deleted.short_description = "Mark post as DELETED"
@@ -884,7 +890,7 @@ class GroupOfQuestionsAdmin(CustomTranslationAdmin):
         super().save_model(request, obj, form, change)
 
         if obj.post:
-            run_post_generate_history_snapshot.send(obj.post.id, request.user.id)
+            PostVersionService.schedule_snapshot(obj.post.id, request.user.id)
 
 
 @admin.register(Forecast)
@@ -1,130 +1,176 @@
 import logging
 
-from django.db.models import Q
-
 from questions.models import (
     Forecast,
+    Question,
     UserForecastNotification,
 )
+from users.models import User
 
 from django.utils import timezone
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection
 
-from datetime import timedelta, datetime
+from datetime import date, datetime, time
 
 
 logger = logging.getLogger(__name__)
 
 
-@transaction.atomic
-def update_standing_forecasts(before_date):
-    has_valid_question_times = Q(
-        question__open_time__isnull=False,
-        question__scheduled_close_time__isnull=False,
-    )
-    # Filter active forecasts, made before the "before_date" and belonging to users users that have a prediction expiration percent set
-    base_queryset = (
-        Forecast.objects.active()
-        .filter(has_valid_question_times)
-        # end_time check is redundant, but it's here for clarity
-        .filter(end_time__isnull=True, start_time__lt=before_date)
-        .filter(author__prediction_expiration_percent__isnull=False)
-        .select_related("question")
+# Next keyset page of standing forecast candidates, bounded by forecast id
+NEXT_PAGE_BOUNDARY_SQL = """
+SELECT MAX(id)
+FROM (
+    SELECT id
+    FROM {forecast_table}
+    WHERE id > %(last_id)s
+      AND end_time IS NULL
+      AND start_time < %(before_date)s
+    ORDER BY id
+    LIMIT %(batch_size)s
+) page
+""".format(forecast_table=Forecast._meta.db_table)
+
+# Computes the auto-withdrawal end_time of every standing forecast of a keyset page
+# and schedules its expiration notification, in a single statement:
+#
+# - end_time is the next multiple of the author's prediction expiration percent
+#   of the question's lifetime, but at least 30 days after the forecast
+#   and at least 3 days from now so users have a chance to update
+# - notifications trigger 1 week before end_time if the forecast lives longer
+#   than 3 weeks, otherwise 1 day before. They're never earlier than 2 days from
+#   now, nor later than 1 day before the question closes
+UPDATE_STANDING_FORECASTS_SQL = """
+WITH page AS MATERIALIZED (
+    -- Forces the page to be resolved through the primary key first,
+    -- rather than from the (much larger) questions x users join
+    SELECT id, question_id, author_id
+    FROM {forecast_table}
+    WHERE id > %(last_id)s
+      AND id <= %(max_id)s
+      AND end_time IS NULL
+      AND start_time <= %(now)s
+      AND start_time < %(before_date)s
+),
+batch AS (
+    SELECT f.id,
+           -- question_lifetime * prediction_expiration_percent, in microseconds
+           NULLIF(
+               ROUND(
+                   EXTRACT(EPOCH FROM q.scheduled_close_time - q.open_time)
+                   * 1000000 * u.prediction_expiration_percent / 100
+               ),
+               0
+           ) AS interval_us
+    FROM page f
+    JOIN {question_table} q ON q.id = f.question_id
+    JOIN {user_table} u ON u.id = f.author_id
+    WHERE q.actual_close_time IS NULL
+      AND q.open_time <= %(now)s
+      AND q.scheduled_close_time > %(now)s
+      AND u.prediction_expiration_percent IS NOT NULL
+      AND NOT u.is_spam
+),
+updated AS (
+    UPDATE {forecast_table} f
+    SET end_time = GREATEST(
+        f.start_time + MAKE_INTERVAL(
+            secs => (
+                FLOOR(
+                    EXTRACT(EPOCH FROM %(now)s - f.start_time) * 1000000
+                    / b.interval_us
+                ) + 1
+            ) * b.interval_us / 1000000
+        ),
+        f.start_time + INTERVAL '30 days',
+        %(now)s + INTERVAL '3 days'
     )
+    FROM batch b
+    WHERE f.id = b.id
+      AND f.id > %(last_id)s
+      AND f.id <= %(max_id)s
+    RETURNING f.id, f.author_id, f.question_id, f.start_time, f.end_time
+),
+notifications AS (
+    INSERT INTO {notification_table}
+        (user_id, question_id, forecast_id, trigger_time, email_sent)
+    SELECT u.author_id,
+           u.question_id,
+           u.id,
+           LEAST(
+               GREATEST(
+                   CASE
+                       WHEN u.end_time - u.start_time > INTERVAL '3 weeks'
+                       THEN u.end_time - INTERVAL '1 week'
+                       ELSE u.end_time - INTERVAL '1 day'
+                   END,
+                   %(now)s + INTERVAL '2 days'
+               ),
+               q.scheduled_close_time - INTERVAL '1 day'
+           ),
+           FALSE
+    FROM updated u
+    JOIN {question_table} q ON q.id = u.question_id
+    ON CONFLICT (user_id, question_id) DO NOTHING
+    RETURNING 1
+)
+SELECT (SELECT COUNT(*) FROM updated),
+       (SELECT COUNT(*) FROM notifications)
+""".format(
+    forecast_table=Forecast._meta.db_table,
+    question_table=Question._meta.db_table,
+    user_table=User._meta.db_table,
+    notification_table=UserForecastNotification._meta.db_table,
+)
+
+
+def update_standing_forecasts(before_date: date, batch_size: int = 10000):
+    """
+    Sets auto-withdrawal end_time of standing forecasts made before `before_date`
+    by users with a prediction expiration percent, and creates their
+    expiration notifications.
+
+    Runs set-based in keyset-paginated chunks. Each chunk commits on its own:
+    processed forecasts get an end_time and drop out of the candidates,
+    so the command can be safely re-run after an interruption.
+    """
 
-    # Process forecasts in batches to avoid memory issues
-    batch_size = 10000
+    now = timezone.now()
+    before_date = timezone.make_aware(datetime.combine(before_date, time.min))
+
+    last_id = 0
     total_updated = 0
     total_notifications_created = 0
 
-    # Get total count for progress tracking
-    total_count = base_queryset.count()
+    while True:
+        params = {
+            "last_id": last_id,
+            "now": now,
+            "before_date": before_date,
+            "batch_size": batch_size,
+        }
 
-    # Use iterator to process in batches
-    forecasts_batch = []
-    notifications_batch = []
+        with connection.cursor() as cursor:
+            # Resolving the page boundary upfront lets the update run
+            # as an index range scan over forecast ids
+            cursor.execute(NEXT_PAGE_BOUNDARY_SQL, params)
+            (max_id,) = cursor.fetchone()
 
-    for index, forecast in enumerate(base_queryset.iterator(chunk_size=batch_size), 1):
-        user_forecast_expiration_percent = (
-            forecast.author.prediction_expiration_percent / 100
-        )
-        question = forecast.question
-        question_lifetime_ratio = (
-            question.scheduled_close_time - question.open_time
-        ) * user_forecast_expiration_percent
-
-        forecast_duration_now = timezone.now() - forecast.start_time
-
-        # if prediction was made less than 10% of the question’s lifetime ago (the default setting), it will be withdrawn once it reaches that 10% mark
-        # otherwise, if it made more than 10% of the question’s lifetime ago, it will be withdrawn at the next multiple of that 10%.
-        intervals_passed = int(forecast_duration_now / question_lifetime_ratio)
-        next_interval = intervals_passed + 1
-        calculated_end_time = forecast.start_time + (
-            question_lifetime_ratio * next_interval
-        )
+            if max_id is None:
+                break
 
-        # Ensure the forecast duration is:
-        # - at least 1 month (30 days)
-        # - at least 3 days from now so users have a chance to update
-        # - matching the user's forecast expiration percent interval logic
-        min_onemonth_duration_end_time = forecast.start_time + timedelta(days=30)
-        at_least_3days_from_now_end_time = timezone.now() + timedelta(days=3)
-        end_time = max(
-            calculated_end_time,
-            min_onemonth_duration_end_time,
-            at_least_3days_from_now_end_time,
-        )
+            cursor.execute(UPDATE_STANDING_FORECASTS_SQL, {**params, "max_id": max_id})
+            updated, notifications_created = cursor.fetchone()
 
-        # Update the forecast's end_time in memory
-        forecast.end_time = end_time
-        forecasts_batch.append(forecast)
-
-        # Create notification following the same logic as in services.py
-        total_lifetime = forecast.end_time - forecast.start_time
-        if total_lifetime > timedelta(weeks=3):
-            # If lifetime > 3 weeks, trigger 1 week before end
-            trigger_time = end_time - timedelta(weeks=1)
-        else:
-            # Otherwise, trigger 1 day before end
-            trigger_time = end_time - timedelta(days=1)
-
-        # ensure trigger time is set at least 2 days from now (this is needed for cases when trigger time is set to 1 week before end_time)
-        trigger_time = max(trigger_time, timezone.now() + timedelta(days=2))
-
-        # ensures the trigger time is not after the question closes
-        trigger_time = min(
-            trigger_time, question.scheduled_close_time - timedelta(days=1)
-        )
+        last_id = max_id
+
+        total_updated += updated
+        total_notifications_created += notifications_created
 
-        # Create notification object (will be bulk created later)
-        notification = UserForecastNotification(
-            user=forecast.author,
-            question=question,
-            trigger_time=trigger_time,
-            email_sent=False,
-            forecast=forecast,
+        logger.info(
+            f"Updated batch of {updated} forecasts and {notifications_created} notifications. "
+            f"Total updated so far: {total_updated} forecasts, {total_notifications_created} notifications"
         )
-        notifications_batch.append(notification)
-
-        # Update batch when it reaches batch_size or we're at the end
-        is_last_item = index == total_count
-        if len(forecasts_batch) >= batch_size or is_last_item:
-            Forecast.objects.bulk_update(forecasts_batch, ["end_time"])
-            total_updated += len(forecasts_batch)
-
-            if notifications_batch:
-                UserForecastNotification.objects.bulk_create(
-                    notifications_batch, ignore_conflicts=True
-                )
-                total_notifications_created += len(notifications_batch)
-
-            logger.info(
-                f"Updated batch of {len(forecasts_batch)} forecasts and {len(notifications_batch)} notifications. "
-                f"Total updated so far: {total_updated} forecasts, {total_notifications_created} notifications"
-            )
-            forecasts_batch = []
-            notifications_batch = []
 
     logger.info(
         f"Completed updating {total_updated} forecasts and created {total_notifications_created} notifications"
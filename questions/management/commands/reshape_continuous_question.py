@@ -1,6 +1,8 @@
-from bisect import bisect_right
+from contextlib import nullcontext
 from datetime import datetime, timezone as dt_timezone
-from typing import Sequence, Callable
+from functools import partial
+from itertools import batched
+from multiprocessing import Pool
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
@@ -14,114 +16,19 @@ from posts.models import Post
 from questions.models import QUESTION_CONTINUOUS_TYPES, Forecast, Question
 from questions.services.forecasts import build_question_forecasts
 from questions.services.common import clone_question
+from questions.services.reshape import CdfReshapePlan, reshape_cdfs
 from scoring.utils import score_question
 from utils.models import ModelBatchCreator, ModelBatchUpdater
 
 
-def _dense_gauss_solve(mat, rhs):
-    """In-place Gaussian elimination solve for mat x = rhs (naive but fine for moderate N)."""
-    size = len(rhs)
-    for k in range(size):
-        pivot = mat[k][k]
-        if pivot == 0.0:
-            # find a row to swap
-            for r in range(k + 1, size):
-                if mat[r][k] != 0.0:
-                    mat[k], mat[r] = mat[r], mat[k]
-                    rhs[k], rhs[r] = rhs[r], rhs[k]
-                    pivot = mat[k][k]
-                    break
-            if pivot == 0.0:
-                raise ValueError("Singular matrix in Gaussian elimination.")
-        inv = 1.0 / pivot
-        for j in range(k, size):
-            mat[k][j] *= inv
-        rhs[k] *= inv
-        for i in range(k + 1, size):
-            factor = mat[i][k]
-            if factor != 0.0:
-                for j in range(k, size):
-                    mat[i][j] -= factor * mat[k][j]
-                rhs[i] -= factor * rhs[k]
-    # back substitution
-    for i in range(size - 1, -1, -1):
-        acc = rhs[i]
-        for j in range(i + 1, size):
-            acc -= mat[i][j] * rhs[j]
-        rhs[i] = acc
-
-
-def get_spline_function(
-    xs: Sequence[float],
-    ys: Sequence[float],
-) -> Callable[[float], float]:
-    """
-    Build a C² cubic spline through (xs, ys).
-    "not-a-knot": S''' continuous at x1 and x_{n-1}
-    """
-    xs = list(map(float, xs))
-    ys = list(map(float, ys))
-    n_segs = len(xs) - 1
-    if n_segs < 1:
-        raise ValueError("Need at least two points.")
-    for i in range(n_segs):
-        if not (xs[i + 1] > xs[i]):
-            raise ValueError("x must be strictly increasing.")
-
-    widths = [xs[i + 1] - xs[i] for i in range(n_segs)]
-    slopes = [(ys[i + 1] - ys[i]) / widths[i] for i in range(n_segs)]
-
-    size = n_segs + 1
-    mat = [[0.0] * size for _ in range(size)]
-    second_derivs = [0.0] * size
-
-    # interior second-derivative continuity rows
-    for i in range(1, n_segs):
-        mat[i][i - 1] = widths[i - 1]
-        mat[i][i] = 2 * (widths[i - 1] + widths[i])
-        mat[i][i + 1] = widths[i]
-        second_derivs[i] = 6 * (slopes[i] - slopes[i - 1])
-
-    # not-a-knot constraints at x1 and x_{n-1}:
-    # widths[1]*M0 - (widths[0] + widths[1])*M1 + widths[0]*M2 = 0
-    mat[0][0] = widths[1]
-    mat[0][1] = -(widths[0] + widths[1])
-    if n_segs >= 2:
-        mat[0][2] = widths[0]
-    second_derivs[0] = 0.0
-
-    # widths[n-2]*M_{n-2} - (widths[n-2] + widths[n-1])*M_{n-1} + widths[n-1]*Mn = 0
-    mat[n_segs][n_segs - 2] = widths[n_segs - 2] if n_segs >= 2 else 0.0
-    mat[n_segs][n_segs - 1] = (
-        -(widths[n_segs - 2] + widths[n_segs - 1])
-        if n_segs >= 2
-        else -widths[n_segs - 1]
-    )
-    mat[n_segs][n_segs] = widths[n_segs - 1]
-    second_derivs[n_segs] = 0.0
-
-    _dense_gauss_solve(mat, second_derivs)
-
-    def spline(pt: float) -> float:
-        "Evaluate spline at pt (clamped to [xs[0], xs[-1]])."
-        if pt <= xs[0]:
-            i = 0
-        elif pt >= xs[-1]:
-            i = len(xs) - 2
-        else:
-            i = bisect_right(xs, pt) - 1
-
-        width = xs[i + 1] - xs[i]
-        lo_w = (xs[i + 1] - pt) / width
-        hi_w = (pt - xs[i]) / width
-        return (
-            lo_w * ys[i]
-            + hi_w * ys[i + 1]
-            + ((lo_w**3 - lo_w) * width**2 / 6.0) * second_derivs[i]
-            + ((hi_w**3 - hi_w) * width**2 / 6.0) * second_derivs[i + 1]
-        )
+RESHAPE_BATCH_SIZE = 1000
+
 
-    return spline
+def _reshape_batch(
+    batch: tuple[tuple[int, list[float]], ...], plan: CdfReshapePlan
+) -> tuple[list[int], list[list[float]]]:
+    forecast_ids, cdfs = zip(*batch)
+    return list(forecast_ids), reshape_cdfs(list(cdfs), plan)
 
 
 class Command(BaseCommand):
@@ -197,6 +104,13 @@ class Command(BaseCommand):
             " Required if discrete is True.",
         )
 
+        parser.add_argument(
+            "--num_processes",
+            type=int,
+            default=1,
+            help="Number of processes used to reshape forecasts. Defaults to 1.",
+        )
+
         # new times
         parser.add_argument(
             "--new_scheduled_close_time",
@@ -280,8 +194,8 @@ class Command(BaseCommand):
         new_scheduled_resolve_time: datetime | None,
         discrete: bool,
         step: float | None,
+        num_processes: int = 1,
     ):
-        previous_inbound_outcome_count = question_to_change.inbound_outcome_count
         if discrete:
             if step is None:  # keep the same step
                 # since we're using real range (not nominal),
@@ -314,93 +228,86 @@ class Command(BaseCommand):
 
         new_inbound_outcome_count = question_to_change.get_inbound_outcome_count()
 
-        def transform_cdf(cdf: list[float]):
-
-            x_locs = np.linspace(
-                0, 1, (previous_inbound_outcome_count or 200) + 1
-            ).tolist()
-            spline = get_spline_function(x_locs, cdf)
-
-            def get_cdf_at(unscaled_location: float) -> float:
-                if unscaled_location <= 0:
-                    return cdf[0]
-                if unscaled_location >= 1:
-                    return cdf[-1]
-                return spline(unscaled_location)
-
-            if not discrete:
-                # evaluate cdf at critical points
-                new_cdf: list[float] = []
-                for nom_val in np.linspace(
-                    new_nominal_range_min,
-                    new_nominal_range_max,
-                    new_inbound_outcome_count + 1,
-                ):
-                    location = scaled_location_to_unscaled_location(
-                        nom_val, basis_question
-                    )
-                    new_cdf.append(get_cdf_at(location))
-            else:
-                # evaluate pmf at critical points, ignoring mass assigned between them
-                # no smoothing b/c resolution decreases
-                pmf = [cdf[0]]
-                for i in range(1, len(cdf)):
-                    pmf.append(cdf[i] - cdf[i - 1])
-                pmf.append(1 - cdf[-1])
-                inbound_pmf: list[float] = []
+        if not discrete:
+            # evaluate cdf at critical points
+            plan = CdfReshapePlan(
+                locations=np.array(
+                    [
+                        scaled_location_to_unscaled_location(nom_val, basis_question)
+                        for nom_val in np.linspace(
+                            new_nominal_range_min,
+                            new_nominal_range_max,
+                            new_inbound_outcome_count + 1,
+                        )
+                    ]
+                )
+            )
+        else:
+            bucket_indices = [
+                string_location_to_bucket_index(str(round(nom_val, 10)), basis_question)
                 for nom_val in np.linspace(
                     new_nominal_range_min,
                     new_nominal_range_max,
                     new_inbound_outcome_count,
-                ):
-                    index = string_location_to_bucket_index(
-                        str(round(nom_val, 10)), basis_question
-                    )
-                    assert index is not None
-                    inbound_pmf.append(pmf[index])
-
-                prob_below_lower = (
-                    get_cdf_at(
-                        scaled_location_to_unscaled_location(
-                            question_to_change.range_min, basis_question
-                        )
+                )
+            ]
+            assert None not in bucket_indices
+            plan = CdfReshapePlan(
+                bucket_indices=np.array(bucket_indices),
+                lower_bound_location=(
+                    scaled_location_to_unscaled_location(
+                        question_to_change.range_min, basis_question
                     )
                     if question_to_change.open_lower_bound
-                    else 0
-                )
-                prob_above_upper = (
-                    1
-                    - get_cdf_at(
-                        scaled_location_to_unscaled_location(
-                            question_to_change.range_max, basis_question
-                        )
+                    else None
+                ),
+                upper_bound_location=(
+                    scaled_location_to_unscaled_location(
+                        question_to_change.range_max, basis_question
                     )
                     if question_to_change.open_upper_bound
-                    else 0
-                )
-                # renormalize (respecting out of bounds weights)
-                inbound_arr = np.array(inbound_pmf)
-                inbound_arr = (
-                    (1 - prob_below_lower - prob_above_upper)
-                    * inbound_arr
-                    / np.sum(inbound_arr)
-                )
-                new_pmf = [prob_below_lower] + inbound_arr.tolist() + [prob_above_upper]
-                new_cdf = np.cumsum(new_pmf).tolist()[:-1]
-            return new_cdf
+                    else None
+                ),
+            )
 
-        forecasts = question_to_change.user_forecasts.all()
+        # Reshaping is pure computation, so it can be spread across processes
+        # while all writes stay in this process' transaction
+        forecasts = question_to_change.user_forecasts.values_list(
+            "id", "continuous_cdf"
+        )
         total_count = forecasts.count()
-        with ModelBatchUpdater(
-            model_class=Forecast,
-            fields=["continuous_cdf", "distribution_input"],
-            batch_size=100,
-        ) as updater:
-            for idx, forecast in enumerate(forecasts.iterator(chunk_size=100), 1):
-                print(f"Processing forecast {idx} of {total_count}", end="\r")
-                forecast.continuous_cdf = transform_cdf(forecast.continuous_cdf)
-                forecast.distribution_input = None
-                updater.append(forecast)
+        batches = batched(
+            forecasts.iterator(chunk_size=RESHAPE_BATCH_SIZE), RESHAPE_BATCH_SIZE
+        )
+        processed = 0
+
+        with (
+            (
+                Pool(processes=num_processes) if num_processes > 1 else nullcontext()
+            ) as pool,
+            ModelBatchUpdater(
+                model_class=Forecast,
+                fields=["continuous_cdf", "distribution_input"],
+                batch_size=RESHAPE_BATCH_SIZE,
+            ) as updater,
+        ):
+            map_fn = pool.map if pool else map
+            # Batches are fetched here rather than by the pool's feeder thread,
+            # so the queryset is read through this transaction's connection
+            for batch_group in batched(batches, num_processes):
+                for forecast_ids, new_cdfs in map_fn(
+                    partial(_reshape_batch, plan=plan), batch_group
+                ):
+                    for forecast_id, new_cdf in zip(forecast_ids, new_cdfs):
+                        updater.append(
+                            Forecast(
+                                id=forecast_id,
+                                continuous_cdf=new_cdf,
+                                distribution_input=None,
+                            )
+                        )
+                    processed += len(forecast_ids)
+                    print(f"Processed {processed} of {total_count} forecasts", end="\r")
 
         build_question_forecasts(question_to_change)
 
@@ -578,6 +485,7 @@ class Command(BaseCommand):
                 new_scheduled_resolve_time=new_scheduled_resolve_time,
                 discrete=discrete,
                 step=step,
+                num_processes=options["num_processes"],
             )
             self.stdout.write(self.style.SUCCESS("Reshaped question successfully!"))
 
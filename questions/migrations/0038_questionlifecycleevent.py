@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("questions", "0037_question_options_order"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionLifecycleEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("open", "Open"),
+                            ("close", "Close"),
+                            ("cp_reveal", "Cp Reveal"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("due_time", models.DateTimeField()),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lifecycle_events",
+                        to="questions.question",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("processed_at__isnull", True)),
+                        fields=["event_type", "due_time"],
+                        name="questionlifecycleevent_due_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("question", "event_type"),
+                        name="questionlifecycleevent_unique_question_type",
+                    )
+                ],
+            },
+        ),
+        # Schedule pending events of existing questions,
+        # mirroring QuestionLifecycleEvent.get_due_times
+        migrations.RunSQL(
+            """
+            INSERT INTO questions_questionlifecycleevent (question_id, event_type, due_time)
+            SELECT id, 'open', open_time
+            FROM questions_question
+            WHERE open_time IS NOT NULL
+              AND NOT open_time_triggered
+              -- Questions closed before opening never fire the open event
+              AND (actual_close_time IS NULL OR actual_close_time >= NOW())
+            UNION ALL
+            SELECT id, 'close', scheduled_close_time
+            FROM questions_question
+            WHERE scheduled_close_time IS NOT NULL
+              AND actual_close_time IS NULL
+            UNION ALL
+            SELECT id, 'cp_reveal', cp_reveal_time
+            FROM questions_question
+            WHERE cp_reveal_time IS NOT NULL
+              AND NOT cp_reveal_time_triggered
+              AND resolution IS NULL;
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0033_postversion"),
+        ("questions", "0038_questionlifecycleevent"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="forecast",
+            index=models.Index(
+                fields=["question", "start_time"], name="questions_f_questio_57efba_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="forecast",
+            index=models.Index(
+                fields=["question", "end_time"], name="questions_f_questio_390efd_idx"
+            ),
+        ),
+    ]
@@ -285,6 +285,17 @@ class Question(TimeStampedModel, TranslatedModel):  # type: ignore
     # Jeffrey's Divergence
     movement = models.FloatField(null=True, blank=True)
 
+    # Fields the scheduled lifecycle events depend on
+    LIFECYCLE_FIELDS = {
+        "open_time",
+        "open_time_triggered",
+        "scheduled_close_time",
+        "actual_close_time",
+        "cp_reveal_time",
+        "cp_reveal_time_triggered",
+        "resolution",
+    }
+
     def __str__(self):
         return f"{self.type} {self.title}"
 
@@ -344,7 +355,11 @@ class Question(TimeStampedModel, TranslatedModel):  # type: ignore
             if update_fields is not None:
                 kwargs["update_fields"] = list(update_fields) + ["options_history"]
 
-        return super().save(**kwargs)
+        super().save(**kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & self.LIFECYCLE_FIELDS:
+            QuestionLifecycleEvent.sync([self])
 
     def get_post(self) -> "Post | None":
         """Get the post this question belongs to."""
@@ -698,6 +713,8 @@ class Forecast(models.Model):
         indexes = [
             models.Index(fields=["author", "question", "start_time"]),
             models.Index(fields=["author", "post", "question"]),
+            models.Index(fields=["question", "start_time"]),
+            models.Index(fields=["question", "end_time"]),
         ]
         constraints = [
             # end_time > start_time
@@ -870,3 +887,95 @@ class UserForecastNotification(models.Model):
 
     class Meta:
         unique_together = ("user", "question")
+
+
+class QuestionLifecycleEvent(models.Model):
+    """
+    Scheduled question lifecycle event keyed by its due time.
+    Maintained on question save, so lifecycle cron jobs do an indexed range read
+    of due events instead of scanning questions.
+    """
+
+    class EventType(models.TextChoices):
+        OPEN = "open"
+        CLOSE = "close"
+        CP_REVEAL = "cp_reveal"
+
+    question = models.ForeignKey(
+        Question, models.CASCADE, related_name="lifecycle_events"
+    )
+    event_type = models.CharField(max_length=16, choices=EventType.choices)
+    due_time = models.DateTimeField()
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                name="questionlifecycleevent_unique_question_type",
+                fields=["question", "event_type"],
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["event_type", "due_time"],
+                name="questionlifecycleevent_due_idx",
+                condition=Q(processed_at__isnull=True),
+            )
+        ]
+
+    @classmethod
+    def get_due_times(cls, question: Question) -> dict[str, datetime | None]:
+        """
+        Due time of every event type, or None if the event should not fire
+        """
+
+        return {
+            cls.EventType.OPEN: (
+                question.open_time if not question.open_time_triggered else None
+            ),
+            cls.EventType.CLOSE: (
+                question.scheduled_close_time
+                if not question.actual_close_time
+                else None
+            ),
+            cls.EventType.CP_REVEAL: (
+                question.cp_reveal_time
+                if not question.cp_reveal_time_triggered and question.resolution is None
+                else None
+            ),
+        }
+
+    @classmethod
+    def sync(cls, questions: list[Question]):
+        """
+        (Re)schedules lifecycle events of the given questions
+        and removes pending events which should no longer fire.
+        Processed events are kept as long as they are not rescheduled.
+        """
+
+        to_schedule = []
+        to_delete = Q()
+
+        for question in questions:
+            for event_type, due_time in cls.get_due_times(question).items():
+                if due_time:
+                    to_schedule.append(
+                        cls(
+                            question_id=question.id,
+                            event_type=event_type,
+                            due_time=due_time,
+                        )
+                    )
+                else:
+                    to_delete |= Q(question_id=question.id, event_type=event_type)
+
+        if to_delete:
+            cls.objects.filter(to_delete, processed_at__isnull=True).delete()
+
+        if to_schedule:
+            cls.objects.bulk_create(
+                to_schedule,
+                update_conflicts=True,
+                unique_fields=["question", "event_type"],
+                update_fields=["due_time", "processed_at"],
+            )
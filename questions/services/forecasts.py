@@ -23,6 +23,10 @@ from questions.services.multiple_choice_handlers import get_all_options_from_his
 from scoring.models import Score
 from users.constants import ApiForecastingAccess
 from users.models import User
+from users.services.profile_stats import (
+    schedule_users_stats_refresh,
+    update_question_aggregation_calibrations,
+)
 from utils.cache import cache_per_object
 from utils.frontend import build_frontend_url
 from utils.the_math.aggregations import get_aggregation_history
@@ -231,6 +235,9 @@ def create_forecast_bulk(
         # to ensure all forecasts are processed.
         run_on_post_forecast.send_with_options(args=(post.id,), delay=10_000)
 
+    # Forecasting counters of the profile stats
+    schedule_users_stats_refresh([user.id])
+
 
 def withdraw_forecast_bulk(user: User = None, withdrawals: list[dict] = None):
     posts = set()
@@ -581,6 +588,9 @@ def build_question_forecasts(
         AggregateForecast.objects.filter(id__in=[old.id for old in to_delete]).delete()
         AggregateForecast.objects.bulk_create(to_create, batch_size=50)
 
+    # Aggregations of resolved questions are summed up to the site-wide calibration curve
+    update_question_aggregation_calibrations(question)
+
 
 def validate_and_create_forecasts(
     *,
@@ -1,19 +1,29 @@
 import logging
 from datetime import datetime
+from itertools import batched
+from typing import Callable
 
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
 from notifications.services import delete_scheduled_question_resolution_notifications
 from posts.models import Post
+from posts.services.onboarding import invalidate_onboarding_feed
 from posts.services.subscriptions import notify_post_status_change
 from projects.services.cache import invalidate_projects_questions_count_cache
+from projects.services.timeline import schedule_posts_projects_timeline_refresh
 from questions.constants import UnsuccessfulResolutionType
-from questions.models import Question, Conditional, UserForecastNotification
+from questions.models import (
+    Question,
+    Conditional,
+    QuestionLifecycleEvent,
+    UserForecastNotification,
+)
 from scoring.constants import ScoreTypes
 from scoring.utils import score_question
+from users.services.profile_stats import update_question_aggregation_calibrations
 from .common import update_leaderboards_for_question
 from .forecasts import build_question_forecasts
 
@@ -44,6 +54,133 @@ def handle_cp_revealed(question: Question):
     )
 
 
+def handle_questions_open(questions: list[Question]):
+    """
+    Batch version of `handle_question_open`.
+    Marks questions as triggered even if the handler failed.
+    """
+
+    for question in questions:
+        try:
+            handle_question_open(question)
+        except Exception:
+            logger.exception(f"Failed to handle question open {question.id}")
+
+        question.open_time_triggered = True
+
+    Question.objects.bulk_update(questions, ["open_time_triggered"])
+
+
+def handle_questions_cp_revealed(questions: list[Question]):
+    """
+    Batch version of `handle_cp_revealed`
+    """
+
+    for question in questions:
+        handle_cp_revealed(question)
+        question.cp_reveal_time_triggered = True
+
+    Question.objects.bulk_update(questions, ["cp_reveal_time_triggered"])
+
+
+def close_questions(questions: list[Question]):
+    """
+    Batch version of `close_question` closing questions at their scheduled time
+    """
+
+    from posts.services.common import update_global_leaderboard_tags
+
+    now = timezone.now()
+
+    for question in questions:
+        question.actual_close_time = min(
+            question.actual_close_time or now,
+            question.scheduled_close_time,
+            question.actual_resolve_time or now,
+        )
+
+    Question.objects.bulk_update(questions, ["actual_close_time"])
+
+    # Posts with several questions closing at once are updated only once
+    posts = {question.post_id: question.post for question in questions}
+    for post in posts.values():
+        # This method automatically sets post closure
+        # Based on child questions
+        post.update_pseudo_materialized_fields()
+        update_global_leaderboard_tags(post)
+
+    invalidate_onboarding_feed(posts.values())
+    schedule_posts_projects_timeline_refresh(posts.values())
+
+    # Cancel notifications which have a trigger time after the new actual_close_time
+    # or for forecasts with an end_time after the new actual_close_time
+    UserForecastNotification.objects.filter(question__in=questions).filter(
+        Q(trigger_time__gt=F("question__actual_close_time"))
+        | Q(forecast__end_time__gt=F("question__actual_close_time"))
+    ).delete()
+
+
+def process_due_lifecycle_events(
+    event_type: QuestionLifecycleEvent.EventType,
+    handler: Callable[[list[Question]], None],
+    questions_filter: Q = Q(),
+    batch_size: int = 100,
+) -> int:
+    """
+    Runs the batch handler for questions of due, unprocessed lifecycle events
+    matching the filter, and marks these events as processed.
+
+    Each batch is claimed with SKIP LOCKED and processed in its own transaction,
+    so concurrent runs never handle the same event twice.
+    If a batch fails, its events are processed one by one, so a single failing
+    question is retried on the next run without blocking the others.
+
+    Returns the number of processed events.
+    """
+
+    due_events = QuestionLifecycleEvent.objects.filter(
+        event_type=event_type,
+        processed_at__isnull=True,
+        due_time__lte=timezone.now(),
+        question__in=Question.objects.filter(questions_filter).values("id"),
+    )
+    event_ids = list(due_events.order_by("due_time").values_list("id", flat=True))
+
+    def process(ids: list[int]) -> int:
+        with transaction.atomic():
+            events = list(
+                due_events.filter(id__in=ids)
+                .select_for_update(skip_locked=True, of=("self",))
+                .select_related("question__post")
+            )
+
+            if events:
+                QuestionLifecycleEvent.objects.filter(
+                    id__in=[event.id for event in events]
+                ).update(processed_at=timezone.now())
+                handler([event.question for event in events])
+
+            return len(events)
+
+    processed = 0
+
+    for batch in batched(event_ids, batch_size):
+        try:
+            processed += process(batch)
+        except Exception:
+            logger.exception(
+                f"Failed to process {event_type} events batch, retrying one by one"
+            )
+
+            for event_id in batch:
+                try:
+                    processed += process([event_id])
+                except Exception:
+                    logger.exception(f"Failed to process {event_type} event {event_id}")
+
+    return processed
+
+
 def close_question(question: Question, actual_close_time: datetime | None = None):
     now = timezone.now()
     question.actual_close_time = min(
@@ -62,6 +199,8 @@ def close_question(question: Question, actual_close_time: datetime | None = None
 
     update_global_leaderboard_tags(post)
     post.save()
+    invalidate_onboarding_feed([post])
+    schedule_posts_projects_timeline_refresh([post])
 
     # Cancel notifications which have a trigger time after the new actual_close_time
     # or for forecasts with an end_time after the new actual_close_time
@@ -212,6 +351,12 @@ def resolve_question(
 
     # Invalidate project questions count cache since resolution affects visibility
     invalidate_projects_questions_count_cache(post.get_related_projects())
+    invalidate_onboarding_feed([post])
+    schedule_posts_projects_timeline_refresh([post])
+
+    # Add the question to the site-wide calibration curve right away,
+    # the resolution task refreshes it once aggregations are rebuilt
+    transaction.on_commit(lambda: update_question_aggregation_calibrations(question))
 
     # Calculate scores + notify forecasters
     from questions.tasks import resolve_question_and_send_notifications
@@ -286,6 +431,7 @@ def unresolve_question(question: Question):
 
     update_global_leaderboard_tags(post)
     post.save()
+    schedule_posts_projects_timeline_refresh([post])
 
     # TODO: set up unresolution notifications
     # in the "resolve_question" function, scoring is handled in the same task
@@ -1,11 +1,14 @@
 from datetime import datetime, timezone as dt_timezone
+from itertools import batched
 
+import numpy as np
 from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 
 from questions.models import Question, Forecast
 from questions.types import OptionsHistoryType
+from utils.models import ModelBatchCreator, ModelBatchUpdater
 
 # MOVE THIS serializer imports
 from rest_framework import serializers
@@ -105,6 +108,50 @@ def get_all_options_from_history(
     return all_labels + [designated_other_label]
 
 
+# Number of forecasts remapped, written and held in memory at once
+FORECASTS_REMAP_CHUNK_SIZE = 2000
+
+
+def remap_pmfs(
+    pmfs: list[list[float | None]], index_map: list[int], size: int
+) -> list[list[float | None]]:
+    """
+    Remaps a chunk of PMFs at once.
+
+    `index_map[i]` is the position in the new PMF (of length `size`) that
+    the i-th value of the old PMF is added to. Positions no available (non-None)
+    value is mapped to are None.
+
+    Loops over options rather than forecasts, so values are summed in the same
+    order as a per-forecast loop would and results are bit-identical.
+    """
+
+    values = np.array(pmfs, dtype=float)
+    available = ~np.isnan(values)
+    values[~available] = 0.0
+
+    remapped = np.zeros((len(pmfs), size))
+    remapped_available = np.zeros((len(pmfs), size), dtype=bool)
+
+    for old_idx, new_idx in enumerate(index_map):
+        remapped[:, new_idx] += values[:, old_idx]
+        remapped_available[:, new_idx] |= available[:, old_idx]
+
+    remapped = remapped.astype(object)
+    remapped[~remapped_available] = None
+
+    return remapped.tolist()
+
+
+def _validate_pmf_lengths(forecasts: list[Forecast], size: int, options: list[str]):
+    for forecast in forecasts:
+        if len(forecast.probability_yes_per_category) != size:
+            raise ValueError(
+                f"Forecast {forecast.id} PMF length does not match "
+                f"all options {options}"
+            )
+
+
 def multiple_choice_rename_option(
     question: Question,
     old_option: str,
@@ -171,11 +218,26 @@ def multiple_choice_reorder_options(
     # remap = [2,0,1]
     # if a forecast is [0.2,0.3,0.5], then the new one is [0.5,0.2,0.3]
     remap = [all_options_ever.index(option) for option in new_options_order]
-    for forecast in question.user_forecasts.all():
-        forecast.probability_yes_per_category = [
-            forecast.probability_yes_per_category[i] for i in remap
-        ]
-        forecast.save()
+    index_map = [remap.index(i) for i in range(len(remap))]
+
+    with ModelBatchUpdater(
+        Forecast,
+        fields=["probability_yes_per_category"],
+        batch_size=FORECASTS_REMAP_CHUNK_SIZE,
+    ) as updater:
+        forecasts = question.user_forecasts.only(
+            "id", "probability_yes_per_category"
+        ).iterator(chunk_size=FORECASTS_REMAP_CHUNK_SIZE)
+
+        for chunk in batched(forecasts, FORECASTS_REMAP_CHUNK_SIZE):
+            _validate_pmf_lengths(chunk, len(remap), all_options_ever)
+            pmfs = remap_pmfs(
+                [f.probability_yes_per_category for f in chunk], index_map, len(remap)
+            )
+
+            for forecast, pmf in zip(chunk, pmfs):
+                forecast.probability_yes_per_category = pmf
+                updater.append(forecast)
 
     # trigger recalculation of aggregates
     from questions.services.forecasts import build_question_forecasts
@@ -229,57 +291,70 @@ def multiple_choice_delete_options(
 
     question.options = new_options
     question.options_history.append((timestep.isoformat(), new_options))
-    question.save()
+
+    # Deleted options are added to the catch-all last option
+    index_map = [
+        idx if label in new_options else len(all_options) - 1
+        for idx, label in enumerate(all_options)
+    ]
 
     # update user forecasts
-    user_forecasts = question.user_forecasts.filter(
-        Q(end_time__isnull=True) | Q(end_time__gt=timestep),
+    user_forecasts = (
+        question.user_forecasts.filter(
+            Q(end_time__isnull=True) | Q(end_time__gt=timestep),
+        )
+        .only(
+            "id",
+            "author_id",
+            "post_id",
+            "start_time",
+            "end_time",
+            "probability_yes_per_category",
+        )
+        .order_by("id")
+        .iterator(chunk_size=FORECASTS_REMAP_CHUNK_SIZE)
     )
-    forecasts_to_create: list[Forecast] = []
-    for forecast in user_forecasts:
-        # get new PMF
-        previous_pmf = forecast.probability_yes_per_category
-        if len(previous_pmf) != len(all_options):
-            raise ValueError(
-                f"Forecast {forecast.id} PMF length does not match "
-                f"all options {all_options}"
-            )
-        new_pmf: list[float | None] = [None] * len(all_options)
-        for value, label in zip(previous_pmf, all_options):
-            if value is None:
-                continue
-            if label in new_options:
-                new_pmf[all_options.index(label)] = (
-                    new_pmf[all_options.index(label)] or 0.0
-                ) + value
-            else:
-                new_pmf[-1] = (
-                    new_pmf[-1] or 0.0
-                ) + value  # add to catch-all last option
-
-        # slice forecast
-        if forecast.start_time >= timestep:
-            # forecast is completely after timestep, just update PMF
-            forecast.probability_yes_per_category = new_pmf
-            continue
-        forecasts_to_create.append(
-            Forecast(
-                question=question,
-                author=forecast.author,
-                start_time=timestep,
-                end_time=forecast.end_time,
-                probability_yes_per_category=new_pmf,
-                post=forecast.post,
-                source=Forecast.SourceChoices.AUTOMATIC,  # mark as automatic forecast
+
+    with (
+        transaction.atomic(),
+        ModelBatchUpdater(
+            Forecast,
+            fields=["end_time", "probability_yes_per_category"],
+            batch_size=FORECASTS_REMAP_CHUNK_SIZE,
+        ) as updater,
+        ModelBatchCreator(Forecast, batch_size=FORECASTS_REMAP_CHUNK_SIZE) as creator,
+    ):
+        question.save()
+
+        for chunk in batched(user_forecasts, FORECASTS_REMAP_CHUNK_SIZE):
+            _validate_pmf_lengths(chunk, len(all_options), all_options)
+            new_pmfs = remap_pmfs(
+                [f.probability_yes_per_category for f in chunk],
+                index_map,
+                len(all_options),
             )
-        )
-        forecast.end_time = timestep
 
-    with transaction.atomic():
-        Forecast.objects.bulk_update(
-            user_forecasts, ["end_time", "probability_yes_per_category"]
-        )
-        Forecast.objects.bulk_create(forecasts_to_create)
+            for forecast, new_pmf in zip(chunk, new_pmfs):
+                # slice forecast
+                if forecast.start_time >= timestep:
+                    # forecast is completely after timestep, just update PMF
+                    forecast.probability_yes_per_category = new_pmf
+                else:
+                    creator.append(
+                        Forecast(
+                            question=question,
+                            author_id=forecast.author_id,
+                            start_time=timestep,
+                            end_time=forecast.end_time,
+                            probability_yes_per_category=new_pmf,
+                            post_id=forecast.post_id,
+                            # mark as automatic forecast
+                            source=Forecast.SourceChoices.AUTOMATIC,
+                        )
+                    )
+                    forecast.end_time = timestep
+
+                updater.append(forecast)
 
     # trigger recalculation of aggregates
     from questions.services.forecasts import build_question_forecasts
@@ -338,23 +413,51 @@ def multiple_choice_add_options(
     new_options = question.options[:-1] + options_to_add + question.options[-1:]
     question.options = new_options
     question.options_history.append((grace_period_end.isoformat(), new_options))
-    question.save()
 
     # update user forecasts
-    user_forecasts = question.user_forecasts.all()
-    for forecast in user_forecasts:
-        pmf = forecast.probability_yes_per_category
-        forecast.probability_yes_per_category = (
-            pmf[:-1] + [None] * len(options_to_add) + [pmf[-1]]
-        )
-        if forecast.start_time < grace_period_end and (
-            forecast.end_time is None or forecast.end_time > grace_period_end
-        ):
-            forecast.end_time = grace_period_end
-    with transaction.atomic():
-        Forecast.objects.bulk_update(
-            user_forecasts, ["probability_yes_per_category", "end_time"]
+    user_forecasts = (
+        question.user_forecasts.only(
+            "id", "start_time", "end_time", "probability_yes_per_category"
         )
+        .order_by("id")
+        .iterator(chunk_size=FORECASTS_REMAP_CHUNK_SIZE)
+    )
+
+    with (
+        transaction.atomic(),
+        ModelBatchUpdater(
+            Forecast,
+            fields=["probability_yes_per_category", "end_time"],
+            batch_size=FORECASTS_REMAP_CHUNK_SIZE,
+        ) as updater,
+    ):
+        question.save()
+
+        for chunk in batched(user_forecasts, FORECASTS_REMAP_CHUNK_SIZE):
+            # New options are inserted right before the catch-all option
+            by_size: dict[int, list[Forecast]] = {}
+            for forecast in chunk:
+                by_size.setdefault(
+                    len(forecast.probability_yes_per_category), []
+                ).append(forecast)
+
+            for size, forecasts in by_size.items():
+                index_map = list(range(size - 1)) + [size - 1 + len(options_to_add)]
+                new_pmfs = remap_pmfs(
+                    [f.probability_yes_per_category for f in forecasts],
+                    index_map,
+                    size + len(options_to_add),
+                )
+
+                for forecast, new_pmf in zip(forecasts, new_pmfs):
+                    forecast.probability_yes_per_category = new_pmf
+                    if forecast.start_time < grace_period_end and (
+                        forecast.end_time is None
+                        or forecast.end_time > grace_period_end
+                    ):
+                        forecast.end_time = grace_period_end
+
+                    updater.append(forecast)
 
     # trigger recalculation of aggregates
     from questions.services.forecasts import build_question_forecasts
@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from itertools import groupby
+
+import numpy as np
+from scipy.linalg import solve_banded
+
+
+def get_spline_second_derivatives(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Solves for the second derivatives of the "not-a-knot" C² cubic splines
+    through (xs, ys[:, k]) for every column k at once.
+
+    The system is banded (tridiagonal plus one extra entry in the first and last
+    rows), so it's solved in O(n) with a (2, 2) banded LU factorization.
+    """
+
+    n_segs = len(xs) - 1
+    if n_segs < 2:
+        raise ValueError("Need at least three points.")
+    widths = np.diff(xs)
+    if not np.all(widths > 0):
+        raise ValueError("x must be strictly increasing.")
+
+    slopes = np.diff(ys, axis=0) / widths[:, None]
+    size = n_segs + 1
+
+    # Banded storage for solve_banded: ab[2 + i - j, j] == mat[i, j]
+    ab = np.zeros((5, size))
+    rhs = np.zeros((size, ys.shape[1]))
+
+    # interior second-derivative continuity rows
+    interior = np.arange(1, n_segs)
+    ab[3, interior - 1] = widths[:-1]
+    ab[2, interior] = 2 * (widths[:-1] + widths[1:])
+    ab[1, interior + 1] = widths[1:]
+    rhs[1:n_segs] = 6 * (slopes[1:] - slopes[:-1])
+
+    # not-a-knot constraints at x1 and x_{n-1}:
+    # widths[1]*M0 - (widths[0] + widths[1])*M1 + widths[0]*M2 = 0
+    ab[2, 0] = widths[1]
+    ab[1, 1] = -(widths[0] + widths[1])
+    ab[0, 2] = widths[0]
+    # widths[n-2]*M_{n-2} - (widths[n-2] + widths[n-1])*M_{n-1} + widths[n-1]*Mn = 0
+    ab[4, n_segs - 2] = widths[n_segs - 2]
+    ab[3, n_segs - 1] = -(widths[n_segs - 2] + widths[n_segs - 1])
+    ab[2, n_segs] = widths[n_segs - 1]
+
+    return solve_banded((2, 2), ab, rhs)
+
+
+def get_cdfs_at(cdfs: np.ndarray, locations: np.ndarray) -> np.ndarray:
+    """
+    Evaluates CDFs given on a uniform unscaled grid (rows of `cdfs`) at the
+    unscaled `locations` by cubic spline interpolation.
+    Locations outside of [0, 1] are clamped to the CDF's boundary values.
+
+    Returns an array of shape (len(cdfs), len(locations)).
+    """
+
+    xs = np.linspace(0, 1, cdfs.shape[1])
+    second_derivs = get_spline_second_derivatives(xs, cdfs.T).T
+
+    pts = np.clip(locations, xs[0], xs[-1])
+    i = np.clip(np.searchsorted(xs, pts, side="right") - 1, 0, len(xs) - 2)
+    width = xs[i + 1] - xs[i]
+    lo_w = (xs[i + 1] - pts) / width
+    hi_w = (pts - xs[i]) / width
+
+    values = (
+        lo_w * cdfs[:, i]
+        + hi_w * cdfs[:, i + 1]
+        + ((lo_w**3 - lo_w) * width**2 / 6.0) * second_derivs[:, i]
+        + ((hi_w**3 - hi_w) * width**2 / 6.0) * second_derivs[:, i + 1]
+    )
+    values = np.where(locations <= 0, cdfs[:, :1], values)
+    return np.where(locations >= 1, cdfs[:, -1:], values)
+
+
+@dataclass
+class CdfReshapePlan:
+    """
+    Everything needed to map CDFs onto a new question range, precomputed
+    in unscaled locations of the basis question so it can be shipped to
+    worker processes without database access.
+    """
+
+    # Continuous target: locations of the new CDF grid
+    locations: np.ndarray | None = None
+
+    # Discrete target: PMF bucket of each new outcome
+    bucket_indices: np.ndarray | None = None
+    lower_bound_location: float | None = None
+    upper_bound_location: float | None = None
+
+
+def _reshape_cdfs_of_same_length(cdfs: np.ndarray, plan: CdfReshapePlan) -> np.ndarray:
+    if plan.bucket_indices is None:
+        return get_cdfs_at(cdfs, plan.locations)
+
+    # Evaluate pmf at critical points, ignoring mass assigned between them.
+    # No smoothing b/c resolution decreases
+    pmfs = np.diff(cdfs, axis=1, prepend=0, append=1)
+    inbound = pmfs[:, plan.bucket_indices]
+
+    bound_locations = [
+        location
+        for location in (plan.lower_bound_location, plan.upper_bound_location)
+        if location is not None
+    ]
+    bound_values = iter(get_cdfs_at(cdfs, np.array(bound_locations)).T)
+    zeros = np.zeros(len(cdfs))
+    prob_below_lower = (
+        next(bound_values) if plan.lower_bound_location is not None else zeros
+    )
+    prob_above_upper = (
+        1 - next(bound_values) if plan.upper_bound_location is not None else zeros
+    )
+
+    # renormalize (respecting out of bounds weights)
+    inbound = (
+        (1 - prob_below_lower - prob_above_upper)[:, None]
+        * inbound
+        / np.sum(inbound, axis=1, keepdims=True)
+    )
+    new_pmfs = np.column_stack([prob_below_lower, inbound, prob_above_upper])
+    return np.cumsum(new_pmfs, axis=1)[:, :-1]
+
+
+def reshape_cdfs(cdfs: list[list[float]], plan: CdfReshapePlan) -> list[list[float]]:
+    """
+    Reshapes a batch of CDFs according to the plan.
+    Splines are built once per distinct input CDF length.
+    """
+
+    result: list[list[float] | None] = [None] * len(cdfs)
+    by_length = sorted(range(len(cdfs)), key=lambda idx: len(cdfs[idx]))
+
+    for _, group in groupby(by_length, key=lambda idx: len(cdfs[idx])):
+        indices = list(group)
+        new_cdfs = _reshape_cdfs_of_same_length(
+            np.array([cdfs[idx] for idx in indices], dtype=float), plan
+        )
+        for idx, new_cdf in zip(indices, new_cdfs.tolist()):
+            result[idx] = new_cdf
+
+    return result
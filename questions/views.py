@@ -14,7 +14,7 @@ from posts.services.common import get_post_permission_for_user
 from posts.utils import get_post_slug
 from projects.permissions import ObjectPermission
 from utils.requests import is_internal_request
-from utils.the_math.aggregations import get_aggregations_at_time
+from utils.the_math.aggregations import get_default_aggregations_at_times
 
 from .constants import QuestionStatus
 from .models import Forecast, Question
@@ -254,23 +254,15 @@ def questions_community_predictions(request) -> Response:
         q.id: q for q in Question.objects.filter(id__in=question_ids)
     }
 
+    lookups = [
+        (questions_by_id[qid], ts)
+        for qid, ts in zip(question_ids, per_entry_timestamps)
+        if qid in questions_by_id
+    ]
+
     # Compute aggregations
     results = []
-    for qid, ts in zip(question_ids, per_entry_timestamps):
-        question = questions_by_id.get(qid)
-        if not question:
-            continue
-
-        method = question.default_aggregation_method
-        aggs = get_aggregations_at_time(
-            question=question,
-            time=ts,
-            aggregation_methods=[method],
-            include_stats=True,
-            include_bots=question.include_bots_in_aggregates,
-        )
-        agg = aggs.get(method)
-
+    for (question, ts), agg in zip(lookups, get_default_aggregations_at_times(lookups)):
         if agg:
             pmf = agg.get_pmf()
             pmf = [
@@ -278,9 +270,9 @@ def questions_community_predictions(request) -> Response:
             ]  # Convert NaNs to None for JSON serialization
             results.append(
                 {
-                    "metaculus_id": qid,
+                    "metaculus_id": question.id,
                     "timestamp": ts.isoformat(),
-                    "method": method,
+                    "method": question.default_aggregation_method,
                     "pmf": pmf,
                     "interval_lower_bounds": agg.interval_lower_bounds,
                     "centers": agg.centers,
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from questions.models import Question
+from users.services.profile_stats import update_question_aggregation_calibrations
+
+
+class Command(BaseCommand):
+    help = """
+    Builds calibration accumulators of aggregations on all resolved binary questions
+    """
+
+    def handle(self, *args, **options):
+        questions = Question.objects.filter(
+            type=Question.QuestionType.BINARY, resolution__in=["yes", "no"]
+        ).order_by("id")
+        total = questions.count()
+
+        for idx, question in enumerate(questions.iterator(chunk_size=100), 1):
+            update_question_aggregation_calibrations(question)
+
+            if idx % 100 == 0 or idx == total:
+                print(f"Processed {idx}/{total} questions")
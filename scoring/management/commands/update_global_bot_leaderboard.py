@@ -26,6 +26,7 @@ from scoring.score_math import (
     get_geometric_means,
 )
 from users.models import User
+from utils.db import use_replica
 from utils.the_math.aggregations import get_aggregation_history
 from utils.the_math.formulas import string_location_to_bucket_index
 
@@ -213,6 +214,7 @@ def get_score_pair(
     return (question.id, score_sum, coverage)
 
 
+@use_replica()
 def gather_data(
     users: QuerySet[User],
     questions: QuerySet[Question],
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:13
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("questions", "0038_questionlifecycleevent"),
+        ("scoring", "0021_remove_leaderboard_bot_status_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AggregationCalibration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "aggregation_method",
+                    models.CharField(
+                        choices=[
+                            ("recency_weighted", "Recency Weighted"),
+                            ("unweighted", "Unweighted"),
+                            ("single_aggregation", "Single Aggregation"),
+                            ("metaculus_prediction", "Metaculus Prediction"),
+                        ],
+                        max_length=200,
+                    ),
+                ),
+                (
+                    "counts",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), size=None
+                    ),
+                ),
+                (
+                    "weights",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.FloatField(), size=None
+                    ),
+                ),
+                (
+                    "resolution_weights",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.FloatField(), size=None
+                    ),
+                ),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aggregation_calibrations",
+                        to="questions.question",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("question", "aggregation_method"),
+                        name="aggregationcalibration_unique_question_method",
+                    )
+                ],
+            },
+        ),
+    ]
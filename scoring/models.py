@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.db.models.query import QuerySet, Q
 
@@ -537,3 +538,38 @@ def global_leaderboard_dates() -> list[tuple[datetime, datetime]]:
     intervals = [(lb.start_time, lb.end_time) for lb in leaderboards]
     intervals.sort(key=lambda x: (x[1].year - x[0].year, x[0]))
     return intervals
+
+
+class AggregationCalibration(models.Model):
+    """
+    Calibration bin accumulators of an aggregation method on a resolved question.
+    Summed up to build the site-wide calibration curve,
+    see `users.services.profile_stats.get_aggregation_calibration_curve_data`
+    """
+
+    # typing
+    question_id: int
+    objects: models.Manager["AggregationCalibration"]
+
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="aggregation_calibrations"
+    )
+    aggregation_method = models.CharField(
+        max_length=200, choices=AggregationMethod.choices
+    )
+
+    # One element per `CALIBRATION_BINS` bin
+    counts = ArrayField(models.IntegerField())
+    weights = ArrayField(models.FloatField())
+    resolution_weights = ArrayField(models.FloatField())
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["question", "aggregation_method"],
+                name="aggregationcalibration_unique_question_method",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.aggregation_method} calibration on {self.question_id}"
@@ -51,12 +51,14 @@ from scoring.score_math import evaluate_question
 from users.models import User
 from users.services.profile_stats import (
     generate_question_scores,
-    get_calibration_curve_data,
+    get_aggregation_calibration_curve_data,
     get_forecasting_stats_data,
     get_score_histogram_data,
     get_score_scatter_plot_data,
+    schedule_users_stats_refresh,
 )
 from utils.cache import cached_singleton
+from utils.db import use_replica
 from utils.dtypes import generate_map_from_list
 from utils.the_math.measures import decimal_h_index
 
@@ -137,6 +139,10 @@ def score_question(
         Score.objects.bulk_create(new_scores, batch_size=500)
 
     invalidate_average_coverage_cache([question])
+    schedule_users_stats_refresh(
+        {score.user_id for score in new_scores if score.user_id}
+        | {user_id for user_id, _, _ in previous_scores_map if user_id}
+    )
 
 
 def retrieve_question_scores(
@@ -1181,6 +1187,7 @@ def get_contributions(
     return contributions
 
 
+@use_replica()
 def _compute_metaculus_stats() -> dict:
     aggregation_method = AggregationMethod.RECENCY_WEIGHTED
 
@@ -1201,11 +1208,7 @@ def _compute_metaculus_stats() -> dict:
     data.update(
         get_score_histogram_data(scores=scores, aggregation_method=aggregation_method)
     )
-    data.update(
-        get_calibration_curve_data(
-            aggregation_method=aggregation_method, chunk_size=10_000
-        )
-    )
+    data.update(get_aggregation_calibration_curve_data(aggregation_method))
     data.update(
         get_forecasting_stats_data(scores=scores, aggregation_method=aggregation_method)
     )
@@ -1213,6 +1216,6 @@ def _compute_metaculus_stats() -> dict:
     return data
 
 
-@cached_singleton(timeout=60 * 60 * 24)
+@cached_singleton(timeout=60 * 60 * 24, stale_timeout=60 * 60)
 def get_cached_metaculus_stats() -> dict:
     return _compute_metaculus_stats()
@@ -30,11 +30,13 @@ from scoring.serializers import (
 )
 from scoring.utils import get_contributions, update_project_leaderboard
 from users.models import User
+from utils.db import use_replica
 from scoring.utils import get_cached_metaculus_stats
 
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@use_replica()
 def global_leaderboard_view(
     request: Request,
 ):
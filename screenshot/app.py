@@ -1,6 +1,9 @@
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+import asyncio
 import io
 import logging
+import time
 
 import sentry_sdk
 from decouple import config
@@ -14,7 +17,17 @@ API_KEY = config("API_KEY", default="your_api_key_here")
 TRACING_ENABLED = config("TRACING_ENABLED", default=False, cast=bool)
 BASE_URL = config("BASE_URL", default="https://www.metaculus.com")
 SENTRY_ENABLED = config("SENTRY_ENABLED", default=False, cast=bool)
+# Number of warm browser pages kept in the pool
 MAX_OPEN_PAGES = config("MAX_OPEN_PAGES", default=10, cast=int)
+# Requests waiting for a free page beyond this are rejected with 429
+MAX_QUEUED_REQUESTS = config("MAX_QUEUED_REQUESTS", default=50, cast=int)
+# Overall time budget of a request, including the time spent in the queue
+REQUEST_DEADLINE_MS = config("REQUEST_DEADLINE_MS", default=45000, cast=int)
+# Pages are recycled after this many renders to bound browser memory growth
+PAGE_MAX_USES = config("PAGE_MAX_USES", default=100, cast=int)
+# Rendered output cache. Set CACHE_TTL_S=0 to disable
+CACHE_TTL_S = config("CACHE_TTL_S", default=600, cast=int)
+CACHE_MAX_BYTES = config("CACHE_MAX_BYTES", default=256 * 1024 * 1024, cast=int)
 USER_AGENT = config(
     "USER_AGENT",
     default="MetaculusScreenshotBot/1.0 (+https://www.metaculus.com)",
@@ -76,9 +89,183 @@ async def get_browser_context():
     return g_browser_instance
 
 
+class PooledPage:
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+
+
+class PagePool:
+    """
+    Keeps up to `size` warm browser pages, each one in its own context.
+    Requests wait in FIFO order for a free page instead of being rejected,
+    pages are reset to a blank state between requests.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.waiting = 0
+        self._idle: asyncio.Queue[PooledPage] = asyncio.Queue()
+        self._created = 0
+
+    async def _create(self) -> PooledPage:
+        self._created += 1
+        try:
+            browser = await get_browser_context()
+            context = await browser.new_context(user_agent=USER_AGENT)
+            page = await context.new_page()
+        except Exception:
+            self._created -= 1
+            raise
+
+        return PooledPage(context, page)
+
+    async def fill(self):
+        while self._created < self.size:
+            self._idle.put_nowait(await self._create())
+
+    async def acquire(self) -> PooledPage:
+        if self._idle.empty() and self._created < self.size:
+            return await self._create()
+
+        if self.waiting >= MAX_QUEUED_REQUESTS:
+            raise HTTPException(status_code=429, detail="Too many calls")
+
+        self.waiting += 1
+        try:
+            return await self._idle.get()
+        finally:
+            self.waiting -= 1
+
+    async def release(self, item: PooledPage):
+        item.uses += 1
+
+        if item.uses < PAGE_MAX_USES:
+            try:
+                await item.page.goto("about:blank", timeout=DEFAULT_TIMEOUT_MS)
+                await item.context.clear_cookies()
+                self._idle.put_nowait(item)
+                return
+            except Exception:
+                logger.warning("Failed to reset pooled page, recycling it")
+
+        self._created -= 1
+        try:
+            await item.context.close()
+        except Exception:
+            logger.debug("Failed to close browser context", exc_info=True)
+
+        # Replace the page right away so queued requests are not left waiting
+        try:
+            self._idle.put_nowait(await self._create())
+        except Exception:
+            logger.exception("Failed to create a replacement page")
+
+    @asynccontextmanager
+    async def page(self):
+        item = await self.acquire()
+        try:
+            yield item.page
+        finally:
+            # Shielded so a cancelled request still returns its page to the pool
+            await asyncio.shield(self.release(item))
+
+
+class RenderCache:
+    """
+    In-memory LRU cache of rendered output with a TTL and a total size limit
+    """
+
+    def __init__(self, ttl: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+
+    def get(self, key: tuple) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: tuple, value: bytes):
+        if not self.ttl or len(value) > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self.size += len(value)
+
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, url: str | None = None) -> int:
+        """
+        Drops all entries of the given url, or the whole cache if url is not provided
+        """
+
+        keys = [key for key in self._entries if url is None or key[1] == url]
+        for key in keys:
+            self._remove(key)
+
+        return len(keys)
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self.size -= len(entry[1])
+
+
+page_pool = PagePool(MAX_OPEN_PAGES)
+render_cache = RenderCache(CACHE_TTL_S, CACHE_MAX_BYTES)
+# Renders in progress, so identical concurrent requests share a single render
+_inflight_renders: dict[tuple, asyncio.Task] = {}
+
+
+async def _render_with_deadline(render_fn) -> bytes:
+    try:
+        async with asyncio.timeout(REQUEST_DEADLINE_MS / 1000):
+            async with page_pool.page() as page:
+                return await render_fn(page)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Rendering deadline exceeded")
+
+
+async def render(key: tuple, render_fn) -> tuple[bytes, bool]:
+    """
+    Renders using a pooled page, serving from cache when possible.
+    Returns the output and whether it was a cache hit.
+    """
+
+    cached = render_cache.get(key)
+    if cached is not None:
+        return cached, True
+
+    task = _inflight_renders.get(key)
+    if task is None:
+        task = asyncio.create_task(_render_with_deadline(render_fn))
+        _inflight_renders[key] = task
+        task.add_done_callback(lambda _: _inflight_renders.pop(key, None))
+
+    # Shielded so one client disconnecting does not cancel the render for others
+    buffer = await asyncio.shield(task)
+    render_cache.set(key, buffer)
+
+    return buffer, False
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     await get_browser_context()
+    await page_pool.fill()
     yield
 
     global g_browser_instance
@@ -246,15 +433,7 @@ async def screenshot(request_data: ScreenshotRequest = Body(...)):
     width = clamp(request_data.width, MIN_WIDTH, MAX_WIDTH)
     height = clamp(request_data.height, MIN_HEIGHT, MAX_HEIGHT)
 
-    browser = await get_browser_context()
-
-    if len(browser.contexts) >= MAX_OPEN_PAGES:
-        raise HTTPException(status_code=429, detail="Too many calls")
-
-    context = await browser.new_context(user_agent=USER_AGENT)
-    page = await context.new_page()
-
-    try:
+    async def take_screenshot(page) -> bytes:
         if width and height:
             await page.set_viewport_size({"width": width, "height": height})
 
@@ -278,7 +457,12 @@ async def screenshot(request_data: ScreenshotRequest = Body(...)):
         screenshot_element = page.locator(selector)
         await screenshot_element.wait_for(state="visible", timeout=DEFAULT_TIMEOUT_MS)
 
-        buffer = await screenshot_element.screenshot(timeout=DEFAULT_TIMEOUT_MS)
+        return await screenshot_element.screenshot(timeout=DEFAULT_TIMEOUT_MS)
+
+    key = ("screenshot", url, selector, width, height, request_data.selector_to_wait)
+
+    try:
+        buffer, cache_hit = await render(key, take_screenshot)
     except HTTPException:
         raise
     except Exception as e:
@@ -286,9 +470,6 @@ async def screenshot(request_data: ScreenshotRequest = Body(...)):
         raise HTTPException(
             status_code=400, detail=f"Screenshot generation failed: {e}"
         )
-    finally:
-        await page.close()
-        await context.close()
 
     filename = "screenshot.png"
     content_type = "image/png"
@@ -296,7 +477,10 @@ async def screenshot(request_data: ScreenshotRequest = Body(...)):
     return StreamingResponse(
         io.BytesIO(buffer),
         media_type=content_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Cache": "HIT" if cache_hit else "MISS",
+        },
     )
 
 
@@ -304,15 +488,7 @@ async def screenshot(request_data: ScreenshotRequest = Body(...)):
 async def pdf_print(request_data: PdfPrintRequest = Body(...)):
     url = request_data.url
 
-    browser = await get_browser_context()
-
-    if len(browser.contexts) >= MAX_OPEN_PAGES:
-        raise HTTPException(status_code=429, detail="Too many calls")
-
-    context = await browser.new_context(user_agent=USER_AGENT)
-    page = await context.new_page()
-
-    try:
+    async def print_pdf(page) -> bytes:
         await page.set_viewport_size({"width": MAX_WIDTH, "height": MAX_HEIGHT})
 
         response = await page.goto(url, wait_until="load", timeout=PAGE_LOAD_TIMEOUT_MS)
@@ -346,24 +522,39 @@ async def pdf_print(request_data: PdfPrintRequest = Body(...)):
             pdf_options["scale"] = clamp(request_data.scale, 0.1, 2.0)
 
         try:
-            buffer = await page.pdf(**pdf_options)
+            return await page.pdf(**pdf_options)
         finally:
             try:
                 await emit_afterprint_for_pdf(page)
             except Exception:
                 logger.debug("afterprint dispatch failed", exc_info=True)
+
+    key = ("pdf", url, *request_data.model_dump(exclude={"url"}).values())
+
+    try:
+        buffer, cache_hit = await render(key, print_pdf)
     except HTTPException:
         raise
     except Exception as e:
         logger.exception(f"PDF generation failed for {url}")
         raise HTTPException(status_code=400, detail=f"PDF generation failed: {e}")
-    finally:
-        await page.close()
-        await context.close()
 
     filename = "page.pdf"
     return StreamingResponse(
         io.BytesIO(buffer),
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Cache": "HIT" if cache_hit else "MISS",
+        },
     )
+
+
+class CacheInvalidateRequest(BaseModel):
+    # Drops the whole cache when not provided
+    url: str | None = None
+
+
+@app.post("/api/cache/invalidate/", dependencies=[Depends(check_api_key)])
+async def cache_invalidate(request_data: CacheInvalidateRequest = Body(...)):
+    return {"invalidated": render_cache.invalidate(request_data.url)}
@@ -0,0 +1,116 @@
+"""
+Load test for the screenshot service.
+
+Serves a small static page locally and fires concurrent /api/screenshot/
+requests at a running service, reporting throughput and latency percentiles.
+
+To compare implementations, run it against two service instances, e.g. one
+built from the current revision and one from an older one:
+
+    API_KEY=your-key uv run python load_test.py --target http://localhost:9000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import TemporaryDirectory
+
+PAGE_HTML = """<!doctype html>
+<html>
+  <body>
+    <div id="chart" style="width: 600px; height: 400px">
+      <svg width="600" height="400">
+        <rect width="600" height="400" fill="#eee" />
+        <polyline points="0,400 150,300 300,320 450,120 600,80"
+                  fill="none" stroke="#333" stroke-width="3" />
+      </svg>
+    </div>
+  </body>
+</html>
+"""
+
+
+def serve_static_page(directory: str, port: int) -> ThreadingHTTPServer:
+    with open(os.path.join(directory, "index.html"), "w") as f:
+        f.write(PAGE_HTML)
+
+    handler = partial(SimpleHTTPRequestHandler, directory=directory)
+    handler.log_message = lambda *args: None
+    server = ThreadingHTTPServer(("0.0.0.0", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+def take_screenshot(target: str, api_key: str, page_url: str) -> tuple[float, int]:
+    request = urllib.request.Request(
+        f"{target}/api/screenshot/",
+        data=json.dumps({"url": page_url, "selector": "#chart"}).encode(),
+        headers={"Content-Type": "application/json", "api_key": api_key},
+        method="POST",
+    )
+    start = time.perf_counter()
+
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+
+    return time.perf_counter() - start, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--target", default="http://localhost:9000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    # Number of distinct page urls; fewer urls means more cache hits
+    parser.add_argument("--unique-urls", type=int, default=20)
+    parser.add_argument("--page-port", type=int, default=8765)
+    # Host under which the service can reach the static page server
+    parser.add_argument("--page-host", default="localhost")
+    args = parser.parse_args()
+
+    api_key = os.environ.get("API_KEY", "your_api_key_here")
+
+    with TemporaryDirectory() as directory:
+        server = serve_static_page(directory, args.page_port)
+        urls = [
+            f"http://{args.page_host}:{args.page_port}/index.html?v={i % args.unique_urls}"
+            for i in range(args.requests)
+        ]
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(
+                executor.map(partial(take_screenshot, args.target, api_key), urls)
+            )
+        elapsed = time.perf_counter() - started_at
+
+        server.shutdown()
+
+    latencies = sorted(latency for latency, status in results if status == 200)
+    failures = len(results) - len(latencies)
+
+    print(f"requests:    {len(results)} ({failures} failed)")
+    print(f"concurrency: {args.concurrency}")
+    print(f"throughput:  {len(latencies) / elapsed:.2f} req/s")
+
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"p50:         {statistics.median(latencies) * 1000:.0f} ms")
+        print(f"p95:         {p95 * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Benchmarks are slow and only meaningful on a quiet machine,
+    so they are skipped unless explicitly requested with RUN_BENCHMARKS=1
+    """
+
+    if os.environ.get("RUN_BENCHMARKS"):
+        return
+
+    skip = pytest.mark.skip(reason="Set RUN_BENCHMARKS=1 to run benchmarks")
+
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def enable_db_access_for_all_benchmarks(db):
+    pass
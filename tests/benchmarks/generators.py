@@ -0,0 +1,188 @@
+"""
+Deterministic synthetic data for benchmarks.
+
+Every generator takes a seed, so the same call always produces the same data
+and timings stay comparable between runs and against the stored baselines
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from comments.models import Comment
+from posts.models import Post, Vote
+from questions.models import Forecast, Question
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_questions.factories import create_question
+from tests.unit.utils import datetime_aware
+from users.models import User
+
+OPEN_TIME = datetime_aware(2025, 1, 1)
+CLOSE_TIME = datetime_aware(2025, 7, 1)
+
+CONTINUOUS_OUTCOME_COUNT = 200
+
+
+def generate_users(count: int, prefix: str = "benchmark") -> list[User]:
+    return User.objects.bulk_create(
+        [
+            User(username=f"{prefix}_{idx}", email=f"{prefix}_{idx}@metaculus.com")
+            for idx in range(count)
+        ]
+    )
+
+
+def _random_cdf(rng: random.Random) -> list[float]:
+    """
+    Closed bounds CDF of a normal-like distribution with a random center and spread
+    """
+
+    center = rng.uniform(0.2, 0.8)
+    spread = rng.uniform(0.05, 0.3)
+    steps = [
+        1 / (1 + ((idx / CONTINUOUS_OUTCOME_COUNT - center) / spread) ** 2)
+        for idx in range(CONTINUOUS_OUTCOME_COUNT)
+    ]
+    total = sum(steps)
+    cdf = [0.0]
+
+    for step in steps:
+        cdf.append(cdf[-1] + step / total)
+
+    cdf[-1] = 1.0
+
+    return cdf
+
+
+def generate_question_forecasts(
+    *,
+    forecasters: int,
+    updates: int,
+    question_type: Question.QuestionType = Question.QuestionType.BINARY,
+    seed: int = 42,
+    users: list[User] = None,
+    **kwargs,
+) -> Question:
+    """
+    Creates a published question where each of N forecasters updates T times
+    at random moments of the question lifetime
+    """
+
+    rng = random.Random(seed)
+    users = users or generate_users(forecasters, prefix=f"forecaster_{seed}")
+
+    if question_type in (Question.QuestionType.NUMERIC, Question.QuestionType.DATE):
+        kwargs = {
+            "range_min": 0,
+            "range_max": 100,
+            "open_lower_bound": False,
+            "open_upper_bound": False,
+            "inbound_outcome_count": CONTINUOUS_OUTCOME_COUNT,
+            **kwargs,
+        }
+
+    question = create_question(
+        question_type=question_type,
+        open_time=OPEN_TIME,
+        cp_reveal_time=OPEN_TIME,
+        scheduled_close_time=CLOSE_TIME,
+        scheduled_resolve_time=CLOSE_TIME,
+        **kwargs,
+    )
+    post = factory_post(question=question)
+    lifetime = (CLOSE_TIME - OPEN_TIME).total_seconds()
+
+    forecasts = []
+    for user in users[:forecasters]:
+        start_times = sorted(
+            OPEN_TIME + timedelta(seconds=rng.random() * lifetime)
+            for _ in range(updates)
+        )
+
+        for start_time, end_time in zip(start_times, start_times[1:] + [None]):
+            forecast = Forecast(
+                question=question,
+                post=post,
+                author=user,
+                start_time=start_time,
+                end_time=end_time,
+            )
+
+            if question_type == Question.QuestionType.BINARY:
+                forecast.probability_yes = rng.uniform(0.01, 0.99)
+            else:
+                forecast.continuous_cdf = _random_cdf(rng)
+
+            forecasts.append(forecast)
+
+    Forecast.objects.bulk_create(forecasts, batch_size=5_000)
+    post.update_cached_fields()
+
+    return question
+
+
+def generate_posts(
+    *,
+    posts: int,
+    comments: int,
+    votes: int,
+    seed: int = 42,
+    now: datetime = None,
+) -> list[Post]:
+    """
+    Creates published binary question posts, each with the given number of
+    comments and votes spread over the last 60 days
+    """
+
+    rng = random.Random(seed)
+    now = now or timezone.now()
+    users = generate_users(max(comments, votes), prefix=f"voter_{seed}")
+
+    def created_at() -> datetime:
+        return now - timedelta(seconds=rng.random() * 60 * 24 * 3600)
+
+    generated = [
+        factory_post(
+            question=create_question(
+                question_type=Question.QuestionType.BINARY,
+                open_time=OPEN_TIME,
+                scheduled_close_time=now + timedelta(days=365),
+            ),
+            title=f"Benchmark post {idx}",
+            published_at=created_at(),
+        )
+        for idx in range(posts)
+    ]
+
+    Comment.objects.bulk_create(
+        [
+            Comment(
+                author=rng.choice(users),
+                on_post=post,
+                text=f"Benchmark comment {idx}",
+                created_at=created_at(),
+            )
+            for post in generated
+            for idx in range(comments)
+        ],
+        batch_size=5_000,
+    )
+    Vote.objects.bulk_create(
+        [
+            Vote(
+                user=user,
+                post=post,
+                direction=rng.choice(Vote.VoteDirection.values),
+                created_at=created_at(),
+            )
+            for post in generated
+            for user in rng.sample(users, votes)
+        ],
+        batch_size=5_000,
+    )
+
+    for post in generated:
+        post.update_cached_fields()
+
+    return generated
@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from authentication import jwt_session
+from authentication.auth import SessionJWTAuthentication
+from authentication.services.common import get_tokens_for_user
+from tests.benchmarks.utils import measure
+from tests.unit.test_users.factories import factory_user
+
+
+def test_jwt_authentication_overhead(mocker):
+    """
+    Per-request cost of JWT authentication with and without
+    the in-process session revocation cache
+    """
+
+    cache.clear()
+    jwt_session._local_enforce_at.clear()
+
+    user = factory_user()
+    tokens = get_tokens_for_user(user)
+    request = APIRequestFactory().get(
+        "/api/users/me/", HTTP_AUTHORIZATION=f"Bearer {tokens['access']}"
+    )
+    auth = SessionJWTAuthentication()
+    cache_get = mocker.patch.object(
+        jwt_session.cache, "get", wraps=jwt_session.cache.get
+    )
+
+    with override_settings(JWT_SESSION_LOCAL_CACHE_TTL=0):
+        redis_only = measure("redis only", lambda: auth.authenticate(request), 1000)
+        redis_only_gets = cache_get.call_count
+
+    cache_get.reset_mock()
+
+    with override_settings(JWT_SESSION_LOCAL_CACHE_TTL=5):
+        two_level = measure("two-level", lambda: auth.authenticate(request), 1000)
+        two_level_gets = cache_get.call_count
+
+    assert two_level_gets < redis_only_gets
+    assert two_level.median <= redis_only.median
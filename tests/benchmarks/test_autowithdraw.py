@@ -0,0 +1,136 @@
+import time
+from datetime import date
+
+from django.db import connection
+from freezegun import freeze_time
+
+from posts.models import Post
+from questions.management.commands.mark_forecasts_to_autowithdraw import (
+    update_standing_forecasts,
+)
+from questions.models import Forecast, Question, UserForecastNotification
+from tests.benchmarks.utils import logger
+from tests.unit.test_questions.factories import factory_forecast
+from tests.unit.test_questions.test_commands import (
+    create_question_with_post,
+    legacy_autowithdraw_times,
+)
+from tests.unit.utils import datetime_aware
+from users.models import User
+
+QUESTIONS = 250
+USERS = 4000
+LEGACY_SAMPLE_SIZE = 50_000
+
+NOW = datetime_aware(2025, 6, 1, 12)
+
+
+def _populate_standing_forecasts(questions: list[Question], users: list[User]):
+    """
+    Clones a template forecast for every (question, user) pair in SQL
+    """
+
+    template = factory_forecast(
+        author=users[0], question=questions[0], start_time=questions[0].open_time
+    )
+    overrides = {
+        "author_id": "u.id",
+        "question_id": "q.id",
+        "post_id": "p.id",
+        "start_time": "q.open_time + (%(now)s - q.open_time) * random()",
+    }
+    columns = [
+        field.column
+        for field in Forecast._meta.concrete_fields
+        if not field.primary_key
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {Forecast._meta.db_table} ({", ".join(columns)})
+            SELECT {", ".join(overrides.get(c, f"t.{c}") for c in columns)}
+            FROM {Forecast._meta.db_table} t
+            CROSS JOIN {Question._meta.db_table} q
+            JOIN {Post._meta.db_table} p ON p.question_id = q.id
+            CROSS JOIN {User._meta.db_table} u
+            WHERE t.id = %(template_id)s
+              AND q.id = ANY(%(question_ids)s)
+              AND u.id = ANY(%(user_ids)s)
+            """,
+            {
+                "now": NOW,
+                "template_id": template.id,
+                "question_ids": [q.id for q in questions],
+                "user_ids": [u.id for u in users],
+            },
+        )
+        cursor.execute(f"ANALYZE {Forecast._meta.db_table}")
+
+    template.delete()
+
+
+@freeze_time(NOW, tick=True)
+def test_update_standing_forecasts_1m_forecasts():
+    questions = [
+        create_question_with_post(
+            open_time=datetime_aware(2025, 1, 1), scheduled_close_time=close_time
+        )
+        for close_time in (
+            datetime_aware(2025, 7, 1) + (NOW - datetime_aware(2025, 1, 1)) * i / 10
+            for i in range(QUESTIONS)
+        )
+    ]
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"benchmark_{idx}",
+                email=f"benchmark_{idx}@metaculus.com",
+                prediction_expiration_percent=(5, 10, 25)[idx % 3],
+            )
+            for idx in range(USERS)
+        ]
+    )
+    _populate_standing_forecasts(questions, users)
+    total = Forecast.all_objects.count()
+
+    # Legacy row-by-row processing, on a sample
+    tm = time.perf_counter()
+    sample = Forecast.all_objects.select_related("question", "author").order_by("id")[
+        :LEGACY_SAMPLE_SIZE
+    ]
+    forecasts, notifications = [], []
+    for forecast in sample.iterator(chunk_size=10000):
+        forecast.end_time, trigger_time = legacy_autowithdraw_times(
+            forecast, forecast.author.prediction_expiration_percent, NOW
+        )
+        forecasts.append(forecast)
+        notifications.append(
+            UserForecastNotification(
+                user=forecast.author,
+                question=forecast.question,
+                trigger_time=trigger_time,
+                forecast=forecast,
+            )
+        )
+    Forecast.objects.bulk_update(forecasts, ["end_time"], batch_size=10000)
+    UserForecastNotification.objects.bulk_create(
+        notifications, batch_size=10000, ignore_conflicts=True
+    )
+    legacy_duration = time.perf_counter() - tm
+
+    tm = time.perf_counter()
+    update_standing_forecasts(date(2025, 6, 2))
+    duration = time.perf_counter() - tm
+
+    logger.info(
+        f"legacy: {LEGACY_SAMPLE_SIZE} forecasts in {legacy_duration:.2f}s "
+        f"({LEGACY_SAMPLE_SIZE / legacy_duration:.0f} forecasts/s)"
+    )
+    logger.info(
+        f"set-based: {total - LEGACY_SAMPLE_SIZE} forecasts in {duration:.2f}s "
+        f"({(total - LEGACY_SAMPLE_SIZE) / duration:.0f} forecasts/s)"
+    )
+
+    assert not Forecast.all_objects.filter(end_time__isnull=True).exists()
+    assert UserForecastNotification.objects.count() == total
@@ -0,0 +1,111 @@
+import random
+from datetime import timedelta
+
+from questions.models import Forecast, Question
+from questions.services.forecasts import build_question_forecasts
+from tests.benchmarks.utils import logger, measure
+from tests.unit.test_questions.factories import create_question
+from tests.unit.utils import datetime_aware
+from users.models import User
+from utils.the_math.aggregations import (
+    get_aggregations_at_time,
+    get_default_aggregations_at_times,
+)
+
+QUESTIONS = 100
+FORECASTERS = 100
+FORECASTS_PER_USER = 5
+
+OPEN_TIME = datetime_aware(2025, 1, 1)
+CLOSE_TIME = datetime_aware(2025, 7, 1)
+
+
+def _legacy_lookup(lookups: list[tuple[Question, object]]):
+    """
+    Reference per-lookup live aggregation, as done before batching
+    """
+
+    for question, time in lookups:
+        method = question.default_aggregation_method
+        aggregation = get_aggregations_at_time(
+            question=question,
+            time=time,
+            aggregation_methods=[method],
+            include_stats=True,
+            include_bots=question.include_bots_in_aggregates,
+        ).get(method)
+
+        if aggregation:
+            aggregation.get_pmf()
+
+
+def _stored_lookup(lookups: list[tuple[Question, object]]):
+    """
+    Batched lookup, including the PMFs the community predictions view reads
+    """
+
+    for aggregation in get_default_aggregations_at_times(lookups):
+        if aggregation:
+            aggregation.get_pmf()
+
+
+def test_community_predictions_lookup():
+    rng = random.Random(42)
+    users = User.objects.bulk_create(
+        [
+            User(username=f"benchmark_{idx}", email=f"benchmark_{idx}@metaculus.com")
+            for idx in range(FORECASTERS)
+        ]
+    )
+    questions = [
+        create_question(
+            question_type=Question.QuestionType.BINARY,
+            open_time=OPEN_TIME,
+            scheduled_close_time=CLOSE_TIME,
+        )
+        for _ in range(QUESTIONS)
+    ]
+    lifetime = (CLOSE_TIME - OPEN_TIME).total_seconds()
+
+    forecasts = []
+    for question in questions:
+        for user in users:
+            start_times = sorted(
+                OPEN_TIME + timedelta(seconds=rng.random() * lifetime)
+                for _ in range(FORECASTS_PER_USER)
+            )
+            for start_time, end_time in zip(start_times, start_times[1:] + [None]):
+                forecasts.append(
+                    Forecast(
+                        question=question,
+                        author=user,
+                        probability_yes=rng.random(),
+                        start_time=start_time,
+                        end_time=end_time,
+                    )
+                )
+    Forecast.objects.bulk_create(forecasts, batch_size=10_000)
+
+    for question in questions:
+        build_question_forecasts(question)
+
+    for size in (10, 100, 1000):
+        lookups = [
+            (
+                rng.choice(questions),
+                OPEN_TIME + timedelta(seconds=rng.random() * lifetime),
+            )
+            for _ in range(size)
+        ]
+
+        legacy = measure(
+            f"live x{size}", lambda: _legacy_lookup(lookups), runs=3, warmup=0
+        )
+        batched = measure(
+            f"stored x{size}",
+            lambda: _stored_lookup(lookups),
+            runs=10,
+        )
+        logger.info(f"{size} lookups: {legacy.median / batched.median:.1f}x faster")
+
+        assert batched.queries <= legacy.queries
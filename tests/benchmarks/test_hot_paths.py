@@ -0,0 +1,143 @@
+"""
+Benchmarks of the functions dominating production load, checked against
+the stored baselines. See `check_baseline` for thresholds and updating them
+"""
+
+from comments.models import Comment
+from posts.serializers import serialize_post_many
+from posts.services.feed import get_posts_feed
+from posts.services.hotness import compute_feed_hotness
+from questions.models import Question
+from questions.services.forecasts import build_question_forecasts
+from questions.types import AggregationMethod
+from scoring.constants import ScoreTypes
+from scoring.score_math import evaluate_question
+from tests.benchmarks.generators import (
+    CLOSE_TIME,
+    generate_posts,
+    generate_question_forecasts,
+    generate_users,
+)
+from tests.benchmarks.utils import check_baseline, measure
+from utils.csv_utils import generate_data
+from utils.the_math.aggregations import get_aggregation_history
+
+FORECASTERS = 200
+UPDATES = 10
+
+POSTS = 100
+COMMENTS = 20
+VOTES = 20
+
+
+def test_get_aggregation_history():
+    users = generate_users(FORECASTERS)
+
+    for question_type in (
+        Question.QuestionType.BINARY,
+        Question.QuestionType.NUMERIC,
+    ):
+        question = generate_question_forecasts(
+            forecasters=FORECASTERS,
+            updates=UPDATES,
+            question_type=question_type,
+            users=users,
+        )
+
+        check_baseline(
+            measure(
+                f"get_aggregation_history {question_type}",
+                lambda: get_aggregation_history(
+                    question,
+                    aggregation_methods=[AggregationMethod.RECENCY_WEIGHTED],
+                    minimize=True,
+                    include_stats=True,
+                ),
+                runs=10,
+            )
+        )
+
+
+def test_evaluate_question():
+    question = generate_question_forecasts(
+        forecasters=FORECASTERS, updates=UPDATES, actual_close_time=CLOSE_TIME
+    )
+
+    check_baseline(
+        measure(
+            "evaluate_question binary",
+            lambda: evaluate_question(
+                question,
+                resolution="yes",
+                score_types=[
+                    ScoreTypes.BASELINE,
+                    ScoreTypes.PEER,
+                    ScoreTypes.SPOT_BASELINE,
+                    ScoreTypes.SPOT_PEER,
+                    ScoreTypes.RELATIVE_LEGACY,
+                ],
+                spot_forecast_time=CLOSE_TIME,
+                aggregation_methods=[AggregationMethod.RECENCY_WEIGHTED],
+            ),
+            runs=3,
+        )
+    )
+
+
+def test_serialize_post_many():
+    posts = generate_posts(posts=POSTS, comments=COMMENTS, votes=VOTES)
+
+    question = generate_question_forecasts(forecasters=FORECASTERS, updates=UPDATES)
+    build_question_forecasts(question)
+    posts.append(question.post)
+
+    check_baseline(
+        measure(
+            "serialize_post_many",
+            lambda: serialize_post_many(
+                posts,
+                with_cp=True,
+                group_cutoff=3,
+                with_key_factors=True,
+                include_average_scores=True,
+            ),
+            runs=10,
+        )
+    )
+
+
+def test_get_posts_feed():
+    generate_posts(posts=POSTS, comments=COMMENTS, votes=VOTES)
+    compute_feed_hotness()
+
+    check_baseline(
+        measure(
+            "get_posts_feed hotness",
+            lambda: list(get_posts_feed(for_main_feed=True, order_by="-hotness")[:20]),
+            runs=20,
+        )
+    )
+
+
+def test_compute_feed_hotness():
+    generate_posts(posts=POSTS, comments=COMMENTS, votes=VOTES)
+
+    check_baseline(measure("compute_feed_hotness", compute_feed_hotness, runs=3))
+
+
+def test_generate_data():
+    question = generate_question_forecasts(forecasters=FORECASTERS, updates=UPDATES)
+    build_question_forecasts(question)
+
+    check_baseline(
+        measure(
+            "generate_data",
+            lambda: generate_data(
+                Question.objects.filter(pk=question.pk),
+                user_forecasts=question.user_forecasts.all(),
+                aggregate_forecasts=question.aggregate_forecasts.all(),
+                comments=Comment.objects.filter(on_post=question.post),
+            ),
+            runs=3,
+        )
+    )
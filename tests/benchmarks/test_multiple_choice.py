@@ -0,0 +1,117 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from questions.models import Forecast, Question
+from questions.services.multiple_choice_handlers import (
+    multiple_choice_delete_options,
+    remap_pmfs,
+)
+from tests.benchmarks.utils import logger
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_questions.factories import create_question
+from tests.unit.test_users.factories import factory_user
+from tests.unit.utils import datetime_aware
+
+FORECASTERS = 1000
+FORECASTS_PER_USER = 100
+OPTIONS = ["a", "b", "c", "d", "e", "other"]
+
+
+def _loop_remap(pmfs, all_options, new_options):
+    """
+    Reference per-forecast remapping, as done before vectorization
+    """
+
+    result = []
+    for previous_pmf in pmfs:
+        new_pmf = [None] * len(all_options)
+        for value, label in zip(previous_pmf, all_options):
+            if value is None:
+                continue
+            if label in new_options:
+                new_pmf[all_options.index(label)] = (
+                    new_pmf[all_options.index(label)] or 0.0
+                ) + value
+            else:
+                new_pmf[-1] = (new_pmf[-1] or 0.0) + value
+        result.append(new_pmf)
+    return result
+
+
+def _random_pmf(rng: random.Random) -> list[float]:
+    weights = [rng.random() for _ in OPTIONS]
+    return [w / sum(weights) for w in weights]
+
+
+def test_multiple_choice_delete_options_100k_forecasts(mocker):
+    mocker.patch("questions.services.forecasts.build_question_forecasts")
+    mocker.patch("questions.tasks.multiple_choice_delete_option_notifications.send")
+
+    rng = random.Random(42)
+    question = create_question(
+        question_type=Question.QuestionType.MULTIPLE_CHOICE,
+        options=OPTIONS,
+        options_history=[(datetime.min.isoformat(), OPTIONS)],
+    )
+    post = factory_post(question=question)
+    users = [factory_user() for _ in range(FORECASTERS)]
+    start = datetime_aware(2024, 1, 1)
+
+    Forecast.objects.bulk_create(
+        [
+            Forecast(
+                question=question,
+                post=post,
+                author=user,
+                start_time=start + timedelta(hours=idx),
+                end_time=(
+                    start + timedelta(hours=idx + 1)
+                    if idx < FORECASTS_PER_USER - 1
+                    else None
+                ),
+                probability_yes_per_category=_random_pmf(rng),
+            )
+            for user in users
+            for idx in range(FORECASTS_PER_USER)
+        ],
+        batch_size=5000,
+    )
+
+    pmfs = list(
+        question.user_forecasts.values_list("probability_yes_per_category", flat=True)
+    )
+    new_options = ["a", "c", "e", "other"]
+    index_map = [
+        idx if label in new_options else len(OPTIONS) - 1
+        for idx, label in enumerate(OPTIONS)
+    ]
+
+    tm = time.perf_counter()
+    expected = _loop_remap(pmfs, OPTIONS, new_options)
+    loop_duration = time.perf_counter() - tm
+
+    tm = time.perf_counter()
+    remapped = remap_pmfs(pmfs, index_map, len(OPTIONS))
+    vectorized_duration = time.perf_counter() - tm
+
+    assert remapped == expected
+    logger.info(
+        f"PMF remap of {len(pmfs)} forecasts: loop={loop_duration:.3f}s "
+        f"vectorized={vectorized_duration:.3f}s "
+        f"speedup={loop_duration / vectorized_duration:.1f}x"
+    )
+
+    tm = time.perf_counter()
+    multiple_choice_delete_options(
+        question,
+        ["b", "d"],
+        comment_author=users[0],
+        timestep=start + timedelta(hours=FORECASTS_PER_USER - 1, minutes=30),
+    )
+    logger.info(
+        f"multiple_choice_delete_options on {len(pmfs)} forecasts: "
+        f"{time.perf_counter() - tm:.3f}s"
+    )
+
+    assert question.user_forecasts.count() == len(pmfs) + FORECASTERS
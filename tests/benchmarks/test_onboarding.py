@@ -0,0 +1,25 @@
+from django.core.cache import cache
+
+from posts.services.onboarding import (
+    ONBOARDING_FEED_CACHE_KEY,
+    ONBOARDING_FEED_CACHE_VERSION,
+    build_onboarding_feed,
+    get_materialized_onboarding_feed,
+)
+from tests.benchmarks.utils import measure
+from tests.unit.test_posts.test_services.test_onboarding import (
+    create_onboarding_topics,
+)
+
+
+def test_onboarding_feed_materialized_vs_cold():
+    create_onboarding_topics(categories=20, posts_per_category=10)
+    cache.delete(ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION)
+
+    cold = measure("cold build", build_onboarding_feed, 20)
+    materialized = measure("materialized", get_materialized_onboarding_feed, 1000)
+
+    assert materialized.queries == 0
+    assert materialized.median < cold.median
+
+    cache.delete(ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION)
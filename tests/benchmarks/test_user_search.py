@@ -0,0 +1,106 @@
+from django.db import connection
+from django.db.models import Case, IntegerField, When
+
+from comments.models import Comment
+from tests.benchmarks.utils import logger, measure
+from tests.unit.test_comments.factories import factory_comment
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_users.factories import factory_user
+from users.models import User
+from users.services.common import get_users, refresh_recent_commenters
+
+USERS = 1_000_000
+RECENT_COMMENTERS = 20_000
+SEARCHES = ["user_12", "9f3a", "user_999999", "zzzz"]
+
+
+def _populate_users(template: User):
+    """
+    Clones a template user in SQL, with pseudo-random username suffixes
+    """
+
+    overrides = {
+        "username": "'user_' || n || '_' || substr(md5(n::text), 1, 6)",
+        "email": "'user_' || n || '@metaculus.com'",
+    }
+    columns = [
+        field.column for field in User._meta.concrete_fields if not field.primary_key
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {User._meta.db_table} ({", ".join(columns)})
+            SELECT {", ".join(overrides.get(c, f"t.{c}") for c in columns)}
+            FROM {User._meta.db_table} t
+            CROSS JOIN generate_series(1, %(users)s) n
+            WHERE t.id = %(template_id)s
+            """,
+            {"users": USERS, "template_id": template.id},
+        )
+        cursor.execute(f"ANALYZE {User._meta.db_table}")
+
+
+def _populate_comments(template: Comment):
+    columns = [
+        connection.ops.quote_name(field.column)
+        for field in Comment._meta.concrete_fields
+        if not field.primary_key
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {Comment._meta.db_table} ({", ".join(columns)})
+            SELECT {", ".join("u.id" if c == '"author_id"' else f"t.{c}" for c in columns)}
+            FROM {Comment._meta.db_table} t
+            CROSS JOIN (
+                SELECT id FROM {User._meta.db_table}
+                ORDER BY id DESC LIMIT %(commenters)s
+            ) u
+            WHERE t.id = %(template_id)s
+            """,
+            {"commenters": RECENT_COMMENTERS, "template_id": template.id},
+        )
+
+
+def _legacy_search(search: str, recently_active_user_ids: set[int]):
+    return list(
+        User.objects.filter(is_active=True)
+        .annotate(
+            full_match=Case(
+                When(username__iexact=search, then=1),
+                default=0,
+                output_field=IntegerField(),
+            )
+        )
+        .filter(username__icontains=search, id__in=recently_active_user_ids)
+        .order_by("-full_match", "username")[:20]
+    )
+
+
+def test_user_search_1m_users():
+    template = factory_user(username="benchmark_template")
+    _populate_users(template)
+    _populate_comments(factory_comment(author=template, on_post=factory_post()))
+    refresh_recent_commenters()
+
+    recently_active_user_ids = set(
+        Comment.objects.filter(is_soft_deleted=False)
+        .values_list("author_id", flat=True)
+        .distinct()
+    )
+
+    for search in SEARCHES:
+        legacy = measure(
+            f"legacy {search!r}",
+            lambda: _legacy_search(search, recently_active_user_ids),
+            runs=10,
+        )
+        timing = measure(
+            f"trigram {search!r}",
+            lambda: list(get_users(search=search)[:20]),
+            runs=10,
+        )
+
+        logger.info(f"{search!r}: {legacy.median / timing.median:.1f}x faster")
@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+logger = logging.getLogger(__name__)
+
+BASELINES_PATH = Path(
+    os.environ.get("BENCHMARK_BASELINES", Path(__file__).parent / "baselines.json")
+)
+# Relative slowdown of the median tolerated before a benchmark is reported
+# as a regression. Query counts must never grow
+REGRESSION_THRESHOLD = float(os.environ.get("BENCHMARK_REGRESSION_THRESHOLD", 0.5))
+
+
+@dataclass
+class Timing:
+    name: str
+    runs: int
+    median: float
+    p95: float
+    queries: int
+
+    def __str__(self):
+        return (
+            f"{self.name}: runs={self.runs} "
+            f"median={self.median * 1000:.3f}ms p95={self.p95 * 1000:.3f}ms "
+            f"queries/run={self.queries}"
+        )
+
+
+def measure(name: str, fn: Callable, runs: int = 100, warmup: int = 1) -> Timing:
+    """
+    Runs `fn` repeatedly and reports per-run wall time and DB query count
+    """
+
+    for _ in range(warmup):
+        fn()
+
+    durations = []
+
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    timing = Timing(
+        name=name,
+        runs=runs,
+        median=statistics.median(durations),
+        p95=durations[min(runs - 1, int(runs * 0.95))],
+        queries=len(ctx.captured_queries) // runs,
+    )
+    logger.info(str(timing))
+
+    return timing
+
+
+def _load_baselines() -> dict[str, dict]:
+    if not BASELINES_PATH.exists():
+        return {}
+
+    return json.loads(BASELINES_PATH.read_text())
+
+
+def check_baseline(timing: Timing):
+    """
+    Compares a timing against its stored baseline and fails on regressions.
+    Run with UPDATE_BENCHMARK_BASELINES=1 to record the current timings instead
+    """
+
+    baselines = _load_baselines()
+
+    if os.environ.get("UPDATE_BENCHMARK_BASELINES"):
+        baselines[timing.name] = {
+            "median_ms": round(timing.median * 1000, 3),
+            "queries": timing.queries,
+        }
+        BASELINES_PATH.write_text(
+            json.dumps(dict(sorted(baselines.items())), indent=2) + "\n"
+        )
+
+        return
+
+    baseline = baselines.get(timing.name)
+
+    if not baseline:
+        logger.warning(f"{timing.name}: no baseline recorded")
+        return
+
+    median_ms = timing.median * 1000
+    logger.info(
+        f"{timing.name}: {median_ms / baseline['median_ms']:.2f}x of baseline median"
+    )
+
+    assert timing.queries <= baseline["queries"], (
+        f"{timing.name}: {timing.queries} queries/run, "
+        f"baseline is {baseline['queries']}"
+    )
+    assert median_ms <= baseline["median_ms"] * (1 + REGRESSION_THRESHOLD), (
+        f"{timing.name}: median {median_ms:.3f}ms, "
+        f"baseline is {baseline['median_ms']:.3f}ms"
+    )
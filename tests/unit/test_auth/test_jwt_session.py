@@ -1,11 +1,13 @@
 import pytest
 
 from django.core.cache import cache
+from django.test import override_settings
 from django.utils import timezone
 from freezegun import freeze_time
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
+from authentication import jwt_session
 from authentication.jwt_session import (
     SessionRefreshToken,
     is_token_revoked,
@@ -15,6 +17,7 @@ from authentication.jwt_session import (
     get_session_enforce_at,
     _get_whitelist_key,
     _get_grace_key,
+    _get_revoked_key,
 )
 from authentication.services.common import get_tokens_for_user
 from tests.unit.test_users.factories import factory_user
@@ -24,8 +27,10 @@ from tests.unit.test_users.factories import factory_user
 def clear_cache():
     """Clear cache before each test."""
     cache.clear()
+    jwt_session._local_enforce_at.clear()
     yield
     cache.clear()
+    jwt_session._local_enforce_at.clear()
 
 
 class TestSessionTokenBasics:
@@ -329,3 +334,63 @@ class TestUserLevelRevocation:
         response = client.get("/api/users/me/")
         assert response.status_code == 403
         assert "invalidated" in str(response.data).lower()
+
+
+class TestLocalSessionCache:
+    """Tests for the in-process cache layered over Redis."""
+
+    @override_settings(JWT_SESSION_LOCAL_CACHE_TTL=5)
+    def test_enforce_at_is_served_from_local_cache(self, mocker):
+        user = factory_user()
+        refresh = SessionRefreshToken.for_user(user)
+        access = refresh.access_token
+
+        cache_get = mocker.patch.object(
+            jwt_session.cache, "get", wraps=jwt_session.cache.get
+        )
+
+        for _ in range(3):
+            assert is_token_revoked(access) is False
+
+        cache_get.assert_called_once_with(_get_revoked_key(refresh["session_id"]))
+
+    @override_settings(JWT_SESSION_LOCAL_CACHE_TTL=5)
+    def test_remote_change_is_picked_up_after_ttl(self):
+        user = factory_user()
+
+        with freeze_time("2024-01-01 12:00:00") as frozen:
+            refresh = SessionRefreshToken.for_user(user)
+            session_id = refresh["session_id"]
+            assert is_token_revoked(refresh) is False
+
+            # Simulate a logout handled by another process
+            cache.set(_get_revoked_key(session_id), 0)
+            assert is_token_revoked(refresh) is False
+
+            frozen.tick(6)
+            assert is_token_revoked(refresh) is True
+
+    @override_settings(JWT_SESSION_LOCAL_CACHE_TTL=5)
+    def test_revoke_session_is_broadcast(self, mocker):
+        user = factory_user()
+        refresh = SessionRefreshToken.for_user(user)
+        session_id = refresh["session_id"]
+
+        assert is_token_revoked(refresh) is False
+
+        connection = mocker.patch("authentication.jwt_session.get_redis_connection")
+        revoke_session(session_id)
+
+        connection.return_value.publish.assert_called_once_with(
+            jwt_session.REVOCATION_CHANNEL, session_id
+        )
+        assert is_token_revoked(refresh) is True
+
+    @override_settings(JWT_SESSION_LOCAL_CACHE_TTL=0)
+    def test_local_cache_can_be_disabled(self):
+        user = factory_user()
+        refresh = SessionRefreshToken.for_user(user)
+
+        assert is_token_revoked(refresh) is False
+        cache.set(_get_revoked_key(refresh["session_id"]), 0)
+        assert is_token_revoked(refresh) is True
@@ -3,9 +3,18 @@ from freezegun import freeze_time
 
 from coherence.services import (
     calculate_freshness_aggregate_coherence_link as calculate_freshness,
+    get_stale_linked_questions,
+    get_stale_links,
 )
+from questions.models import Question
+from tests.unit.test_posts.factories import factory_post
 from tests.unit.test_questions.conftest import *  # noqa
-from .factories import factory_aggregate_coherence_link, factory_agg_link_vote
+from tests.unit.test_questions.factories import create_question, factory_forecast
+from .factories import (
+    factory_aggregate_coherence_link,
+    factory_agg_link_vote,
+    factory_coherence_link,
+)
 from ..utils import datetime_aware
 
 
@@ -39,3 +48,91 @@ def test_calculate_freshness_aggregate_coherence_link(
     # Resolved
     question_numeric.actual_resolve_time = datetime_aware(2025, 4, 15)
     assert calculate_freshness(question_binary, aggregation, [v1]) == 0
+
+
+def test_get_stale_links(
+    question_binary, question_numeric, user1, user2, django_assert_num_queries
+):
+    question_mc = create_question(question_type=Question.QuestionType.MULTIPLE_CHOICE)
+    for question in (question_binary, question_numeric, question_mc):
+        factory_post(question=question)
+
+    def forecast(user, question, day):
+        return factory_forecast(
+            author=user, question=question, start_time=datetime_aware(2025, 4, day)
+        )
+
+    forecast(user1, question_binary, 1)
+    forecast(user1, question_binary, 10)
+    forecast(user1, question_numeric, 5)
+    forecast(user2, question_binary, 10)
+    forecast(user2, question_numeric, 12)
+
+    # Linked question forecasted before the latest question forecast
+    stale_link = factory_coherence_link(
+        user=user1, question1=question_binary, question2=question_numeric
+    )
+    # Linked question never forecasted
+    never_forecasted_link = factory_coherence_link(
+        user=user1, question1=question_binary, question2=question_mc
+    )
+    # Linked question updated afterward
+    fresh_link = factory_coherence_link(
+        user=user2, question1=question_binary, question2=question_numeric
+    )
+    # No forecast on question1
+    no_forecast_link = factory_coherence_link(
+        user=user2, question1=question_mc, question2=question_numeric
+    )
+
+    links = [stale_link, never_forecasted_link, fresh_link, no_forecast_link]
+
+    with django_assert_num_queries(1):
+        assert get_stale_links(links, datetime_aware(2025, 4, 5)) == [
+            stale_link,
+            never_forecasted_link,
+        ]
+
+    # Question forecast is older than the last check
+    assert get_stale_links(links, datetime_aware(2025, 4, 11)) == []
+
+
+def test_get_stale_linked_questions(question_binary, question_numeric, user1, user2):
+    question_mc = create_question(question_type=Question.QuestionType.MULTIPLE_CHOICE)
+    for question in (question_binary, question_numeric, question_mc):
+        factory_post(question=question)
+
+    for question, day in ((question_binary, 10), (question_numeric, 5)):
+        factory_forecast(
+            author=user1, question=question, start_time=datetime_aware(2025, 4, day)
+        )
+
+    # Linked questions are checked against the user forecasts,
+    # whoever authored the link
+    links = [
+        factory_coherence_link(
+            user=user1, question1=question_binary, question2=question_numeric
+        ),
+        factory_coherence_link(
+            user=user2, question1=question_binary, question2=question_mc
+        ),
+        factory_coherence_link(
+            user=user2, question1=question_binary, question2=question_numeric
+        ),
+    ]
+
+    assert get_stale_linked_questions(
+        links, question_binary, user1, datetime_aware(2025, 4, 5)
+    ) == [question_numeric, question_mc]
+    assert (
+        get_stale_linked_questions(
+            links, question_binary, user1, datetime_aware(2025, 4, 11)
+        )
+        == []
+    )
+    assert (
+        get_stale_linked_questions(
+            links, question_binary, user2, datetime_aware(2025, 4, 5)
+        )
+        == []
+    )
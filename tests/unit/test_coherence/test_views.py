@@ -1,9 +1,17 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from questions.models import Question
 from tests.unit.test_questions.conftest import *  # noqa
 from tests.unit.test_posts.factories import factory_post
-from .factories import factory_aggregate_coherence_link, factory_coherence_link
+from tests.unit.test_questions.factories import create_question
+from .factories import (
+    factory_aggregate_coherence_link,
+    factory_agg_link_vote,
+    factory_coherence_link,
+)
 
 
 def test_aggregate_question_link_vote(
@@ -41,3 +49,43 @@ def test_aggregate_question_link_vote(
     assert response.data["data"][0]["freshness"] == pytest.approx(0.66, rel=0.1)
     votes_response = response.data["data"][0]["votes"]
     assert {x["score"] for x in votes_response["aggregated_data"]} == {1, -1}
+
+    # Votes deleted outside of the voting endpoint, e.g. from the admin
+    aggregation.votes.filter(user=user1).delete()
+
+    response = user2_client.get(url)
+    assert response.data["data"][0]["freshness"] == pytest.approx(2.33, rel=0.1)
+
+
+def _count_link_endpoint_queries(client, user, links_count: int) -> dict:
+    question = create_question(question_type=Question.QuestionType.BINARY)
+    factory_post(question=question)
+
+    for _ in range(links_count):
+        question2 = create_question(question_type=Question.QuestionType.BINARY)
+        factory_post(question=question2)
+        factory_coherence_link(
+            user=user, question1=question, question2=question2, direction=1
+        )
+        aggregation = factory_aggregate_coherence_link(
+            question1=question, question2=question2
+        )
+        factory_agg_link_vote(aggregation=aggregation, user=user, score=1)
+
+    queries_count = {}
+
+    for url_name in ("get-links-for-question", "get-aggregate-links-for-question"):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse(url_name, kwargs={"pk": question.pk}))
+
+        assert response.status_code == 200
+        assert len(response.data["data"]) == links_count
+        queries_count[url_name] = len(ctx.captured_queries)
+
+    return queries_count
+
+
+def test_question_links_constant_queries(user1, user1_client):
+    assert _count_link_endpoint_queries(
+        user1_client, user1, 1
+    ) == _count_link_endpoint_queries(user1_client, user1, 10)
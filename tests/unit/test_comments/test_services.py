@@ -9,8 +9,8 @@ from comments.services.common import create_comment, soft_delete_comment
 from comments.services.key_factors.common import (
     key_factor_vote,
     create_key_factors,
-    calculate_freshness_votes_decay,
-    calculate_freshness_base_rate,
+    update_key_factors_freshness,
+    update_all_key_factors_freshness,
 )
 from comments.services.notifications import notify_mentioned_users
 from posts.models import Post, PostUserSnapshot
@@ -236,6 +236,22 @@ def test_soft_delete_comment(user1, user2, post):
     assert post.comment_count == 2
 
 
+def test_children_count(user1, post):
+    root = create_comment(user=user1, on_post=post, text="Root")
+    reply = create_comment(user=user1, on_post=post, text="Reply", parent=root)
+    create_comment(user=user1, on_post=post, text="Reply 2", parent=root)
+    create_comment(user=user1, on_post=post, text="Nested", parent=reply)
+
+    root.refresh_from_db()
+    reply.refresh_from_db()
+    assert root.children_count == 2
+    assert reply.children_count == 1
+
+    soft_delete_comment(reply)
+    root.refresh_from_db()
+    assert root.children_count == 1
+
+
 def test_create_key_factors__limit_validation(user1, user2, post):
     c1 = factory_comment(author=user1, on_post=post)
     c2 = factory_comment(author=user1, on_post=post)
@@ -325,9 +341,19 @@ def test_calculate_freshness_driver(user1, post):
     # ((0.967 * 1 + 0.785 * 5 + 0.616 * 2) + 2 * max(0, 3 - (0.967 + 0.785 + 0.616)))
     # / max((0.967 + 0.785 + 0.616), 3)
 
-    assert calculate_freshness_votes_decay(
-        kf, list(kf.votes.all()), 5
-    ) == pytest.approx(2.463, abs=0.001)
+    assert update_key_factors_freshness([kf.id])[kf.id] == pytest.approx(
+        2.463, abs=0.001
+    )
+    kf.refresh_from_db()
+    assert kf.freshness == pytest.approx(2.463, abs=0.001)
+
+    # Votes keep decaying over time, half-life is now 130 / 5 days
+    # ((0.438 * 1 + 0.373 * 5 + 0.309 * 2) + 2 * (3 - (0.438 + 0.373 + 0.309))) / 3
+    with freeze_time("2025-10-30"):
+        assert update_all_key_factors_freshness(batch_size=1) == 1
+
+    kf.refresh_from_db()
+    assert kf.freshness == pytest.approx(2.227, abs=0.001)
 
 
 @freeze_time("2025-09-30")
@@ -373,11 +399,9 @@ def test_base_rate_freshness_ignores_time_decay(user1, post):
             vote_type=KeyFactorVote.VoteType.DIRECTION,
         )
 
-    votes = list(kf.votes.all())
-    assert len(votes) == 3
-
-    freshness = calculate_freshness_base_rate(kf, votes)
-    assert freshness == pytest.approx(1.666, abs=0.001)
+    assert update_key_factors_freshness([kf.id])[kf.id] == pytest.approx(
+        1.666, abs=0.001
+    )
 
 
 def test_bot_cannot_post_public_comments(post):
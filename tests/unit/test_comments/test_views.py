@@ -256,6 +256,28 @@ def test_get_comments_feed_permissions(user1, user2):
     }
 
 
+def test_get_comments_feed_deleted_with_live_replies(user2):
+    post = factory_post(author=user2)
+
+    deleted_root = factory_comment(author=user2, on_post=post, is_soft_deleted=True)
+    reply = factory_comment(author=user2, on_post=post, parent=deleted_root)
+    deleted_leaf = factory_comment(author=user2, on_post=post, is_soft_deleted=True)
+    factory_comment(
+        author=user2, on_post=post, parent=deleted_leaf, is_soft_deleted=True
+    )
+
+    assert {c.pk for c in get_comments_feed(Comment.objects.all(), post=post)} == {
+        deleted_root.pk,
+        reply.pk,
+    }
+
+    # Once the last live reply is gone, the deleted root is hidden too
+    reply.is_soft_deleted = True
+    reply.save(update_fields=["is_soft_deleted"])
+
+    assert not get_comments_feed(Comment.objects.all(), post=post).exists()
+
+
 def test_upvote_own_comment(user1, user2, user2_client, user1_client):
     post = factory_post(author=user1)
     user1_comment = factory_comment(author=user1, on_post=post)
@@ -710,6 +732,10 @@ class TestKeyFactorVoting:
         assert response.status_code == 200
         assert response.data["count"] == 2
 
+        # Fresh votes: (1 + 5 + 2 * (3 - 2)) / 3
+        kf.refresh_from_db()
+        assert kf.freshness == pytest.approx(2.666, abs=0.001)
+
     def test_vote_news(self, user1, post, user2_client, user1_client):
         comment = factory_comment(author=user1, on_post=post)
         kf = factory_key_factor(comment=comment, news=G(KeyFactorNews))
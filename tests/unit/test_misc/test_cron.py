@@ -0,0 +1,156 @@
+from datetime import timedelta
+from io import StringIO
+
+import dramatiq
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from dramatiq.middleware import SkipMessage
+
+from misc.models import CronJobRun
+from misc.services.cron import (
+    CronJobTracker,
+    get_cron_job_stats,
+    track_cron_job,
+)
+from users.models import User
+from utils.dramatiq import CronJobTelemetryMiddleware
+
+
+@dramatiq.actor
+def cron_test_actor():
+    pass
+
+
+def test_track_cron_job_success():
+    @track_cron_job("test_success")
+    def job():
+        User.objects.count()
+        User.objects.count()
+
+        return 5
+
+    assert job() == 5
+
+    run = CronJobRun.objects.get(job_id="test_success")
+    assert run.status == CronJobRun.Status.SUCCESS
+    assert run.db_queries == 2
+    assert run.rows_processed == 5
+    assert run.duration > 0
+
+
+def test_track_cron_job_failure():
+    @track_cron_job("test_failure")
+    def job():
+        raise ValueError("Boom")
+
+    with pytest.raises(ValueError):
+        job()
+
+    run = CronJobRun.objects.get(job_id="test_failure")
+    assert run.status == CronJobRun.Status.FAILED
+    assert "ValueError: Boom" in run.error
+
+    # Lock is released after a failed run
+    with pytest.raises(ValueError):
+        job()
+    assert (
+        CronJobRun.objects.filter(
+            job_id="test_failure", status=CronJobRun.Status.FAILED
+        ).count()
+        == 2
+    )
+
+
+def test_track_cron_job_skips_overlapping_runs():
+    calls = []
+
+    @track_cron_job("test_overlap")
+    def job():
+        calls.append(1)
+
+    running = CronJobTracker("test_overlap")
+    assert running.start()
+
+    job()
+    assert not calls
+    assert (
+        CronJobRun.objects.get(job_id="test_overlap").status
+        == CronJobRun.Status.SKIPPED
+    )
+
+    running.finish()
+    job()
+    assert calls == [1]
+
+
+def test_cron_job_telemetry_middleware():
+    middleware = CronJobTelemetryMiddleware()
+    message = cron_test_actor.message_with_options(cron_job_id="test_actor")
+
+    middleware.before_process_message(None, message)
+    # Overlapping message is skipped
+    overlapping = cron_test_actor.message_with_options(cron_job_id="test_actor")
+    with pytest.raises(SkipMessage):
+        middleware.before_process_message(None, overlapping)
+    middleware.after_skip_message(None, overlapping)
+
+    User.objects.count()
+    middleware.after_process_message(None, message, result=None)
+
+    skipped, success = CronJobRun.objects.filter(job_id="test_actor").order_by("id")
+    assert skipped.status == CronJobRun.Status.SKIPPED
+    assert success.status == CronJobRun.Status.SUCCESS
+    assert success.db_queries > 0
+
+    # Regular messages are not tracked
+    regular = cron_test_actor.message()
+    middleware.before_process_message(None, regular)
+    middleware.after_process_message(None, regular, result=None)
+    assert CronJobRun.objects.count() == 2
+
+
+def test_get_cron_job_stats():
+    now = timezone.now()
+    CronJobRun.objects.bulk_create(
+        [
+            CronJobRun(
+                job_id="test_stats",
+                status=CronJobRun.Status.SUCCESS,
+                duration=duration,
+                db_queries=10,
+                started_at=now,
+            )
+            for duration in range(1, 101)
+        ]
+        + [
+            CronJobRun(
+                job_id="test_stats",
+                status=CronJobRun.Status.SKIPPED,
+                duration=0,
+                started_at=now,
+            ),
+            # Outside of the time window
+            CronJobRun(
+                job_id="test_stats",
+                status=CronJobRun.Status.SUCCESS,
+                duration=1000,
+                started_at=now - timedelta(days=30),
+            ),
+        ]
+    )
+
+    (stats,) = get_cron_job_stats(now - timedelta(days=7))
+
+    assert stats["job_id"] == "test_stats"
+    assert stats["runs"] == 101
+    assert stats["skipped"] == 1
+    assert stats["failed"] == 0
+    assert stats["p50"] == pytest.approx(50.5)
+    assert stats["p95"] == pytest.approx(95.05)
+    assert stats["max"] == 100
+    assert stats["avg_queries"] == 10
+
+    out = StringIO()
+    call_command("cron_job_stats", stdout=out)
+    assert "test_stats" in out.getvalue()
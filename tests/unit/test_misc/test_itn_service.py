@@ -1,9 +1,20 @@
 import datetime
 
+import pytest
+from django.utils import timezone
 from django.utils.timezone import make_aware
 
-from misc.services.itn import assign_article_clusters
+from misc.models import ITNArticle, ITNArticleCluster, PostArticle
+from misc.services.itn import (
+    assign_article_clusters,
+    generate_related_posts_for_article,
+    generate_related_posts_for_articles,
+    post_vectors_matrix,
+)
+from questions.models import Question
 from tests.unit.test_misc.factories import factory_itn_article
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_questions.factories import create_question
 
 
 def _article(vector, created_at, **kwargs):
@@ -58,3 +69,122 @@ def test_assign_article_clusters_skips_already_clustered_and_unembedded():
     unembedded.refresh_from_db()
     assert clustered.cluster_id == 999
     assert unembedded.cluster_id is None
+
+
+def test_assign_article_clusters_is_incremental():
+    now = timezone.now()
+    fresh = factory_itn_article(
+        embedding_vector=[1, 0, 0], created_at=now - datetime.timedelta(days=1)
+    )
+    stale = factory_itn_article(
+        embedding_vector=[0, 1, 0], created_at=now - datetime.timedelta(days=5)
+    )
+    assign_article_clusters()
+
+    assert set(ITNArticleCluster.objects.values_list("pk", flat=True)) == {
+        fresh.pk,
+        stale.pk,
+    }
+
+    # Next run only picks up the new articles
+    fresh_duplicate = factory_itn_article(embedding_vector=[10, 1, 0], created_at=now)
+    stale_duplicate = factory_itn_article(embedding_vector=[0, 10, 1], created_at=now)
+    assign_article_clusters()
+
+    fresh_duplicate.refresh_from_db()
+    stale_duplicate.refresh_from_db()
+
+    assert fresh_duplicate.cluster_id == fresh.pk
+    # Stale clusters no longer absorb new coverage
+    assert stale_duplicate.cluster_id == stale_duplicate.pk
+    assert ITNArticleCluster.objects.get(pk=fresh.pk).last_article_at == now
+
+
+def test_assign_article_clusters_failed_batch(mocker):
+    first = _article([1, 0, 0], (2025, 4, 1))
+    second = _article([0, 1, 0], (2025, 4, 2))
+
+    bulk_update = ITNArticle.objects.bulk_update
+    calls = []
+
+    def fail_second_batch(*args, **kwargs):
+        calls.append(args)
+
+        if len(calls) > 1:
+            raise ValueError()
+
+        return bulk_update(*args, **kwargs)
+
+    mocker.patch.object(ITNArticle.objects, "bulk_update", fail_second_batch)
+
+    with pytest.raises(ValueError):
+        assign_article_clusters(batch_size=1)
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+
+    # Committed batches are consistent, the failed one is picked up by the next run
+    assert first.cluster_id == first.pk
+    assert second.cluster_id is None
+    assert set(ITNArticleCluster.objects.values_list("pk", flat=True)) == {first.pk}
+
+
+def _question_post(vector):
+    return factory_post(
+        question=create_question(question_type=Question.QuestionType.BINARY),
+        embedding_vector=vector,
+    )
+
+
+def test_generate_related_posts_for_articles_matches_sql_scan():
+    same = _question_post([1, 0, 0])
+    close = _question_post([1, 1, 0])  # ~0.29 cosine distance
+    _question_post([0, 0, 1])  # orthogonal, too far
+    _question_post([0, 0, 0])  # zero vector never matches
+
+    articles = [
+        _article([2, 0, 0], (2025, 4, 1)),
+        _article([0, 1, 0], (2025, 4, 2)),
+    ]
+
+    with post_vectors_matrix() as (post_ids, path):
+        generate_related_posts_for_articles([a.pk for a in articles], post_ids, path)
+
+    batched = {
+        (pa.article_id, pa.post_id): pa.distance for pa in PostArticle.objects.all()
+    }
+
+    PostArticle.objects.all().delete()
+    for article in articles:
+        generate_related_posts_for_article(article)
+
+    scanned = {
+        (pa.article_id, pa.post_id): pa.distance for pa in PostArticle.objects.all()
+    }
+
+    assert (
+        set(batched)
+        == set(scanned)
+        == {
+            (articles[0].pk, same.pk),
+            (articles[0].pk, close.pk),
+            (articles[1].pk, close.pk),
+        }
+    )
+    for key, distance in scanned.items():
+        assert batched[key] == pytest.approx(distance, abs=1e-6)
+
+
+def test_generate_related_posts_for_articles_skips_bad_articles(caplog):
+    post = _question_post([1, 0, 0])
+    good = _article([1, 0, 0], (2025, 4, 1))
+    # Embedding of a different model fails the matrix product
+    bad = _article([1, 0, 0, 0], (2025, 4, 2))
+
+    with post_vectors_matrix() as (post_ids, path):
+        generate_related_posts_for_articles([good.pk, bad.pk], post_ids, path)
+
+    assert set(PostArticle.objects.values_list("article_id", "post_id")) == {
+        (good.pk, post.pk)
+    }
+    assert f"Failed to match ITN article {bad.pk}" in caplog.text
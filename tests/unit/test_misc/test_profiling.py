@@ -0,0 +1,100 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from misc.services.profiling import (
+    REPEATED_QUERY_THRESHOLD,
+    RequestProfiler,
+    get_endpoint_stats,
+    get_query_shape,
+    reset_endpoint_stats,
+)
+from tests.unit.test_posts.factories import factory_post
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def endpoint_stats():
+    reset_endpoint_stats()
+
+    yield
+
+    reset_endpoint_stats()
+
+
+def test_get_query_shape():
+    assert get_query_shape(
+        """
+        SELECT * FROM "users_user"
+        WHERE "id" IN (%s, %s, %s) AND "username" = 'admin' AND "karma" > 10
+        """
+    ) == (
+        'SELECT * FROM "users_user" WHERE "id" IN (%s, ...) '
+        'AND "username" = ? AND "karma" > ?'
+    )
+
+
+def test_request_profiler(user1):
+    cache.set("test_profiling:hit", 1)
+
+    profiler = RequestProfiler()
+    profiler.start()
+
+    for _ in range(REPEATED_QUERY_THRESHOLD):
+        User.objects.get(pk=user1.pk)
+
+    User.objects.count()
+    cache.get("test_profiling:hit")
+    cache.get("test_profiling:miss", "default")
+    cache.get_many(["test_profiling:hit", "test_profiling:miss"])
+
+    profiler.finish("GET test-view")
+
+    # Tracking is stopped once the request is finished
+    User.objects.count()
+    cache.get("test_profiling:hit")
+
+    (stats,) = get_endpoint_stats()
+
+    assert stats["view_name"] == "GET test-view"
+    assert stats["requests"] == 1
+    assert stats["avg_queries"] == REPEATED_QUERY_THRESHOLD + 1
+    assert stats["db_time"] > 0
+    assert stats["avg_latency"] >= stats["avg_db_time"]
+    assert stats["cache_hit_ratio"] == 0.5
+
+    (repeated_query,) = stats["repeated_queries"]
+    assert repeated_query["executions_per_request"] == REPEATED_QUERY_THRESHOLD
+    assert repeated_query["sql"].startswith('SELECT "users_user"."id"')
+
+    cache.delete("test_profiling:hit")
+
+
+def test_profiling_middleware(settings, anon_client):
+    settings.PROFILING_SAMPLE_RATE = 1
+    settings.MIDDLEWARE = [
+        "utils.middlewares.ProfilingMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+    factory_post()
+
+    for _ in range(2):
+        assert anon_client.get(reverse("post-list")).status_code == 200
+
+    (stats,) = get_endpoint_stats()
+
+    assert stats["view_name"] == "GET post-list"
+    assert stats["requests"] == 2
+    assert stats["avg_queries"] > 0
+
+    out = StringIO()
+    call_command("endpoint_stats", stdout=out)
+    assert "GET post-list" in out.getvalue()
+
+    settings.PROFILING_SAMPLE_RATE = 0
+    anon_client.get(reverse("post-list"))
+
+    assert get_endpoint_stats()[0]["requests"] == 2
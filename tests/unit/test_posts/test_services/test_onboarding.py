@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+import dramatiq
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from comments.models import KeyFactorDriver
+from posts.services.onboarding import (
+    ONBOARDING_FEED_CACHE_KEY,
+    ONBOARDING_FEED_CACHE_VERSION,
+    ONBOARDING_PROJECT_ID,
+    get_materialized_onboarding_feed,
+    invalidate_onboarding_feed,
+)
+from posts.services.common import soft_delete_post
+from projects.models import Project
+from questions.models import Question
+from tests.unit.test_comments.factories import factory_comment, factory_key_factor
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_projects.factories import factory_project
+from tests.unit.test_questions.factories import create_question
+
+
+def create_onboarding_topics(categories: int = 4, posts_per_category: int = 2):
+    """
+    Populates the learning project with binary posts spread across categories,
+    each category having a single post with key factors
+    """
+
+    now = timezone.now()
+    learning_project = factory_project(
+        id=ONBOARDING_PROJECT_ID, type=Project.ProjectTypes.TOURNAMENT
+    )
+    posts = []
+
+    for idx in range(categories):
+        category = factory_project(
+            type=Project.ProjectTypes.CATEGORY, name=f"Category {idx}"
+        )
+
+        for post_idx in range(posts_per_category):
+            post = factory_post(
+                question=create_question(
+                    question_type=Question.QuestionType.BINARY,
+                    open_time=now - timedelta(days=1),
+                    scheduled_close_time=now + timedelta(days=30),
+                ),
+                default_project=learning_project,
+                projects=[category],
+                forecasts_count=1,
+                open_time=now - timedelta(days=1),
+                scheduled_close_time=now + timedelta(days=30),
+            )
+            if post_idx == 0:
+                factory_key_factor(
+                    comment=factory_comment(on_post=post),
+                    driver=KeyFactorDriver.objects.create(
+                        text="Driver", impact_direction=1
+                    ),
+                )
+            posts.append(post)
+
+    return posts
+
+
+@pytest.fixture(autouse=True)
+def clear_onboarding_feed_cache():
+    cache.delete(ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION)
+    yield
+    cache.delete(ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION)
+
+
+def test_get_materialized_onboarding_feed(django_assert_num_queries):
+    posts = create_onboarding_topics()
+
+    feed = get_materialized_onboarding_feed()
+
+    assert len(feed["topics"]) == 4
+    assert set(feed["post_ids"]) == {post.id for post in posts}
+    assert [p["id"] for p in feed["posts"]] == feed["post_ids"]
+
+    # Served from the materialized entry without touching the database
+    with django_assert_num_queries(0):
+        assert get_materialized_onboarding_feed() == feed
+
+
+def test_invalidate_onboarding_feed(broker, django_capture_on_commit_callbacks):
+    posts = create_onboarding_topics(categories=1)
+    unrelated_post = factory_post(
+        question=create_question(question_type=Question.QuestionType.BINARY)
+    )
+    feed = get_materialized_onboarding_feed()
+
+    # Posts outside the feed keep the materialized entry
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_onboarding_feed([unrelated_post])
+    assert (
+        cache.get(ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION)
+        == feed
+    )
+    assert not broker.queues["default"].qsize()
+
+    # Featured post is removed, so the entry is dropped and rebuilt in background,
+    # but only once the removal is committed
+    with django_capture_on_commit_callbacks(execute=True):
+        soft_delete_post(posts[0])
+
+        assert (
+            cache.get(ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION)
+            == feed
+        )
+        assert not broker.queues["default"].qsize()
+
+    assert (
+        cache.get(ONBOARDING_FEED_CACHE_KEY, version=ONBOARDING_FEED_CACHE_VERSION)
+        is None
+    )
+    assert "warm_cache_onboarding_feed" in [
+        dramatiq.Message.decode(message).actor_name
+        for message in broker.queues["default"].queue
+    ]
+
+    assert posts[0].id not in get_materialized_onboarding_feed()["post_ids"]
+
+
+def test_onboarding_feed_api_view(anon_client):
+    create_onboarding_topics()
+
+    response = anon_client.get(reverse("post-onboarding-feed"))
+
+    assert response.status_code == 200
+    assert len(response.data["topics"]) == 4
+    assert len(response.data["posts"]) == 8
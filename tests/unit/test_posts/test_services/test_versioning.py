@@ -1,11 +1,42 @@
+import json
 from unittest.mock import patch, MagicMock
 
-from django.test import override_settings
-
-from posts.services.versioning import PostVersionService
+import pytest
+from django_redis import get_redis_connection
+from freezegun import freeze_time
+
+from posts.models import PostVersion
+from posts.services.versioning import (
+    PostVersionService,
+    S3PostVersionStorage,
+    PENDING_SNAPSHOTS_KEY,
+    SNAPSHOTS_SCHEDULED_KEY,
+)
+from posts.tasks import run_post_generate_history_snapshots
 from questions.models import Question
 from tests.unit.test_posts.factories import factory_post
 from tests.unit.test_questions.factories import create_question
+from tests.unit.test_users.factories import factory_user
+
+
+@pytest.fixture()
+def storage_path(tmp_path, settings):
+    settings.POST_VERSION_HISTORY_LOCAL_PATH = str(tmp_path)
+    settings.AWS_STORAGE_BUCKET_POST_VERSION_HISTORY = None
+
+    redis = get_redis_connection("default")
+    redis.delete(PENDING_SNAPSHOTS_KEY, SNAPSHOTS_SCHEDULED_KEY)
+
+    yield tmp_path
+
+    redis.delete(PENDING_SNAPSHOTS_KEY, SNAPSHOTS_SCHEDULED_KEY)
+
+
+def get_uploaded_snapshots(storage_path, post_id: int) -> list[dict]:
+    return [
+        json.loads(path.read_text())
+        for path in sorted((storage_path / "post_versions" / str(post_id)).iterdir())
+    ]
 
 
 class TestPostVersionService:
@@ -23,73 +54,92 @@ class TestPostVersionService:
         assert snapshot["question"]["title"] == "Test Question"
         assert snapshot["question"]["type"] == "binary"
 
-    @override_settings(AWS_STORAGE_BUCKET_POST_VERSION_HISTORY="test-bucket")
-    @patch("posts.services.versioning.get_boto_client")
-    def test_generate_and_upload_enabled(self, mock_get_client):
-        mock_s3 = MagicMock()
-        mock_get_client.return_value = mock_s3
-        # Mock list_objects_v2 to return empty so it proceeds to upload
-        mock_s3.list_objects_v2.return_value = {}
+    def test_generate_and_upload_disabled(self, settings):
+        settings.POST_VERSION_HISTORY_LOCAL_PATH = None
+        settings.AWS_STORAGE_BUCKET_POST_VERSION_HISTORY = None
 
         question = create_question(question_type=Question.QuestionType.BINARY)
         post = factory_post(question=question)
 
         PostVersionService.generate_and_upload(post)
 
-        assert mock_s3.put_object.called
-        call_args = mock_s3.put_object.call_args[1]
-        assert call_args["Bucket"] == "test-bucket"
-        assert f"post_versions/{post.id}/" in call_args["Key"]
+        assert not PostVersion.objects.exists()
 
-    @override_settings(AWS_STORAGE_BUCKET_POST_VERSION_HISTORY=None)
-    @patch("posts.services.versioning.get_boto_client")
-    def test_generate_and_upload_disabled(self, mock_get_client):
+    def test_generate_and_upload_deduplication(self, storage_path):
         question = create_question(question_type=Question.QuestionType.BINARY)
         post = factory_post(question=question)
 
-        PostVersionService.generate_and_upload(post)
+        # 1. First upload (no existing snapshot)
+        with freeze_time("2025-01-01"):
+            PostVersionService.generate_and_upload(post)
+
+        snapshots = get_uploaded_snapshots(storage_path, post.id)
+        assert len(snapshots) == 1
+        assert snapshots[0]["id"] == post.id
+        assert post.latest_version.snapshot_key == (
+            f"post_versions/{post.id}/1735689600000.json"
+        )
 
-        assert not mock_get_client.called
+        # 2. Second upload (same content) is compared against the stored hash
+        with freeze_time("2025-01-02"):
+            PostVersionService.generate_and_upload(post)
 
-    @override_settings(AWS_STORAGE_BUCKET_POST_VERSION_HISTORY="test-bucket")
-    @patch("posts.services.versioning.get_boto_client")
-    def test_generate_and_upload_deduplication(self, mock_get_client):
-        mock_s3 = MagicMock()
-        mock_get_client.return_value = mock_s3
+        assert len(get_uploaded_snapshots(storage_path, post.id)) == 1
 
-        question = create_question(question_type=Question.QuestionType.BINARY)
-        post = factory_post(question=question)
+        # 3. Third upload (changed content)
+        post.title = "New Title"
+        post.save()
 
-        # 1. First upload (no existing snapshot)
-        # Mock list_objects_v2 to return empty
-        mock_s3.list_objects_v2.return_value = {}
+        with freeze_time("2025-01-03"):
+            PostVersionService.generate_and_upload(post)
 
-        PostVersionService.generate_and_upload(post)
-        assert mock_s3.put_object.call_count == 1
+        snapshots = get_uploaded_snapshots(storage_path, post.id)
+        assert len(snapshots) == 2
+        assert snapshots[-1]["title"] == "New Title"
 
-        # 2. Second upload (same content)
-        # Mock list_objects_v2 to return the uploaded file
-        # And get_object to return the content of the first snapshot
+    def test_schedule_snapshot_coalesces_edits(self, storage_path, broker):
+        editor_1 = factory_user()
+        editor_2 = factory_user()
+        post_1 = factory_post(
+            question=create_question(question_type=Question.QuestionType.BINARY)
+        )
+        post_2 = factory_post(
+            question=create_question(question_type=Question.QuestionType.BINARY)
+        )
 
-        # Capture the uploaded content from the first call
-        call_args = mock_s3.put_object.call_args[1]
-        uploaded_body = call_args["Body"]  # This is a JSON string
+        PostVersionService.schedule_snapshot(post_1.id, editor_1.id)
+        PostVersionService.schedule_snapshot(post_2.id, None)
+        PostVersionService.schedule_snapshot(post_1.id, editor_2.id)
 
-        mock_s3.list_objects_v2.return_value = {"Contents": [{"Key": call_args["Key"]}]}
-        mock_s3.get_object.return_value = {
-            "Body": MagicMock(read=lambda: uploaded_body.encode("utf-8"))
-        }
+        # A single delayed task is enqueued for the whole burst
+        assert broker.queues["default.DQ"].qsize() == 1
 
-        # Reset put_object mock to verify it's NOT called
-        mock_s3.put_object.reset_mock()
+        run_post_generate_history_snapshots()
 
-        PostVersionService.generate_and_upload(post)
-        assert mock_s3.put_object.call_count == 0
+        snapshots = get_uploaded_snapshots(storage_path, post_1.id)
+        assert len(snapshots) == 1
+        assert snapshots[0]["updated_by_user_id"] == editor_2.id
+        assert len(get_uploaded_snapshots(storage_path, post_2.id)) == 1
+        assert not PostVersionService.pop_pending_snapshots()
 
-        # 3. Third upload (changed content)
-        # Change title
-        post.title = "New Title"
-        post.save()
+        # Next edit schedules a new task
+        PostVersionService.schedule_snapshot(post_1.id, editor_1.id)
+        assert broker.queues["default.DQ"].qsize() == 2
 
-        PostVersionService.generate_and_upload(post)
-        assert mock_s3.put_object.call_count == 1
+    @patch("posts.services.versioning.get_boto_client")
+    def test_s3_storage_put_many(self, mock_get_client):
+        mock_s3 = MagicMock()
+        mock_get_client.return_value = mock_s3
+
+        S3PostVersionStorage("test-bucket").put_many(
+            {f"post_versions/{idx}/1.json": "{}" for idx in range(3)}
+        )
+
+        assert mock_s3.put_object.call_count == 3
+        assert {call.kwargs["Key"] for call in mock_s3.put_object.call_args_list} == {
+            f"post_versions/{idx}/1.json" for idx in range(3)
+        }
+        assert all(
+            call.kwargs["Bucket"] == "test-bucket"
+            for call in mock_s3.put_object.call_args_list
+        )
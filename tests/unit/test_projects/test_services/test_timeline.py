@@ -1,18 +1,43 @@
 from datetime import timedelta
 
+import pytest
+from django.contrib.admin import site
+from django.test import RequestFactory
 from django.utils import timezone
+from freezegun import freeze_time
 
+from posts.admin import PostAdmin
 from posts.models import Post
-from projects.services.common import (
+from projects.models import Project, ProjectTimeline
+from projects.services.timeline import (
+    PROJECT_TIMELINE_MAX_AGE,
     get_project_timeline_data,
     get_timeline_data_for_projects,
 )
+from projects.tasks import refresh_projects_timeline_task
+from questions.admin import QuestionAdmin
 from questions.models import Question
+from questions.services.lifecycle import resolve_question
 from tests.unit.test_posts.factories import factory_post
 from tests.unit.test_projects.factories import factory_project
 from tests.unit.test_questions.factories import create_question
 
 
+@pytest.fixture()
+def refresh_timeline(mocker, django_capture_on_commit_callbacks):
+    """
+    Runs scheduled timeline refreshes in place, once the callback block exits
+    """
+
+    mocker.patch.object(
+        refresh_projects_timeline_task,
+        "send",
+        side_effect=refresh_projects_timeline_task.fn,
+    )
+
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
 def test_get_project_timeline_data(user1):
     project = factory_project()
     now = timezone.now()
@@ -98,8 +123,12 @@ def test_get_timeline_data_for_projects(user1, django_assert_num_queries):
         ),
     )
 
-    # Call function and ensure queries count
-    with django_assert_num_queries(4):
+    # Missing timelines are calculated with a single aggregate query
+    with django_assert_num_queries(3):
+        get_timeline_data_for_projects([project1.pk, project2.pk])
+
+    # Stored timelines are read with a single query
+    with django_assert_num_queries(1):
         data = get_timeline_data_for_projects([project1.pk, project2.pk])
 
     # Check Project 1 Data
@@ -114,3 +143,121 @@ def test_get_timeline_data_for_projects(user1, django_assert_num_queries):
     # post3 is resolved, but post2 is not
     assert not p2_data["all_questions_resolved"]
     assert p2_data["latest_actual_resolve_time"] == post3.question.actual_resolve_time
+
+
+def test_timeline_refreshed_on_question_lifecycle(user1, refresh_timeline):
+    project = factory_project(type=Project.ProjectTypes.TOURNAMENT)
+    now = timezone.now()
+
+    question = create_question(
+        question_type=Question.QuestionType.BINARY,
+        scheduled_close_time=now - timedelta(days=1),
+        scheduled_resolve_time=now + timedelta(days=1),
+    )
+    factory_post(author=user1, default_project=project, question=question)
+
+    data = get_project_timeline_data(project)
+    assert not data["all_questions_resolved"]
+    assert data["latest_actual_resolve_time"] is None
+
+    with refresh_timeline():
+        resolve_question(question, "yes", now)
+
+    data = get_project_timeline_data(project)
+    assert data["all_questions_resolved"]
+    assert data["latest_actual_resolve_time"] == now
+
+    # Changing project dates invalidates the stored timeline
+    project.close_date = now - timedelta(days=2)
+    project.save()
+
+    data = get_project_timeline_data(project)
+    assert data["latest_actual_resolve_time"] is None
+    assert ProjectTimeline.objects.get(project=project).project_close_date == (
+        project.close_date
+    )
+
+
+def test_timeline_refresh_skips_projects_without_timeline(user1, refresh_timeline):
+    tournament = factory_project(type=Project.ProjectTypes.TOURNAMENT)
+    category = factory_project(type=Project.ProjectTypes.CATEGORY)
+    question = create_question(
+        question_type=Question.QuestionType.BINARY,
+        scheduled_close_time=timezone.now() - timedelta(days=1),
+    )
+    factory_post(
+        author=user1, default_project=tournament, projects=[category], question=question
+    )
+
+    with refresh_timeline():
+        resolve_question(question, "yes", timezone.now())
+
+    assert list(ProjectTimeline.objects.values_list("project_id", flat=True)) == [
+        tournament.pk
+    ]
+
+
+def test_timeline_refreshed_on_admin_changes(user1, user_admin, refresh_timeline):
+    request = RequestFactory().post("/")
+    request.user = user_admin
+    old_project = factory_project(type=Project.ProjectTypes.TOURNAMENT)
+    new_project = factory_project(type=Project.ProjectTypes.TOURNAMENT)
+    question = create_question(
+        question_type=Question.QuestionType.BINARY,
+        scheduled_resolve_time=timezone.now() + timedelta(days=10),
+    )
+    post = factory_post(author=user1, default_project=old_project, question=question)
+
+    get_timeline_data_for_projects([old_project.pk, new_project.pk])
+
+    # Question dates are edited
+    question.scheduled_resolve_time = timezone.now() + timedelta(days=20)
+
+    with refresh_timeline():
+        QuestionAdmin(Question, site).save_model(request, question, None, True)
+
+    assert (
+        ProjectTimeline.objects.get(project=old_project).latest_scheduled_resolve_time
+        == question.scheduled_resolve_time
+    )
+
+    # Post is moved to another project
+    form = PostAdmin(Post, site).get_form(request, post, fields=["default_project"])(
+        data={"default_project": new_project.pk}, instance=post
+    )
+    assert form.is_valid()
+
+    with refresh_timeline():
+        PostAdmin(Post, site).save_model(request, form.save(commit=False), form, True)
+
+    timelines = ProjectTimeline.objects.in_bulk([old_project.pk, new_project.pk])
+    assert timelines[old_project.pk].latest_scheduled_resolve_time is None
+    assert (
+        timelines[new_project.pk].latest_scheduled_resolve_time
+        == question.scheduled_resolve_time
+    )
+
+
+def test_timeline_expires(user1):
+    project = factory_project(type=Project.ProjectTypes.TOURNAMENT)
+    question = create_question(
+        question_type=Question.QuestionType.BINARY,
+        scheduled_resolve_time=timezone.now() + timedelta(days=10),
+    )
+    factory_post(author=user1, default_project=project, question=question)
+
+    get_project_timeline_data(project)
+
+    # Changed without going through the refresh hooks
+    Question.objects.filter(pk=question.pk).update(
+        scheduled_resolve_time=timezone.now() + timedelta(days=20)
+    )
+
+    data = get_project_timeline_data(project)
+    assert data["latest_scheduled_resolve_time"] == question.scheduled_resolve_time
+
+    with freeze_time(timezone.now() + PROJECT_TIMELINE_MAX_AGE):
+        data = get_project_timeline_data(project)
+
+    question.refresh_from_db()
+    assert data["latest_scheduled_resolve_time"] == question.scheduled_resolve_time
@@ -0,0 +1,166 @@
+import random
+from datetime import date, datetime, timedelta
+
+from freezegun import freeze_time
+
+from questions.management.commands.mark_forecasts_to_autowithdraw import (
+    update_standing_forecasts,
+)
+from posts.models import Post
+from questions.models import Forecast, Question, UserForecastNotification
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_questions.factories import create_question, factory_forecast
+from tests.unit.test_users.factories import factory_user
+from tests.unit.utils import datetime_aware
+
+
+def create_question_with_post(**kwargs) -> Question:
+    question = create_question(question_type=Question.QuestionType.BINARY, **kwargs)
+    factory_post(question=question, curation_status=Post.CurationStatus.APPROVED)
+
+    return question
+
+
+def legacy_autowithdraw_times(
+    forecast: Forecast, expiration_percent: int, now: datetime
+) -> tuple[datetime, datetime]:
+    """
+    Reference row-by-row end_time and notification trigger_time computation
+    the command used before being rewritten as set-based SQL
+    """
+
+    question = forecast.question
+    question_lifetime_ratio = (question.scheduled_close_time - question.open_time) * (
+        expiration_percent / 100
+    )
+    intervals_passed = int((now - forecast.start_time) / question_lifetime_ratio)
+    end_time = max(
+        forecast.start_time + question_lifetime_ratio * (intervals_passed + 1),
+        forecast.start_time + timedelta(days=30),
+        now + timedelta(days=3),
+    )
+
+    if end_time - forecast.start_time > timedelta(weeks=3):
+        trigger_time = end_time - timedelta(weeks=1)
+    else:
+        trigger_time = end_time - timedelta(days=1)
+    trigger_time = max(trigger_time, now + timedelta(days=2))
+    trigger_time = min(trigger_time, question.scheduled_close_time - timedelta(days=1))
+
+    return end_time, trigger_time
+
+
+@freeze_time("2025-06-01 12:00:00")
+def test_update_standing_forecasts_matches_legacy_implementation():
+    rng = random.Random(1)
+    now = datetime_aware(2025, 6, 1, 12)
+
+    users = [
+        factory_user(prediction_expiration_percent=percent)
+        for percent in (10, 25, 3, 50, 100)
+    ]
+    questions = [
+        create_question_with_post(
+            open_time=now - timedelta(days=rng.randint(1, 400), seconds=rng.random()),
+            scheduled_close_time=now
+            + timedelta(days=rng.randint(1, 400), seconds=rng.random()),
+        )
+        for _ in range(10)
+    ]
+
+    expected = {}
+    for question in questions:
+        for user in users:
+            forecast = factory_forecast(
+                author=user,
+                question=question,
+                start_time=question.open_time
+                + (now - question.open_time) * rng.random(),
+            )
+            expected[forecast.id] = legacy_autowithdraw_times(
+                forecast, user.prediction_expiration_percent, now
+            )
+
+    update_standing_forecasts(date(2025, 6, 2), batch_size=7)
+
+    forecasts = Forecast.objects.filter(id__in=expected)
+    notifications = {
+        n.forecast_id: n.trigger_time for n in UserForecastNotification.objects.all()
+    }
+    assert len(notifications) == len(expected)
+
+    # The expiration interval is rounded to microseconds using exact decimal math
+    # rather than binary floats, so results may drift by a few microseconds
+    tolerance = timedelta(milliseconds=1)
+
+    for forecast in forecasts:
+        end_time, trigger_time = expected[forecast.id]
+
+        assert abs(forecast.end_time - end_time) < tolerance
+        assert abs(notifications[forecast.id] - trigger_time) < tolerance
+
+
+@freeze_time("2025-06-01 12:00:00")
+def test_update_standing_forecasts_filters():
+    now = datetime_aware(2025, 6, 1, 12)
+    user = factory_user(prediction_expiration_percent=10)
+    question = create_question_with_post(
+        open_time=now - timedelta(days=100),
+        scheduled_close_time=now + timedelta(days=100),
+    )
+    closed_question = create_question_with_post(
+        open_time=now - timedelta(days=100),
+        scheduled_close_time=now + timedelta(days=100),
+        actual_close_time=now - timedelta(days=1),
+    )
+
+    standing = factory_forecast(
+        author=user, question=question, start_time=now - timedelta(days=10)
+    )
+    # Made after the cut-off date
+    recent = factory_forecast(
+        author=factory_user(prediction_expiration_percent=10),
+        question=question,
+        start_time=now - timedelta(hours=1),
+    )
+    # Author opted out of auto-withdrawal
+    opted_out = factory_forecast(
+        author=factory_user(prediction_expiration_percent=None),
+        question=question,
+        start_time=now - timedelta(days=10),
+    )
+    # Already has an end_time
+    ending = factory_forecast(
+        author=factory_user(prediction_expiration_percent=10),
+        question=question,
+        start_time=now - timedelta(days=10),
+        end_time=now + timedelta(days=5),
+    )
+    on_closed_question = factory_forecast(
+        author=user, question=closed_question, start_time=now - timedelta(days=10)
+    )
+    by_spam_user = factory_forecast(
+        author=factory_user(prediction_expiration_percent=10, is_spam=True),
+        question=question,
+        start_time=now - timedelta(days=10),
+    )
+
+    update_standing_forecasts(date(2025, 6, 1))
+
+    standing.refresh_from_db()
+    assert standing.end_time == now + timedelta(days=20)
+
+    for forecast in (recent, opted_out, on_closed_question, by_spam_user):
+        forecast.refresh_from_db()
+        assert forecast.end_time is None
+
+    ending.refresh_from_db()
+    assert ending.end_time == now + timedelta(days=5)
+
+    assert list(
+        UserForecastNotification.objects.values_list("forecast_id", flat=True)
+    ) == [standing.id]
+
+    # Re-running is a no-op
+    update_standing_forecasts(date(2025, 6, 1))
+    assert UserForecastNotification.objects.count() == 1
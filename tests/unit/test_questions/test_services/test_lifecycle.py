@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import freezegun
 import pytest  # noqa
@@ -7,11 +8,14 @@ from django.utils.timezone import make_aware
 from posts.models import Post
 from posts.services.common import create_post, approve_post
 from questions.constants import QuestionStatus, UnsuccessfulResolutionType
-from questions.jobs import job_close_question
-from questions.models import Question
+from questions.jobs import job_check_cp_revealed, job_close_question
+from questions.models import Question, QuestionLifecycleEvent
 from questions.services.lifecycle import resolve_question, unresolve_question
 from tests.unit.test_posts.factories import factory_post
-from tests.unit.test_questions.factories import create_question
+from tests.unit.test_questions.factories import (
+    create_question,
+    factory_group_of_questions,
+)
 from users.models import User
 
 
@@ -1142,3 +1146,153 @@ class TestResolveConditionalQuestion:
         # conditional branch questions status
         assert question_yes.status == QuestionStatus.CLOSED
         assert question_no.status == QuestionStatus.CLOSED
+
+
+def get_pending_events(question: Question) -> dict[str, datetime]:
+    return dict(
+        question.lifecycle_events.filter(processed_at__isnull=True).values_list(
+            "event_type", "due_time"
+        )
+    )
+
+
+@freezegun.freeze_time("2024-1-1")
+def test_question_lifecycle_events_are_synced_on_save():
+    open_time = make_aware(datetime(2024, 2, 1))
+    close_time = make_aware(datetime(2024, 3, 1))
+    question = create_question(
+        question_type=Question.QuestionType.BINARY,
+        open_time=open_time,
+        scheduled_close_time=close_time,
+        cp_reveal_time=close_time,
+    )
+
+    assert get_pending_events(question) == {
+        QuestionLifecycleEvent.EventType.OPEN: open_time,
+        QuestionLifecycleEvent.EventType.CLOSE: close_time,
+        QuestionLifecycleEvent.EventType.CP_REVEAL: close_time,
+    }
+
+    # Rescheduling
+    question.scheduled_close_time = close_time + timedelta(days=1)
+    question.save(update_fields=["scheduled_close_time"])
+    assert get_pending_events(question)[
+        QuestionLifecycleEvent.EventType.CLOSE
+    ] == close_time + timedelta(days=1)
+
+    # Unrelated updates don't touch events
+    with patch.object(QuestionLifecycleEvent, "sync") as mock_sync:
+        question.save(update_fields=["title"])
+        assert not mock_sync.called
+
+    # Resolved questions don't reveal CP or close anymore
+    question.resolution = "yes"
+    question.actual_close_time = close_time
+    question.save()
+    assert get_pending_events(question) == {
+        QuestionLifecycleEvent.EventType.OPEN: open_time
+    }
+
+
+@freezegun.freeze_time("2024-1-1")
+def test_job_close_question_processes_due_events_in_batch():
+    now = make_aware(datetime(2024, 1, 1))
+    group = factory_group_of_questions()
+    post = factory_post(group_of_questions=group)
+    questions = [
+        create_question(
+            question_type=Question.QuestionType.BINARY,
+            group=group,
+            open_time=now - timedelta(days=10),
+            scheduled_resolve_time=now + timedelta(days=10),
+            scheduled_close_time=now - timedelta(hours=idx + 1),
+        )
+        for idx in range(3)
+    ]
+    not_due = create_question(
+        question_type=Question.QuestionType.BINARY,
+        group=group,
+        open_time=now - timedelta(days=10),
+        scheduled_resolve_time=now + timedelta(days=10),
+        scheduled_close_time=now + timedelta(days=1),
+    )
+    draft = create_question(
+        question_type=Question.QuestionType.BINARY,
+        open_time=now - timedelta(days=10),
+        scheduled_resolve_time=now + timedelta(days=10),
+        scheduled_close_time=now - timedelta(hours=1),
+    )
+    factory_post(question=draft, curation_status=Post.CurationStatus.DRAFT)
+
+    with patch(
+        "posts.services.common.update_global_leaderboard_tags"
+    ) as mock_update_tags:
+        job_close_question()
+
+    # Group post is updated once
+    mock_update_tags.assert_called_once_with(post)
+
+    for question in questions:
+        question.refresh_from_db()
+        assert question.actual_close_time == question.scheduled_close_time
+        assert not get_pending_events(question).get(
+            QuestionLifecycleEvent.EventType.CLOSE
+        )
+        assert (
+            question.lifecycle_events.get(
+                event_type=QuestionLifecycleEvent.EventType.CLOSE
+            ).processed_at
+            == now
+        )
+
+    post.refresh_from_db()
+    assert post.actual_close_time is None
+
+    for question in (not_due, draft):
+        question.refresh_from_db()
+        assert question.actual_close_time is None
+        assert QuestionLifecycleEvent.EventType.CLOSE in get_pending_events(question)
+
+    # Processed events are not picked up again
+    with patch("questions.jobs.close_questions") as mock_close_questions:
+        job_close_question()
+        assert not mock_close_questions.called
+
+
+@freezegun.freeze_time("2024-1-1")
+def test_job_check_cp_revealed_retries_failed_questions():
+    now = make_aware(datetime(2024, 1, 1))
+    questions = []
+    for _ in range(3):
+        question = create_question(
+            question_type=Question.QuestionType.BINARY,
+            open_time=now - timedelta(days=10),
+            scheduled_close_time=now + timedelta(days=10),
+            cp_reveal_time=now - timedelta(hours=1),
+        )
+        factory_post(question=question)
+        questions.append(question)
+
+    failing = questions[1]
+
+    def handle_cp_revealed(question):
+        if question.id == failing.id:
+            raise ValueError("Boom")
+
+    with patch(
+        "questions.services.lifecycle.handle_cp_revealed",
+        side_effect=handle_cp_revealed,
+    ):
+        job_check_cp_revealed()
+
+    for question in questions:
+        question.refresh_from_db()
+
+    assert questions[0].cp_reveal_time_triggered
+    assert questions[2].cp_reveal_time_triggered
+    assert not failing.cp_reveal_time_triggered
+    assert QuestionLifecycleEvent.EventType.CP_REVEAL in get_pending_events(failing)
+
+    with patch("questions.services.lifecycle.handle_cp_revealed") as mock_handle:
+        job_check_cp_revealed()
+        mock_handle.assert_called_once_with(failing)
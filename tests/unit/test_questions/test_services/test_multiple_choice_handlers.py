@@ -8,12 +8,30 @@ from questions.services.multiple_choice_handlers import (
     multiple_choice_delete_options,
     multiple_choice_rename_option,
     multiple_choice_reorder_options,
+    remap_pmfs,
 )
 from tests.unit.test_posts.factories import factory_post
 from tests.unit.utils import datetime_aware as dt
 from users.models import User
 
 
+def test_remap_pmfs():
+    pmfs = [[0.2, 0.3, 0.1, 0.4], [0.5, None, 0.2, 0.3], [None, None, 0.4, 0.6]]
+
+    # Delete "b" and "c", both added to the catch-all option
+    assert remap_pmfs(pmfs, [0, 3, 3, 3], 4) == [
+        [0.2, None, None, 0.8],
+        [0.5, None, None, 0.5],
+        [None, None, None, 1.0],
+    ]
+    # Insert two options before the catch-all option
+    assert remap_pmfs(pmfs, [0, 1, 2, 5], 6) == [
+        [0.2, 0.3, 0.1, None, None, 0.4],
+        [0.5, None, 0.2, None, None, 0.3],
+        [None, None, 0.4, None, None, 0.6],
+    ]
+
+
 @pytest.mark.parametrize(
     "old_option,new_option,expect_success",
     [
@@ -0,0 +1,154 @@
+from bisect import bisect_right
+
+import numpy as np
+import pytest
+
+from questions.services.reshape import CdfReshapePlan, get_cdfs_at, reshape_cdfs
+
+
+def _legacy_spline(xs: list[float], ys: list[float]):
+    """
+    Reference pure-Python "not-a-knot" spline the reshape command used to build
+    for every forecast, kept to assert numerical parity of the vectorized core
+    """
+
+    n_segs = len(xs) - 1
+    widths = [xs[i + 1] - xs[i] for i in range(n_segs)]
+    slopes = [(ys[i + 1] - ys[i]) / widths[i] for i in range(n_segs)]
+
+    size = n_segs + 1
+    mat = [[0.0] * size for _ in range(size)]
+    rhs = [0.0] * size
+    for i in range(1, n_segs):
+        mat[i][i - 1] = widths[i - 1]
+        mat[i][i] = 2 * (widths[i - 1] + widths[i])
+        mat[i][i + 1] = widths[i]
+        rhs[i] = 6 * (slopes[i] - slopes[i - 1])
+    mat[0][0] = widths[1]
+    mat[0][1] = -(widths[0] + widths[1])
+    mat[0][2] = widths[0]
+    mat[n_segs][n_segs - 2] = widths[n_segs - 2]
+    mat[n_segs][n_segs - 1] = -(widths[n_segs - 2] + widths[n_segs - 1])
+    mat[n_segs][n_segs] = widths[n_segs - 1]
+
+    # Dense Gaussian elimination
+    for k in range(size):
+        pivot = mat[k][k]
+        if pivot == 0.0:
+            for r in range(k + 1, size):
+                if mat[r][k] != 0.0:
+                    mat[k], mat[r] = mat[r], mat[k]
+                    rhs[k], rhs[r] = rhs[r], rhs[k]
+                    pivot = mat[k][k]
+                    break
+        inv = 1.0 / pivot
+        for j in range(k, size):
+            mat[k][j] *= inv
+        rhs[k] *= inv
+        for i in range(k + 1, size):
+            factor = mat[i][k]
+            if factor != 0.0:
+                for j in range(k, size):
+                    mat[i][j] -= factor * mat[k][j]
+                rhs[i] -= factor * rhs[k]
+    for i in range(size - 1, -1, -1):
+        acc = rhs[i]
+        for j in range(i + 1, size):
+            acc -= mat[i][j] * rhs[j]
+        rhs[i] = acc
+
+    def get_cdf_at(pt: float) -> float:
+        if pt <= 0:
+            return ys[0]
+        if pt >= 1:
+            return ys[-1]
+        i = bisect_right(xs, pt) - 1
+        width = xs[i + 1] - xs[i]
+        lo_w = (xs[i + 1] - pt) / width
+        hi_w = (pt - xs[i]) / width
+        return (
+            lo_w * ys[i]
+            + hi_w * ys[i + 1]
+            + ((lo_w**3 - lo_w) * width**2 / 6.0) * rhs[i]
+            + ((hi_w**3 - hi_w) * width**2 / 6.0) * rhs[i + 1]
+        )
+
+    return get_cdf_at
+
+
+def _legacy_reshape(cdf: list[float], plan: CdfReshapePlan) -> list[float]:
+    get_cdf_at = _legacy_spline(np.linspace(0, 1, len(cdf)).tolist(), cdf)
+    if plan.bucket_indices is None:
+        return [get_cdf_at(location) for location in plan.locations]
+
+    pmf = [cdf[0]]
+    for i in range(1, len(cdf)):
+        pmf.append(cdf[i] - cdf[i - 1])
+    pmf.append(1 - cdf[-1])
+    inbound_arr = np.array([pmf[index] for index in plan.bucket_indices])
+    prob_below_lower = (
+        get_cdf_at(plan.lower_bound_location)
+        if plan.lower_bound_location is not None
+        else 0
+    )
+    prob_above_upper = (
+        1 - get_cdf_at(plan.upper_bound_location)
+        if plan.upper_bound_location is not None
+        else 0
+    )
+    inbound_arr = (
+        (1 - prob_below_lower - prob_above_upper) * inbound_arr / np.sum(inbound_arr)
+    )
+    new_pmf = [prob_below_lower] + inbound_arr.tolist() + [prob_above_upper]
+    return np.cumsum(new_pmf).tolist()[:-1]
+
+
+def _random_cdf(rng: np.random.Generator, size: int) -> list[float]:
+    steps = rng.random(size + 1) + 0.01
+    cdf = np.cumsum(steps)[:-1] / steps.sum()
+    return (0.001 + 0.998 * cdf).tolist()
+
+
+@pytest.fixture()
+def cdfs():
+    rng = np.random.default_rng(42)
+    return [_random_cdf(rng, 201) for _ in range(30)] + [
+        _random_cdf(rng, 101) for _ in range(5)
+    ]
+
+
+def test_get_cdfs_at_interpolates_grid_points():
+    cdfs = np.array([_random_cdf(np.random.default_rng(1), 201)])
+    locations = np.linspace(0, 1, 201)
+
+    np.testing.assert_allclose(get_cdfs_at(cdfs, locations), cdfs, atol=1e-15)
+
+
+@pytest.mark.parametrize(
+    "plan",
+    [
+        # Range shrink, including locations on the grid
+        CdfReshapePlan(locations=np.linspace(0.2, 0.7, 201)),
+        # Range expansion clamps out of bounds locations to the CDF boundaries
+        CdfReshapePlan(locations=np.linspace(-0.5, 1.5, 201)),
+        # Discrete conversion with both bounds open
+        CdfReshapePlan(
+            bucket_indices=np.arange(10, 100, 9),
+            lower_bound_location=0.045,
+            upper_bound_location=0.905,
+        ),
+        # Discrete conversion with a closed lower bound
+        CdfReshapePlan(
+            bucket_indices=np.arange(1, 100, 3), upper_bound_location=0.4975
+        ),
+    ],
+)
+def test_reshape_cdfs_matches_legacy_implementation(cdfs, plan):
+    reshaped = reshape_cdfs(cdfs, plan)
+
+    assert len(reshaped) == len(cdfs)
+    for cdf, new_cdf in zip(cdfs, reshaped):
+        assert isinstance(new_cdf, list)
+        np.testing.assert_allclose(
+            new_cdf, _legacy_reshape(cdf, plan), rtol=0, atol=1e-12
+        )
@@ -4,6 +4,8 @@ from datetime import timezone as dt_timezone
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from freezegun import freeze_time
 from rest_framework.reverse import reverse
@@ -11,6 +13,7 @@ from rest_framework.reverse import reverse
 from posts.models import Post
 from questions.models import Forecast, Question, UserForecastNotification
 from questions.types import OptionsHistoryType
+from questions.services.forecasts import build_question_forecasts
 from questions.tasks import check_and_schedule_forecast_widrawal_due_notifications
 from tests.unit.test_posts.conftest import *  # noqa
 from tests.unit.test_posts.factories import factory_post
@@ -1024,3 +1027,58 @@ class TestQuestionForecastAutoWithdrawal:
             assert not UserForecastNotification.objects.filter(
                 user=user2, question=question2
             ).exists()
+
+
+def test_questions_community_predictions(
+    user1, user_admin, user_admin_client, question_binary
+):
+    user_admin.is_staff = True
+    user_admin.save()
+
+    question_binary.open_time = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    question_binary.save()
+    Forecast.objects.create(
+        question=question_binary,
+        author=user1,
+        probability_yes=0.7,
+        start_time=datetime(2025, 2, 1, tzinfo=dt_timezone.utc),
+    )
+    build_question_forecasts(question_binary)
+
+    response = user_admin_client.post(
+        reverse("questions-community-predictions"),
+        {
+            "question_ids": [question_binary.id, question_binary.id, 0],
+            "timestamps": [
+                "2025-01-15T00:00:00Z",
+                "2025-03-01T00:00:00Z",
+                "2025-03-01T00:00:00Z",
+            ],
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    (result,) = response.data["results"]
+    assert result["metaculus_id"] == question_binary.id
+    assert result["method"] == question_binary.default_aggregation_method
+    assert result["pmf"] == pytest.approx([0.3, 0.7])
+    assert result["forecaster_count"] == 1
+
+    # Query count doesn't depend on the number of requested pairs
+    query_counts = []
+    for pairs in (1, 20):
+        with CaptureQueriesContext(connection) as ctx:
+            response = user_admin_client.post(
+                reverse("questions-community-predictions"),
+                {
+                    "question_ids": [question_binary.id] * pairs,
+                    "timestamps": ["2025-03-01T00:00:00Z"] * pairs,
+                },
+                format="json",
+            )
+
+        assert len(response.data["results"]) == pairs
+        query_counts.append(len(ctx.captured_queries))
+
+    assert query_counts[0] == query_counts[1]
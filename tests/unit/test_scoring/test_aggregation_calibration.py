@@ -0,0 +1,128 @@
+import pytest
+from django.core.management import call_command
+from freezegun import freeze_time
+
+from projects.models import Project
+from questions.models import AggregateForecast, Question
+from questions.services.lifecycle import resolve_question
+from questions.types import AggregationMethod
+from scoring.models import AggregationCalibration
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_projects.factories import factory_project
+from tests.unit.test_questions.factories import create_question
+from tests.unit.utils import datetime_aware
+from users.services.profile_stats import (
+    get_aggregation_calibration_curve_data,
+    get_calibration_curve_data,
+    update_question_aggregation_calibrations,
+)
+
+
+def create_resolved_question(
+    resolution: str, probabilities: list[float], default_project=None, **kwargs
+) -> Question:
+    question = create_question(
+        question_type=Question.QuestionType.BINARY,
+        resolution=resolution,
+        **{
+            "open_time": datetime_aware(2025, 1, 1),
+            "scheduled_close_time": datetime_aware(2025, 1, 21),
+            "actual_close_time": datetime_aware(2025, 1, 21),
+            "scheduled_resolve_time": datetime_aware(2025, 1, 21),
+            "actual_resolve_time": datetime_aware(2025, 1, 21),
+            **kwargs,
+        },
+    )
+    factory_post(question=question, default_project=default_project)
+
+    for method in (AggregationMethod.RECENCY_WEIGHTED, AggregationMethod.UNWEIGHTED):
+        AggregateForecast.objects.bulk_create(
+            AggregateForecast(
+                question=question,
+                method=method,
+                start_time=datetime_aware(2025, 1, 1 + idx * 4),
+                end_time=(
+                    datetime_aware(2025, 1, 5 + idx * 4)
+                    if idx < len(probabilities) - 1
+                    else None
+                ),
+                forecast_values=[1 - probability, probability],
+            )
+            for idx, probability in enumerate(probabilities)
+        )
+
+    return question
+
+
+@pytest.fixture()
+def questions():
+    return [
+        create_resolved_question("yes", [0.02, 0.55, 0.9, 0.97]),
+        create_resolved_question("no", [0.125, 0.4, 0.6]),
+        create_resolved_question("yes", [0.5, 0.999]),
+        # Excluded from the curve
+        create_resolved_question("no", [0.7], include_bots_in_aggregates=True),
+        create_resolved_question(
+            "yes",
+            [0.3],
+            default_project=factory_project(
+                type=Project.ProjectTypes.TOURNAMENT, default_permission=None
+            ),
+        ),
+        create_resolved_question(
+            "no", [0.2], scheduled_resolve_time=datetime_aware(2025, 3, 1)
+        ),
+        create_resolved_question("annulled", [0.8]),
+    ]
+
+
+@freeze_time("2025-02-01")
+@pytest.mark.parametrize(
+    "aggregation_method",
+    [AggregationMethod.RECENCY_WEIGHTED, AggregationMethod.UNWEIGHTED],
+)
+def test_aggregation_calibration_parity(questions, aggregation_method):
+    call_command("build_aggregation_calibrations")
+
+    assert AggregationCalibration.objects.count() == 12
+
+    curve = get_aggregation_calibration_curve_data(aggregation_method)
+    expected = get_calibration_curve_data(aggregation_method=aggregation_method)
+
+    for point, expected_point in zip(
+        curve["calibration_curve"], expected["calibration_curve"], strict=True
+    ):
+        assert point == pytest.approx(expected_point)
+
+
+@freeze_time("2025-02-01")
+def test_update_question_aggregation_calibrations_unresolve(questions):
+    question = questions[0]
+    update_question_aggregation_calibrations(question)
+
+    calibration = AggregationCalibration.objects.get(
+        question=question, aggregation_method=AggregationMethod.RECENCY_WEIGHTED
+    )
+    assert sum(calibration.counts) == 4
+    assert sum(calibration.resolution_weights) == pytest.approx(1)
+
+    question.resolution = None
+    update_question_aggregation_calibrations(question)
+
+    assert not AggregationCalibration.objects.filter(question=question).exists()
+
+
+@freeze_time("2025-02-01")
+def test_resolve_question_updates_aggregation_calibrations(
+    django_capture_on_commit_callbacks,
+):
+    question = create_resolved_question(None, [0.2, 0.7], actual_resolve_time=None)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resolve_question(question, "yes", datetime_aware(2025, 1, 21))
+
+    calibration = AggregationCalibration.objects.get(
+        question=question, aggregation_method=AggregationMethod.RECENCY_WEIGHTED
+    )
+    assert sum(calibration.counts) == 2
+    assert sum(calibration.resolution_weights) == pytest.approx(1)
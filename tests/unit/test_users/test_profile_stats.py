@@ -0,0 +1,185 @@
+import pytest
+from django_redis import get_redis_connection
+from freezegun import freeze_time
+
+from questions.models import Question
+from scoring.constants import ScoreTypes
+from scoring.models import Score
+from scoring.utils import score_question
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_questions.factories import create_question, factory_forecast
+from tests.unit.test_users.factories import factory_user
+from tests.unit.utils import datetime_aware
+from users.models import UserStats
+from users.services.profile_stats import (
+    PENDING_USER_STATS_KEY,
+    USER_STATS_SCHEDULED_KEY,
+    get_calibration_curve_data,
+    get_forecasting_stats_data,
+    get_score_histogram_data,
+    get_score_scatter_plot_data,
+    generate_question_scores,
+    pop_pending_users_stats,
+    refresh_users_stats,
+    schedule_users_stats_refresh,
+    serialize_user_stats,
+)
+from users.tasks import run_refresh_pending_users_stats
+
+
+@pytest.fixture(autouse=True)
+def pending_users_stats():
+    redis = get_redis_connection("default")
+    redis.delete(PENDING_USER_STATS_KEY, USER_STATS_SCHEDULED_KEY)
+
+    yield
+
+    redis.delete(PENDING_USER_STATS_KEY, USER_STATS_SCHEDULED_KEY)
+
+
+def create_resolved_question(resolution: str, **kwargs) -> Question:
+    question = create_question(
+        question_type=Question.QuestionType.BINARY,
+        open_time=datetime_aware(2025, 1, 1),
+        scheduled_close_time=datetime_aware(2025, 1, 11),
+        actual_close_time=datetime_aware(2025, 1, 11),
+        scheduled_resolve_time=datetime_aware(2025, 1, 11),
+        actual_resolve_time=datetime_aware(2025, 1, 11),
+        resolution_set_time=datetime_aware(2025, 1, 11),
+        resolution=resolution,
+        **kwargs,
+    )
+    factory_post(question=question)
+
+    return question
+
+
+@pytest.fixture()
+def forecaster():
+    user = factory_user()
+
+    for resolution, probabilities in [
+        ("yes", [0.01, 0.6, 0.95]),
+        ("no", [0.3, 0.62, 0.999]),
+        ("yes", [0.125, 0.5]),
+    ]:
+        question = create_resolved_question(resolution)
+
+        for idx, probability_yes in enumerate(probabilities):
+            factory_forecast(
+                author=user,
+                question=question,
+                probability_yes=probability_yes,
+                start_time=datetime_aware(2025, 1, 1 + idx * 3),
+                end_time=(
+                    datetime_aware(2025, 1, 4 + idx * 3)
+                    if idx < len(probabilities) - 1
+                    else None
+                ),
+            )
+
+        Score.objects.create(
+            user=user,
+            question=question,
+            score=10.5 if resolution == "yes" else -60,
+            score_type=ScoreTypes.PEER,
+            edited_at=question.resolution_set_time,
+        )
+
+    # Forecast on an open question
+    open_question = create_question(question_type=Question.QuestionType.BINARY)
+    factory_post(question=open_question)
+    factory_forecast(author=user, question=open_question, probability_yes=0.5)
+
+    return user
+
+
+@freeze_time("2025-02-01")
+def test_refresh_users_stats(forecaster):
+    other_user = factory_user()
+
+    # Zero-duration questions are skipped by the calibration curve
+    zero_duration_question = create_resolved_question("yes")
+    zero_duration_question.open_time = zero_duration_question.actual_close_time
+    zero_duration_question.save()
+    factory_forecast(
+        author=forecaster,
+        question=zero_duration_question,
+        probability_yes=0.6,
+        start_time=datetime_aware(2025, 1, 10),
+    )
+
+    stats, other_stats = refresh_users_stats([forecaster.id, other_user.id])
+    data = serialize_user_stats(forecaster)
+
+    # Materialized stats match the live calculation
+    scores = generate_question_scores(Score.objects.filter(user=forecaster))
+    expected = {
+        **get_score_scatter_plot_data(scores=scores, user=forecaster),
+        **get_score_histogram_data(scores=scores, user=forecaster),
+        **get_forecasting_stats_data(scores=scores, user=forecaster),
+    }
+    for key, value in expected.items():
+        assert data[key] == pytest.approx(value), key
+
+    expected_curve = get_calibration_curve_data(user=forecaster)["calibration_curve"]
+    for point, expected_point in zip(
+        data["calibration_curve"], expected_curve, strict=True
+    ):
+        assert point == pytest.approx(expected_point)
+
+    assert data["forecasts_count"] == 10
+    assert data["questions_predicted_count"] == 5
+    # Forecasts of the open and zero-duration questions aren't calibrated
+    assert sum(stats.calibration_counts) == 8
+
+    assert other_stats.score_count == 0
+    assert other_stats.average_score is None
+    assert sum(other_stats.calibration_counts) == 0
+
+
+@freeze_time("2025-02-01")
+def test_serialize_user_stats_materializes_on_first_access(forecaster):
+    assert not UserStats.objects.filter(user=forecaster).exists()
+
+    data = serialize_user_stats(forecaster)
+
+    assert UserStats.objects.filter(user=forecaster).exists()
+    assert data["score_count"] == 3
+    assert data["average_score"] == pytest.approx(-13)
+
+    # New scores are picked up after the refresh
+    Score.objects.filter(user=forecaster, score__lt=0).delete()
+    refresh_users_stats([forecaster.id])
+
+    assert serialize_user_stats(forecaster)["score_count"] == 2
+
+
+@freeze_time("2025-02-01")
+def test_score_question_schedules_users_stats_refresh(forecaster, broker):
+    user = factory_user()
+    question = create_resolved_question("yes")
+    factory_forecast(
+        author=user,
+        question=question,
+        probability_yes=0.9,
+        start_time=datetime_aware(2025, 1, 2),
+    )
+    factory_forecast(
+        author=forecaster,
+        question=question,
+        probability_yes=0.2,
+        start_time=datetime_aware(2025, 1, 2),
+    )
+
+    score_question(question, "yes", score_types=[ScoreTypes.PEER])
+    schedule_users_stats_refresh([forecaster.id])
+
+    # A single delayed task is enqueued for the whole burst
+    assert broker.queues["default.DQ"].qsize() == 1
+
+    run_refresh_pending_users_stats()
+
+    assert UserStats.objects.get(user=user).score_count == 1
+    assert UserStats.objects.get(user=forecaster).score_count == 4
+    assert not pop_pending_users_stats()
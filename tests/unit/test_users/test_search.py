@@ -12,7 +12,9 @@ from tests.unit.test_comments.factories import factory_comment
 from tests.unit.test_posts.factories import factory_post
 from tests.unit.test_projects.factories import factory_project
 from tests.unit.test_users.factories import factory_user
-from users.models import User
+from comments.models import Comment
+from users.models import RecentCommenter, User
+from users.services.common import refresh_recent_commenters
 
 
 class TestUserSearchWithPostId:
@@ -21,10 +23,6 @@ class TestUserSearchWithPostId:
         self.url = reverse("users-list")
         # Create an authenticated client for the endpoint
         self.client = create_client_for_user(factory_user(username="testclient_user"))
-        # Clear cached recently-active set so each test sees fresh data
-        from users.services.common import get_recently_active_user_ids
-
-        get_recently_active_user_ids.clear_cache()
 
     def _make_recently_active(self, user):
         """
@@ -33,6 +31,8 @@ class TestUserSearchWithPostId:
         other_post = factory_post(author=factory_user())
         factory_comment(author=user, on_post=other_post)
 
+        refresh_recent_commenters()
+
     def test_search_with_post_id_prioritizes_commenters(self) -> None:
         post_author = factory_user(username="postauthor")
         commenter = factory_user(username="commenterabc")
@@ -218,6 +218,8 @@ class TestUserSearchWithPostId:
             created_at=timezone.now() - timedelta(days=400),
         )
 
+        refresh_recent_commenters()
+
         response = self.client.get(f"{self.url}?search=oldcommentor")
 
         assert response.status_code == status.HTTP_200_OK
@@ -235,9 +237,48 @@ class TestUserSearchWithPostId:
             is_soft_deleted=True,
         )
 
+        refresh_recent_commenters()
+
         response = self.client.get(f"{self.url}?search=deletedcommentor")
 
         assert response.status_code == status.HTTP_200_OK
         results = response.data
         usernames = [r["username"] for r in results]
         assert "deletedcommentor" not in usernames
+
+
+class TestUserSearchRanking:
+    @pytest.fixture(autouse=True)
+    def setup(self, create_client_for_user: Callable[[User | None], APIClient]):
+        self.url = reverse("users-list")
+        self.client = create_client_for_user(factory_user(username="testclient_user"))
+
+    def _create_active_users(self, *usernames: str) -> list[User]:
+        post = factory_post(author=factory_user())
+        users = [factory_user(username=username) for username in usernames]
+
+        for user in users:
+            factory_comment(author=user, on_post=post)
+
+        refresh_recent_commenters()
+
+        return users
+
+    def test_search_ranking(self) -> None:
+        self._create_active_users("xxrankerxx", "rankerz", "ranker", "rankers")
+
+        response = self.client.get(f"{self.url}?search=ranker")
+
+        assert response.status_code == status.HTTP_200_OK
+        usernames = [r["username"] for r in response.data]
+        # Exact match, then prefix matches by similarity, then substring matches
+        assert usernames == ["ranker", "rankers", "rankerz", "xxrankerxx"]
+
+    def test_refresh_recent_commenters(self) -> None:
+        (user,) = self._create_active_users("staleuser")
+        assert RecentCommenter.objects.filter(user=user).exists()
+
+        Comment.objects.filter(author=user).update(is_soft_deleted=True)
+        refresh_recent_commenters()
+
+        assert not RecentCommenter.objects.filter(user=user).exists()
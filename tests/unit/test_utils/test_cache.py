@@ -0,0 +1,218 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from utils.cache import (
+    CacheEntry,
+    cache_get_or_set,
+    cache_per_object,
+    cached_singleton,
+)
+
+WORKERS = 16
+
+
+class Counter:
+    """
+    Thread-safe counter of slow recomputations
+    """
+
+    def __init__(self, duration: float = 0.3):
+        self.duration = duration
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+
+        time.sleep(self.duration)
+
+        return calls
+
+
+def run_concurrently(fn, workers: int = WORKERS) -> list:
+    barrier = threading.Barrier(workers)
+
+    def target(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(target, range(workers)))
+
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+
+    while not condition():
+        assert time.monotonic() < deadline, "Condition was not met in time"
+        time.sleep(0.02)
+
+
+@pytest.fixture()
+def cache_key():
+    key = f"test_cache:{uuid.uuid4().hex}"
+
+    yield key
+
+    cache.delete_many([key, f"{key}:lock"])
+
+
+def test_cache_get_or_set_computes_once(cache_key):
+    counter = Counter()
+
+    results = run_concurrently(lambda: cache_get_or_set(cache_key, counter, timeout=60))
+
+    assert counter.calls == 1
+    assert results == [1] * WORKERS
+
+
+def test_cache_get_or_set_falsy_values(cache_key):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [] if len(calls) < 3 else [1]
+
+    # Falsy results are recomputed until a value comes back
+    for _ in range(4):
+        cache_get_or_set(cache_key, compute, timeout=60)
+
+    assert len(calls) == 3
+    assert cache_get_or_set(cache_key, compute, timeout=60) == [1]
+
+    cache.delete(cache_key)
+    calls.clear()
+
+    for _ in range(3):
+        assert (
+            cache_get_or_set(
+                cache_key, lambda: calls.append(1), timeout=60, cache_falsy=True
+            )
+            is None
+        )
+
+    assert len(calls) == 1
+
+
+def test_cache_get_or_set_lock_holder_failure(cache_key):
+    def fail():
+        time.sleep(0.2)
+        raise ValueError()
+
+    # Other workers compute the value once the failed lock holder releases the lock
+    cache.add(f"{cache_key}:lock", "other-worker")
+    threading.Timer(0.2, lambda: cache.delete(f"{cache_key}:lock")).start()
+
+    assert cache_get_or_set(cache_key, lambda: "value", timeout=60) == "value"
+
+    cache.delete(cache_key)
+
+    with pytest.raises(ValueError):
+        cache_get_or_set(cache_key, fail, timeout=60)
+
+    assert cache.get(f"{cache_key}:lock") is None
+
+
+def test_cached_singleton_computes_once():
+    counter = Counter()
+    fn = cached_singleton(timeout=60)(lambda: counter())
+    fn.clear_cache()
+
+    try:
+        results = run_concurrently(fn)
+
+        assert counter.calls == 1
+        assert results == [1] * WORKERS
+        assert fn() == 1
+
+        assert fn.refresh_cache() == 2
+        assert fn() == 2
+    finally:
+        fn.clear_cache()
+
+
+@patch("utils.cache.CACHE_EARLY_REFRESH_BETA", 0)
+def test_cached_singleton_stale_while_revalidate():
+    counter = Counter(duration=1)
+    fn = cached_singleton(timeout=1, stale_timeout=60)(lambda: counter())
+    fn.clear_cache()
+
+    try:
+        assert fn() == 1
+
+        # Value expired, stale one is served while a single worker refreshes it
+        time.sleep(1.1)
+        started_at = time.monotonic()
+        results = run_concurrently(fn)
+
+        assert results == [1] * WORKERS
+        assert time.monotonic() - started_at < counter.duration
+
+        wait_for(lambda: fn() == 2)
+        assert counter.calls == 2
+    finally:
+        fn.clear_cache()
+
+
+def test_cached_singleton_early_refresh():
+    counter = Counter(duration=0.01)
+    fn = cached_singleton(timeout=3600)(lambda: counter())
+    fn.clear_cache()
+
+    try:
+        assert fn() == 1
+
+        entry = cache.get(fn.cache_key)
+        assert isinstance(entry, CacheEntry)
+        assert entry.value == 1
+
+        # Not refreshed until the expiry gets close
+        assert fn() == 1
+
+        # Values get refreshed before they expire when the draw is unlucky
+        with (
+            patch("utils.cache.random.random", return_value=0.5),
+            patch("utils.cache.CACHE_EARLY_REFRESH_BETA", 1e6),
+        ):
+            assert fn() == 2
+
+        assert counter.calls == 2
+    finally:
+        fn.clear_cache()
+
+
+def test_cache_per_object_computes_once():
+    calls = []
+    lock = threading.Lock()
+
+    @cache_per_object(lambda obj: f"test_cache_per_object:{obj}", timeout=60)
+    def double(objects: list[int]) -> dict[int, int]:
+        with lock:
+            calls.append(sorted(objects))
+
+        time.sleep(0.3)
+
+        return {obj: obj * 2 for obj in objects}
+
+    keys = [f"test_cache_per_object:{obj}" for obj in range(4)]
+    cache.delete_many(keys)
+
+    try:
+        assert double([0, 1]) == {0: 0, 1: 2}
+
+        results = run_concurrently(lambda: double([0, 1, 2, 3]))
+
+        assert results == [{0: 0, 1: 2, 2: 4, 3: 6}] * WORKERS
+        # Only missing objects are computed, each of them once
+        assert calls[0] == [0, 1]
+        assert sorted(obj for objects in calls[1:] for obj in objects) == [2, 3]
+    finally:
+        cache.delete_many(keys)
@@ -0,0 +1,186 @@
+from datetime import timedelta
+
+import dramatiq
+import pytest
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from rest_framework import status
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework.reverse import reverse
+
+from projects.models import Project, ProjectUserPermission
+from projects.permissions import ObjectPermission
+from questions.models import Question
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_projects.factories import factory_project
+from tests.unit.test_questions.factories import create_question
+from utils.data_exports import (
+    DATA_EXPORT_CACHE_TIMEOUT,
+    DataExportStatus,
+    delete_expired_data_exports,
+    get_data_export,
+    get_data_export_cache_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def storage(settings):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    }
+
+    cache.delete_pattern(get_data_export_cache_key("*"))
+    yield
+    cache.delete_pattern(get_data_export_cache_key("*"))
+
+
+def create_post(**kwargs):
+    return factory_post(
+        question=create_question(question_type=Question.QuestionType.BINARY),
+        **kwargs,
+    )
+
+
+def run_export_tasks(broker):
+    queue = broker.queues["default"]
+
+    while queue.qsize():
+        message = dramatiq.Message.decode(queue.get())
+        broker.get_actor(message.actor_name)(*message.args, **message.kwargs)
+        queue.task_done()
+
+
+def test_data_export(user1_client, user2_client, broker):
+    posts = [create_post(), create_post()]
+    url = reverse("data_export_create")
+    data = {"post_ids": [p.id for p in posts], "include_user_data": False}
+
+    response = user1_client.post(url, data, format="json")
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    export_id = response.data["id"]
+
+    response = user1_client.post(url, data, format="json")
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data == {"id": export_id, "status": DataExportStatus.PENDING}
+
+    # Identical request of another user with the same access level is deduplicated
+    response = user2_client.post(
+        url, {**data, "post_ids": data["post_ids"][::-1]}, format="json"
+    )
+    assert response.data["id"] == export_id
+    assert broker.queues["default"].qsize() == 1
+
+    run_export_tasks(broker)
+
+    response = user2_client.get(
+        reverse("data_export_detail", kwargs={"export_id": export_id})
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["status"] == DataExportStatus.READY
+    assert response.data["url"].endswith(
+        reverse("data_export_download", kwargs={"export_id": export_id})
+    )
+
+    # Files are only served through the download view
+    file_name = get_data_export(export_id)["file_name"]
+    assert export_id not in file_name
+    assert default_storage.exists(file_name)
+
+    response = user2_client.get(response.data["url"])
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Disposition"] == (
+        'attachment; filename="metaculus_data_2_posts.zip"'
+    )
+    assert (
+        b"".join(response.streaming_content) == default_storage.open(file_name).read()
+    )
+
+    # Own forecasts are only shared with the same user
+    response = user2_client.post(
+        url, {**data, "include_user_data": True}, format="json"
+    )
+    assert response.data["id"] != export_id
+
+
+def test_data_export_permissions(user1, user1_client, user2_client):
+    public_post = create_post()
+    private_post = create_post(
+        author=user1,
+        default_project=factory_project(
+            type=Project.ProjectTypes.TOURNAMENT, default_permission=None
+        ),
+    )
+    url = reverse("data_export_create")
+
+    response = user2_client.post(
+        url, {"post_ids": [public_post.id, private_post.id]}, format="json"
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = user2_client.post(
+        url, {"post_ids": [public_post.id, private_post.id + 1]}, format="json"
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = user1_client.post(
+        url, {"post_ids": [public_post.id, private_post.id]}, format="json"
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+
+
+def test_data_export_detail_not_found(anon_client):
+    response = anon_client.get(
+        reverse("data_export_detail", kwargs={"export_id": "unknown"})
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_data_export_access_is_rechecked(user1, user1_client, user2_client, broker):
+    project = factory_project(
+        type=Project.ProjectTypes.TOURNAMENT, default_permission=None
+    )
+    ProjectUserPermission.objects.create(
+        user=user1, project=project, permission=ObjectPermission.VIEWER
+    )
+    post = create_post(default_project=project)
+
+    response = user1_client.post(
+        reverse("data_export_create"), {"post_ids": [post.id]}, format="json"
+    )
+    export_id = response.data["id"]
+    run_export_tasks(broker)
+
+    detail_url = reverse("data_export_detail", kwargs={"export_id": export_id})
+    download_url = reverse("data_export_download", kwargs={"export_id": export_id})
+
+    assert user1_client.get(download_url).status_code == status.HTTP_200_OK
+
+    # Users without access to the data can't poll or download the export
+    for url in (detail_url, download_url):
+        assert user2_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    # Nor can the requester once their access is revoked
+    ProjectUserPermission.objects.filter(user=user1).delete()
+
+    for url in (detail_url, download_url):
+        assert user1_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_delete_expired_data_exports(user1_client, broker):
+    assert delete_expired_data_exports() == 0
+
+    response = user1_client.post(
+        reverse("data_export_create"), {"post_ids": [create_post().id]}, format="json"
+    )
+    run_export_tasks(broker)
+    file_name = get_data_export(response.data["id"])["file_name"]
+
+    assert delete_expired_data_exports() == 0
+    assert default_storage.exists(file_name)
+
+    with freeze_time(timezone.now() + timedelta(seconds=DATA_EXPORT_CACHE_TIMEOUT + 1)):
+        assert delete_expired_data_exports() == 1
+
+    assert not default_storage.exists(file_name)
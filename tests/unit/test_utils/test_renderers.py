@@ -0,0 +1,95 @@
+import datetime
+import decimal
+import json
+import uuid
+
+import numpy as np
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from tests.unit.test_posts.factories import factory_post
+from tests.unit.test_questions.factories import create_question
+from questions.models import Question
+from utils.renderers import ORJSONRenderer
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {
+            "id": 1,
+            "title": "Will ünicode — work?",
+            "scores": [0.1, 1e-05, 12345.678, -3, None, True],
+            "nested": {"tuple": (1, 2), "empty": {}},
+            "line_separator": "a\u2028b\u2029c",
+        },
+        {
+            "aware": datetime.datetime(
+                2025, 1, 1, 12, 30, 15, 123, tzinfo=datetime.timezone.utc
+            ),
+            "naive": datetime.datetime(2025, 1, 1, 12, 30),
+            "offset": datetime.datetime(
+                2025, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+            ),
+            "date": datetime.date(2025, 1, 1),
+            "time": datetime.time(12, 30),
+            "timedelta": datetime.timedelta(hours=1),
+            "decimal": decimal.Decimal("1.5"),
+            "uuid": uuid.UUID(int=1),
+            "lazy": gettext_lazy("Hello"),
+            "int_keys": {1: "a", 2: "b"},
+            "big_int": 2**70,
+        },
+        [np.array([0.5, 0.25]), np.float64(0.5), np.int64(3)],
+    ],
+)
+def test_orjson_renderer_matches_json_renderer(data):
+    assert json.loads(ORJSONRenderer().render(data)) == json.loads(
+        JSONRenderer().render(data)
+    )
+
+
+def test_orjson_renderer_output():
+    renderer = ORJSONRenderer()
+
+    assert renderer.render(None) == b""
+    assert renderer.render({"a": [1, "é\u2028"]}) == b'{"a":[1,"\xc3\xa9\\u2028"]}'
+    assert renderer.render(
+        {"at": datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)}
+    ) == JSONRenderer().render(
+        {"at": datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)}
+    )
+    assert (
+        renderer.render({"a": 1}, accepted_media_type="application/json; indent=4")
+        == b'{\n    "a": 1\n}'
+    )
+
+
+def test_orjson_renderer_nan():
+    data = {
+        "nan": float("nan"),
+        "inf": float("inf"),
+        "np": np.array([np.nan, 0.5]),
+    }
+
+    with pytest.raises(ValueError):
+        JSONRenderer().render(data)
+
+    assert json.loads(ORJSONRenderer().render(data)) == {
+        "nan": None,
+        "inf": None,
+        "np": [None, 0.5],
+    }
+
+
+def test_posts_list_rendering(user1_client):
+    question = create_question(question_type=Question.QuestionType.NUMERIC)
+    post = factory_post(question=question, title="Rendering — test\u2028")
+
+    response = user1_client.get(reverse("post-list"))
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["title"] == post.title
+    assert response.json() == json.loads(JSONRenderer().render(response.data))
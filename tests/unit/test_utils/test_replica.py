@@ -0,0 +1,97 @@
+import pytest
+from django.conf import settings as django_settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from tests.unit.test_users.factories import factory_user
+from users.models import User
+from utils.db import REPLICA_DB_ALIAS, replica_routing_scope, use_replica
+from utils.middlewares import ReplicaRoutingMiddleware
+
+# Runs against two separate local databases, so data written to the primary
+# is missing from the replica, like it would be with replication lag
+pytestmark = [
+    pytest.mark.skipif(
+        REPLICA_DB_ALIAS not in django_settings.DATABASES,
+        reason="TEST_DATABASE_REPLICA_URL is not set",
+    ),
+    pytest.mark.django_db(databases=["default", REPLICA_DB_ALIAS]),
+]
+
+
+@pytest.fixture(autouse=True)
+def replica_enabled(settings):
+    settings.DATABASE_REPLICA_ENABLED = True
+
+
+@pytest.fixture()
+def replica_user() -> User:
+    return User.objects.using(REPLICA_DB_ALIAS).create(
+        pk=10**9, username="replica_user", email="replica@metaculus.com"
+    )
+
+
+def read_usernames() -> set[str]:
+    return set(User.objects.values_list("username", flat=True))
+
+
+def test_use_replica(replica_user):
+    primary_user = factory_user()
+
+    assert primary_user.username in read_usernames()
+
+    with use_replica():
+        assert read_usernames() == {replica_user.username}
+
+    @use_replica()
+    def get_user(pk: int) -> User:
+        return User.objects.get(pk=pk)
+
+    user = get_user(replica_user.pk)
+    assert user._state.db == REPLICA_DB_ALIAS
+
+    # Objects read from the replica are written to the primary
+    user.save()
+    assert User.objects.filter(pk=replica_user.pk).exists()
+
+
+def test_use_replica_disabled(settings, replica_user):
+    settings.DATABASE_REPLICA_ENABLED = False
+
+    with use_replica():
+        assert replica_user.username not in read_usernames()
+
+
+def test_use_replica_reads_own_writes(replica_user):
+    with use_replica():
+        assert read_usernames() == {replica_user.username}
+
+        user = factory_user()
+
+        assert user.username in read_usernames()
+
+    # Writes only pin the unit of work that made them
+    with use_replica():
+        assert read_usernames() == {replica_user.username}
+
+    with replica_routing_scope():
+        factory_user()
+
+        with use_replica():
+            assert replica_user.username not in read_usernames()
+
+
+@pytest.mark.parametrize(
+    "method,reads_replica", [("get", True), ("head", True), ("post", False)]
+)
+def test_replica_routing_middleware(replica_user, method, reads_replica):
+    def view(request):
+        with use_replica():
+            usernames = read_usernames()
+
+        return HttpResponse(str(replica_user.username in usernames))
+
+    middleware = ReplicaRoutingMiddleware(view)
+    response = middleware(getattr(RequestFactory(), method)("/"))
+
+    assert response.content.decode() == str(reads_replica)
@@ -1007,3 +1007,123 @@ class TestGetAggregationHistoryCutoff:
         assert len(aggregations) == 1
         assert aggregations[0].end_time is None
         assert aggregations[0].forecaster_count == 2
+
+
+class TestGetDefaultAggregationsAtTimes:
+    def test_stored_and_live_lookups(
+        self, question_binary: Question, django_assert_num_queries
+    ):
+        from questions.models import Forecast
+        from questions.services.forecasts import build_question_forecasts
+        from utils.the_math.aggregations import (
+            get_aggregations_at_time,
+            get_default_aggregations_at_times,
+        )
+
+        question_binary.open_time = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        question_binary.save()
+
+        for day, probability in enumerate([0.2, 0.5, 0.9], start=1):
+            Forecast.objects.create(
+                question=question_binary,
+                author=User.objects.create(username=f"user_{day}"),
+                probability_yes=probability,
+                start_time=datetime(2025, 2, day, tzinfo=dt_timezone.utc),
+            )
+
+        times = [
+            datetime(2025, 1, 15, tzinfo=dt_timezone.utc),
+            datetime(2025, 2, 1, 12, tzinfo=dt_timezone.utc),
+            datetime(2025, 2, 2, 12, tzinfo=dt_timezone.utc),
+            datetime(2025, 3, 1, tzinfo=dt_timezone.utc),
+        ]
+        method = question_binary.default_aggregation_method
+        live = [
+            get_aggregations_at_time(
+                question_binary, time, [method], include_stats=True
+            ).get(method)
+            for time in times
+        ]
+
+        # Not materialized yet, so everything is computed live
+        results = get_default_aggregations_at_times(
+            [(question_binary, time) for time in times]
+        )
+        assert results[0] is None
+        for result, expected in zip(results[1:], live[1:]):
+            assert result.forecaster_count == expected.forecaster_count
+            np.testing.assert_allclose(result.get_pmf(), expected.get_pmf())
+
+        build_question_forecasts(question_binary)
+
+        # Covered timestamps are answered by a single query
+        with django_assert_num_queries(1):
+            results = get_default_aggregations_at_times(
+                [(question_binary, time) for time in times[1:]]
+            )
+
+            for result, expected in zip(results, live[1:]):
+                assert result.id is not None
+                assert result.forecaster_count == expected.forecaster_count
+                np.testing.assert_allclose(result.get_pmf(), expected.get_pmf())
+
+    def test_minimized_history_lookups(self, question_binary: Question):
+        from datetime import timedelta
+
+        from questions.models import Forecast
+        from questions.services.forecasts import build_question_forecasts
+        from utils.the_math.aggregations import (
+            get_aggregations_at_time,
+            get_default_aggregations_at_times,
+        )
+
+        open_time = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        question_binary.open_time = open_time
+        question_binary.save()
+
+        # 30 forecasters updating 15 times each, hourly
+        forecasts = []
+        for user_idx in range(30):
+            author = User.objects.create(username=f"user_{user_idx}")
+            start_times = [
+                open_time + timedelta(hours=update_idx * 30 + user_idx + 1)
+                for update_idx in range(15)
+            ]
+            for update_idx, (start_time, end_time) in enumerate(
+                zip(start_times, start_times[1:] + [None])
+            ):
+                forecasts.append(
+                    Forecast(
+                        question=question_binary,
+                        author=author,
+                        probability_yes=((user_idx + update_idx) % 9 + 1) / 10,
+                        start_time=start_time,
+                        end_time=end_time,
+                    )
+                )
+        Forecast.objects.bulk_create(forecasts)
+
+        build_question_forecasts(question_binary)
+        # Stored history got thinned
+        assert question_binary.aggregate_forecasts.count() < len(forecasts)
+
+        times = [
+            open_time + timedelta(hours=hour, minutes=30) for hour in range(0, 460, 7)
+        ]
+        method = question_binary.default_aggregation_method
+        results = get_default_aggregations_at_times(
+            [(question_binary, time) for time in times]
+        )
+
+        for time, result in zip(times, results):
+            expected = get_aggregations_at_time(
+                question_binary, time, [method], include_stats=True
+            ).get(method)
+
+            if expected is None:
+                assert result is None
+                continue
+
+            assert result.forecaster_count == expected.forecaster_count
+            np.testing.assert_allclose(result.get_pmf(), expected.get_pmf())
+            np.testing.assert_allclose(result.centers, expected.centers)
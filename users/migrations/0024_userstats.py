@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:08
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0023_user_username_set_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("score_scatter_plot", models.JSONField(default=list)),
+                ("score_histogram", models.JSONField(default=list)),
+                ("average_score", models.FloatField(null=True)),
+                ("score_count", models.IntegerField(default=0)),
+                (
+                    "calibration_counts",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "calibration_weights",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.FloatField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "calibration_resolution_weights",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.FloatField(), default=list, size=None
+                    ),
+                ),
+                ("forecasts_count", models.IntegerField(default=0)),
+                ("questions_predicted_count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:18
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_recent_commenters(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO users_recentcommenter (user_id, last_commented_at)
+            SELECT author_id, MAX(created_at)
+            FROM comments_comment
+            WHERE is_soft_deleted = FALSE
+              AND created_at >= NOW() - INTERVAL '365 days'
+            GROUP BY author_id
+            """
+        )
+        print(f"\n  recent commenters: {cursor.rowcount} rows created")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("comments", "0028_keyfactor_freshness"),
+        ("users", "0024_userstats"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name="RecentCommenter",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("last_commented_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("username"),
+                    name="gin_trgm_ops",
+                ),
+                name="upper_username_trgm_idx",
+            ),
+        ),
+        migrations.RunPython(populate_recent_commenters, migrations.RunPython.noop),
+    ]
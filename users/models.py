@@ -5,8 +5,10 @@ import dateutil.parser
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
 from django.db.models import QuerySet
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 from users.constants import ApiAccessTier, ApiForecastingAccess
@@ -221,6 +223,11 @@ class User(TimeStampedModel, AbstractUser):
                 models.Func("username", function="UPPER"),
                 name="upper_username_idx",
             ),
+            # Substring username search, e.g. mentions autocomplete
+            GinIndex(
+                OpClass(Upper("username"), name="gin_trgm_ops"),
+                name="upper_username_trgm_idx",
+            ),
         ]
         constraints = [
             models.CheckConstraint(
@@ -318,3 +325,45 @@ class UserSpamActivity(TimeStampedModel):
     content_type = models.CharField(max_length=200, choices=SpamContentType.choices)
     content_id = models.IntegerField(null=True, blank=True)
     text = models.TextField(blank=True)
+
+
+class UserStats(models.Model):
+    """
+    Materialized forecasting stats of the user profile,
+    refreshed whenever user's questions get scored.
+    See `users.services.profile_stats.refresh_users_stats`
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+
+    score_scatter_plot = models.JSONField(default=list)
+    score_histogram = models.JSONField(default=list)
+    average_score = models.FloatField(null=True)
+    score_count = models.IntegerField(default=0)
+
+    # Calibration accumulators, one element per `CALIBRATION_BINS` bin
+    calibration_counts = ArrayField(models.IntegerField(), default=list)
+    calibration_weights = ArrayField(models.FloatField(), default=list)
+    calibration_resolution_weights = ArrayField(models.FloatField(), default=list)
+
+    forecasts_count = models.IntegerField(default=0)
+    questions_predicted_count = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"UserStats {self.user_id}"
+
+
+class RecentCommenter(models.Model):
+    """
+    Users with a non-deleted comment in the last year.
+    Compact table refreshed periodically, see `users.services.common.refresh_recent_commenters`
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    last_commented_at = models.DateTimeField()
@@ -5,7 +5,8 @@ from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
-from django.db import transaction, IntegrityError
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection, transaction, IntegrityError
 from django.db.models import Case, IntegerField, Q, QuerySet, When
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -25,27 +26,66 @@ from posts.services.subscriptions import (
 )
 from projects.models import Project, ProjectUserPermission
 from projects.permissions import ObjectPermission
-from users.models import User, UserCampaignRegistration
+from users.models import RecentCommenter, User, UserCampaignRegistration
 from users.serializers import UserPrivateSerializer
-from utils.cache import cached_singleton
 from utils.email import send_account_email_with_template
 from utils.frontend import build_frontend_email_change_url
 
 
-@cached_singleton(timeout=60 * 60)
-def get_recently_active_user_ids() -> set[int]:
+REFRESH_RECENT_COMMENTERS_SQL = """
+WITH active AS (
+    SELECT author_id, MAX(created_at) AS last_commented_at
+    FROM {comment}
+    WHERE is_soft_deleted = FALSE AND created_at >= %(commented_after)s
+    GROUP BY author_id
+),
+deleted AS (
+    DELETE FROM {recent_commenter}
+    WHERE user_id NOT IN (SELECT author_id FROM active)
+)
+INSERT INTO {recent_commenter} (user_id, last_commented_at)
+SELECT author_id, last_commented_at FROM active
+ON CONFLICT (user_id) DO UPDATE
+SET last_commented_at = EXCLUDED.last_commented_at
+""".format(
+    comment=Comment._meta.db_table,
+    recent_commenter=RecentCommenter._meta.db_table,
+)
+
+
+def refresh_recent_commenters() -> int:
     """
-    Returns the set of user IDs with at least one non-deleted comment
-    in the last year. Cached for 1 hour.
+    Rebuilds the set of users with at least one non-deleted comment
+    in the last year
     """
-    one_year_ago = timezone.now() - timedelta(days=365)
-    return set(
-        Comment.objects.filter(
-            is_soft_deleted=False,
-            created_at__gte=one_year_ago,
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            REFRESH_RECENT_COMMENTERS_SQL,
+            {"commented_after": timezone.now() - timedelta(days=365)},
         )
-        .values_list("author_id", flat=True)
-        .distinct()
+
+        return cursor.rowcount
+
+
+def search_users_by_username(qs: QuerySet[User], search: str) -> QuerySet[User]:
+    """
+    Filters users by username substring, served by the trigram index,
+    and annotates match relevance: exact match, prefix match and trigram similarity
+    """
+
+    return qs.filter(username__icontains=search).annotate(
+        full_match=Case(
+            When(username__iexact=search, then=1),
+            default=0,
+            output_field=IntegerField(),
+        ),
+        prefix_match=Case(
+            When(username__istartswith=search, then=1),
+            default=0,
+            output_field=IntegerField(),
+        ),
+        similarity=TrigramSimilarity("username", search),
     )
 
 
@@ -63,7 +103,7 @@ def get_users(
     - Users with explicit permissions on the post's default project
 
     Non-priority users are filtered to only those who are active and have
-    posted a non-deleted comment in the last year.
+    posted a non-deleted comment in the last year, see `RecentCommenter`.
 
     The requesting user is passed to verify they have permission to view
     the post before exposing its project members.
@@ -72,13 +112,7 @@ def get_users(
 
     # Search
     if search:
-        qs = qs.annotate(
-            full_match=Case(
-                When(username__iexact=search, then=1),
-                default=0,
-                output_field=IntegerField(),
-            )
-        ).filter(username__icontains=search)
+        qs = search_users_by_username(qs, search)
 
     # Annotate relevance when post_id is provided
     if post_id:
@@ -123,18 +157,19 @@ def get_users(
 
         if search:
             # Keep priority users + recently active users only
-            recently_active_user_ids = get_recently_active_user_ids()
             qs = qs.filter(
                 Q(id__in=commenter_ids)
                 | Q(id__in=author_ids)
                 | Q(id__in=permission_user_ids)
-                | Q(id__in=recently_active_user_ids)
+                | Q(id__in=RecentCommenter.objects.values("user_id"))
             )
             return qs.order_by(
                 "-is_commenter",
                 "-is_author",
                 "-has_permission",
                 "-full_match",
+                "-prefix_match",
+                "-similarity",
                 "username",
             )
         else:
@@ -152,9 +187,8 @@ def get_users(
 
     if search:
         # Without post_id, only return recently active users
-        recently_active_user_ids = get_recently_active_user_ids()
-        qs = qs.filter(id__in=recently_active_user_ids)
-        return qs.order_by("-full_match", "username")
+        qs = qs.filter(id__in=RecentCommenter.objects.values("user_id"))
+        return qs.order_by("-full_match", "-prefix_match", "-similarity", "username")
 
     return qs
 
@@ -1,20 +1,36 @@
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from itertools import batched
+from typing import Iterable
 
 import numpy as np
-from django.db.models import QuerySet, Sum, Q, F
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import QuerySet, Sum, Q, F, Count
 from django.utils import timezone
+from django_redis import get_redis_connection
 from scipy.stats import binom
 
 from comments.models import Comment
 from posts.models import Post
+from projects.models import Project
 from questions.models import AggregateForecast, Forecast, Question
 from questions.types import AggregationMethod
 from scoring.constants import ScoreTypes
-from scoring.models import Score
-from users.models import User
+from scoring.models import AggregationCalibration, Score
+from users.models import User, UserStats
 from utils.cache import cache_get_or_set
 
+# Redis set of user ids awaiting the stats refresh
+PENDING_USER_STATS_KEY = "user_stats:pending"
+# Set while a refresh task is scheduled, so bursts of scoring enqueue it only once
+USER_STATS_SCHEDULED_KEY = "user_stats:scheduled"
+# How long scored users are collected before their stats are refreshed (ms)
+USER_STATS_COALESCE_DELAY = 30_000
+# Expires the scheduled flag in case the task message was lost (ms)
+USER_STATS_SCHEDULED_TTL = 600_000
+
 
 @dataclass(frozen=True)
 class QuestionScore:
@@ -30,26 +46,49 @@ class QuestionScore:
     edited_at: datetime | None = None
 
 
-def generate_question_scores(qs: QuerySet[Score]):
+def _annotate_question_scores(qs: QuerySet[Score]) -> QuerySet[Score]:
     # Some old users might have a lot of score
     # So we want to save time on db model serialization and select only values we actually use
-    scores_qs = qs.annotate(
+    return qs.annotate(
         question_title=F("question__title"),
         question_resolution=F("question__resolution"),
         post_id=F("question__post_id"),
-    ).values(
-        "score",
-        "edited_at",
-        "question_id",
-        "question_title",
-        "question_resolution",
-        "post_id",
     )
+
+
+QUESTION_SCORE_FIELDS = (
+    "score",
+    "edited_at",
+    "question_id",
+    "question_title",
+    "question_resolution",
+    "post_id",
+)
+
+
+def generate_question_scores(qs: QuerySet[Score]):
+    scores_qs = _annotate_question_scores(qs).values(*QUESTION_SCORE_FIELDS)
     scores = [QuestionScore(**x) for x in scores_qs]
 
     return scores
 
 
+def generate_users_question_scores(
+    qs: QuerySet[Score],
+) -> dict[int, list[QuestionScore]]:
+    """
+    Same as `generate_question_scores`, but grouped by user in a single query
+    """
+
+    scores_qs = _annotate_question_scores(qs).values("user_id", *QUESTION_SCORE_FIELDS)
+    scores = defaultdict(list)
+
+    for x in scores_qs:
+        scores[x.pop("user_id")].append(QuestionScore(**x))
+
+    return scores
+
+
 def get_score_scatter_plot_data(
     scores: list[QuestionScore] | None = None,
     user: User | None = None,
@@ -158,6 +197,124 @@ def get_score_histogram_data(
     }
 
 
+_SMALL_BIN_SIZE = 0.125 / 3
+# (p_min, p_max) bins of the calibration curve
+CALIBRATION_BINS = [
+    (0 * _SMALL_BIN_SIZE, 1 * _SMALL_BIN_SIZE),
+    (1 * _SMALL_BIN_SIZE, 2 * _SMALL_BIN_SIZE),
+    (2 * _SMALL_BIN_SIZE, 3 * _SMALL_BIN_SIZE),
+    (0.125, 0.175),
+    (0.175, 0.225),
+    (0.225, 0.275),
+    (0.275, 0.325),
+    (0.325, 0.375),
+    (0.375, 0.425),
+    (0.425, 0.475),
+    (0.475, 0.525),
+    (0.525, 0.575),
+    (0.575, 0.625),
+    (0.625, 0.675),
+    (0.675, 0.725),
+    (0.725, 0.775),
+    (0.775, 0.825),
+    (0.825, 0.875),
+    (0.875 + 0 * _SMALL_BIN_SIZE, 0.875 + 1 * _SMALL_BIN_SIZE),
+    (0.875 + 1 * _SMALL_BIN_SIZE, 0.875 + 2 * _SMALL_BIN_SIZE),
+    (0.875 + 2 * _SMALL_BIN_SIZE, 1.00),
+]
+
+
+def build_calibration_curve(
+    counts: list[int], weights: list[float], resolution_weights: list[float]
+) -> list[dict]:
+    """
+    Builds calibration curve from per-bin accumulators:
+    forecasts count, sum of their weights and sum of weights of "yes" resolutions
+    """
+
+    calibration_curve = []
+
+    for (p_min, p_max), bin_count, bin_weight, bin_resolution_weight in zip(
+        CALIBRATION_BINS, counts, weights, resolution_weights
+    ):
+        bin_center = (p_min + p_max) / 2
+        count = max(bin_count, 1)
+        average_resolution = (
+            bin_resolution_weight / bin_weight if bin_weight > 0 else None
+        )
+        lower_confidence_interval = binom.ppf(0.05, count, p_min) / count
+        perfect_calibration = binom.ppf(0.50, count, bin_center) / count
+        upper_confidence_interval = binom.ppf(0.95, count, p_max) / count
+
+        calibration_curve.append(
+            {
+                "bin_lower": p_min,
+                "bin_upper": p_max,
+                "lower_confidence_interval": lower_confidence_interval,
+                "average_resolution": average_resolution,
+                "upper_confidence_interval": upper_confidence_interval,
+                "perfect_calibration": perfect_calibration,
+            }
+        )
+
+    return calibration_curve
+
+
+def accumulate_calibration_bins(
+    forecasts: Iterable[Forecast | AggregateForecast],
+) -> tuple[list[int], list[float], list[float]]:
+    """
+    Sums up forecasts into calibration bins, weighted by their duration.
+    Forecasts must be annotated with question open time, close time and resolution.
+    Returns per-bin forecasts count, sum of weights and sum of weights of "yes" resolutions
+    """
+
+    values = []
+    weights = []
+    resolutions = []
+
+    for forecast in forecasts:
+        forecast_horizon_start = forecast.question_open_time.timestamp()
+        actual_close_time = forecast.question_actual_close_time.timestamp()
+        # The following is a hack to more closely replicate the old site's behavior
+        # forecast_horizon_end = question.scheduled_close_time.timestamp()
+        forecast_horizon_end = actual_close_time
+        forecast_start = max(forecast_horizon_start, forecast.start_time.timestamp())
+        if forecast.end_time:
+            forecast_end = min(actual_close_time, forecast.end_time.timestamp())
+        else:
+            forecast_end = actual_close_time
+        forecast_duration = forecast_end - forecast_start
+        question_duration = forecast_horizon_end - forecast_horizon_start
+
+        if question_duration == 0:
+            continue
+
+        weight = max(0, forecast_duration / question_duration)
+
+        if isinstance(forecast, Forecast):
+            values.append(forecast.probability_yes)
+        else:
+            values.append(forecast.forecast_values[1])
+
+        weights.append(weight)
+        resolutions.append(int(forecast.question_resolution == "yes"))
+
+    counts = [0] * len(CALIBRATION_BINS)
+    bin_weights = [0.0] * len(CALIBRATION_BINS)
+    bin_resolution_weights = [0.0] * len(CALIBRATION_BINS)
+
+    for value, weight, resolution in zip(values, weights, resolutions):
+        for idx, (p_min, p_max) in enumerate(CALIBRATION_BINS):
+            if p_min <= value < p_max:
+                counts[idx] += 1
+                bin_weights[idx] += weight
+                bin_resolution_weights[idx] += weight * resolution
+                break
+
+    return counts, bin_weights, bin_resolution_weights
+
+
 def get_calibration_curve_data(
     user: User | None = None,
     aggregation_method: AggregationMethod | None = None,
@@ -210,92 +367,99 @@ def get_calibration_curve_data(
     if chunk_size is not None:
         forecasts = forecasts.iterator(chunk_size=chunk_size)
 
-    values = []
-    weights = []
-    resolutions = []
-
-    for forecast in forecasts:
-        forecast_horizon_start = forecast.question_open_time.timestamp()
-        actual_close_time = forecast.question_actual_close_time.timestamp()
-        # The following is a hack to more closely replicate the old site's behavior
-        # forecast_horizon_end = question.scheduled_close_time.timestamp()
-        forecast_horizon_end = actual_close_time
-        forecast_start = max(forecast_horizon_start, forecast.start_time.timestamp())
-        if forecast.end_time:
-            forecast_end = min(actual_close_time, forecast.end_time.timestamp())
-        else:
-            forecast_end = actual_close_time
-        forecast_duration = forecast_end - forecast_start
-        question_duration = forecast_horizon_end - forecast_horizon_start
+    calibration_curve = build_calibration_curve(*accumulate_calibration_bins(forecasts))
 
-        if question_duration == 0:
-            continue
+    return {
+        "calibration_curve": calibration_curve,
+    }
 
-        weight = max(0, forecast_duration / question_duration)
 
-        if isinstance(forecast, Forecast):
-            values.append(forecast.probability_yes)
-        else:
-            values.append(forecast.forecast_values[1])
+def update_question_aggregation_calibrations(question: Question):
+    """
+    Rebuilds calibration accumulators of the question aggregations,
+    only questions resolved as yes/no contribute to the calibration curve
+    """
 
-        weights.append(weight)
-        resolutions.append(int(forecast.question_resolution == "yes"))
+    with transaction.atomic():
+        AggregationCalibration.objects.filter(question=question).delete()
 
-    calibration_curve = []
-    small_bin_size = 0.125 / 3
-    for p_min, p_max in [
-        (0 * small_bin_size, 1 * small_bin_size),
-        (1 * small_bin_size, 2 * small_bin_size),
-        (2 * small_bin_size, 3 * small_bin_size),
-        (0.125, 0.175),
-        (0.175, 0.225),
-        (0.225, 0.275),
-        (0.275, 0.325),
-        (0.325, 0.375),
-        (0.375, 0.425),
-        (0.425, 0.475),
-        (0.475, 0.525),
-        (0.525, 0.575),
-        (0.575, 0.625),
-        (0.625, 0.675),
-        (0.675, 0.725),
-        (0.725, 0.775),
-        (0.775, 0.825),
-        (0.825, 0.875),
-        (0.875 + 0 * small_bin_size, 0.875 + 1 * small_bin_size),
-        (0.875 + 1 * small_bin_size, 0.875 + 2 * small_bin_size),
-        (0.875 + 2 * small_bin_size, 1.00),
-    ]:
-        resolutions_for_bucket = []
-        weights_for_bucket = []
-        bin_center = (p_min + p_max) / 2
-        for value, weight, resolution in zip(values, weights, resolutions):
-            if p_min <= value < p_max:
-                resolutions_for_bucket.append(resolution)
-                weights_for_bucket.append(weight)
-        count = max(len(resolutions_for_bucket), 1)
-        average_resolution = (
-            np.average(resolutions_for_bucket, weights=weights_for_bucket)
-            if sum(weights_for_bucket) > 0
-            else None
+        if question.type != Question.QuestionType.BINARY or question.resolution not in (
+            "yes",
+            "no",
+        ):
+            return
+
+        forecasts = (
+            question.aggregate_forecasts.all()
+            .defer(
+                "histogram",
+                "interval_lower_bounds",
+                "centers",
+                "interval_upper_bounds",
+                "means",
+            )
+            .annotate(
+                question_open_time=F("question__open_time"),
+                question_actual_close_time=F("question__actual_close_time"),
+                question_resolution=F("question__resolution"),
+            )
         )
-        lower_confidence_interval = binom.ppf(0.05, count, p_min) / count
-        perfect_calibration = binom.ppf(0.50, count, bin_center) / count
-        upper_confidence_interval = binom.ppf(0.95, count, p_max) / count
+        forecasts_by_method = defaultdict(list)
 
-        calibration_curve.append(
-            {
-                "bin_lower": p_min,
-                "bin_upper": p_max,
-                "lower_confidence_interval": lower_confidence_interval,
-                "average_resolution": average_resolution,
-                "upper_confidence_interval": upper_confidence_interval,
-                "perfect_calibration": perfect_calibration,
-            }
-        )
+        for forecast in forecasts:
+            forecasts_by_method[forecast.method].append(forecast)
+
+        calibrations = []
+
+        for method, method_forecasts in forecasts_by_method.items():
+            counts, weights, resolution_weights = accumulate_calibration_bins(
+                method_forecasts
+            )
+            calibrations.append(
+                AggregationCalibration(
+                    question=question,
+                    aggregation_method=method,
+                    counts=counts,
+                    weights=weights,
+                    resolution_weights=resolution_weights,
+                )
+            )
+
+        AggregationCalibration.objects.bulk_create(calibrations)
+
+
+def get_aggregation_calibration_curve_data(
+    aggregation_method: AggregationMethod,
+) -> dict:
+    """
+    Same as `get_calibration_curve_data(aggregation_method=...)`,
+    but sums up stored per-question accumulators instead of scanning aggregations
+    """
+
+    now = timezone.now()
+    calibrations = AggregationCalibration.objects.filter(
+        question__in=Question.objects.filter_public().filter(
+            actual_resolve_time__gte=now - timedelta(days=365 * 5),
+            # Removes questions that have resolved before close time, which have a bias toward 'yes' resolutions
+            scheduled_resolve_time__lt=now,
+            include_bots_in_aggregates=False,
+        ),
+        aggregation_method=aggregation_method,
+    ).values_list("counts", "weights", "resolution_weights")
+
+    counts = np.zeros(len(CALIBRATION_BINS), dtype=int)
+    weights = np.zeros(len(CALIBRATION_BINS))
+    resolution_weights = np.zeros(len(CALIBRATION_BINS))
+
+    for question_counts, question_weights, question_resolution_weights in calibrations:
+        counts += question_counts
+        weights += question_weights
+        resolution_weights += question_resolution_weights
 
     return {
-        "calibration_curve": calibration_curve,
+        "calibration_curve": build_calibration_curve(
+            counts.tolist(), weights.tolist(), resolution_weights.tolist()
+        ),
     }
 
 
@@ -386,28 +550,268 @@ def get_authoring_stats_data(
     }
 
 
-def _serialize_user_stats(user: User):
-    score_qs = Score.objects.filter(
-        question__post__default_project__default_permission__isnull=False,
-        score_type=ScoreTypes.PEER,
+USERS_CALIBRATION_SQL = """
+SELECT
+    f.author_id,
+    width_bucket(f.probability_yes, %(bin_edges)s) AS bin,
+    COUNT(*) AS count,
+    SUM(w.weight) AS weight,
+    COALESCE(SUM(w.weight) FILTER (WHERE q.resolution = 'yes'), 0)
+        AS resolution_weight
+FROM {forecast} f
+JOIN {question} q ON q.id = f.question_id
+JOIN {post} p ON p.id = f.post_id
+JOIN {project} pr ON pr.id = p.default_project_id
+CROSS JOIN LATERAL (
+    SELECT GREATEST(
+        0,
+        (
+            EXTRACT(EPOCH FROM LEAST(q.actual_close_time, f.end_time))
+            - EXTRACT(EPOCH FROM GREATEST(q.open_time, f.start_time))
+        ) / NULLIF(EXTRACT(EPOCH FROM q.actual_close_time - q.open_time), 0)
+    )::float AS weight
+) w
+WHERE f.author_id = ANY(%(user_ids)s)
+  AND pr.default_permission IS NOT NULL
+  AND q.type = 'binary'
+  AND q.resolution IN ('yes', 'no')
+  AND q.actual_resolve_time >= %(resolved_after)s
+  AND q.scheduled_resolve_time < %(now)s
+  -- Zero-duration questions are skipped, like in accumulate_calibration_bins.
+  -- GREATEST ignores NULLs, so the weight itself is never NULL
+  AND q.actual_close_time <> q.open_time
+GROUP BY 1, 2
+""".format(
+    forecast=Forecast._meta.db_table,
+    question=Question._meta.db_table,
+    post=Post._meta.db_table,
+    project=Project._meta.db_table,
+)
+
+
+def get_users_calibration_bins(
+    user_ids: list[int],
+) -> dict[int, tuple[list[int], list[float], list[float]]]:
+    """
+    Set-based version of `get_calibration_curve_data` for users.
+    Returns calibration accumulators (counts, weights, resolution weights)
+    of each user, to be rendered by `build_calibration_curve`
+    """
+
+    now = timezone.now()
+    bins_count = len(CALIBRATION_BINS)
+    bins = {
+        user_id: ([0] * bins_count, [0.0] * bins_count, [0.0] * bins_count)
+        for user_id in user_ids
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            USERS_CALIBRATION_SQL,
+            {
+                # Bin lower edges + upper edge of the last bin
+                "bin_edges": [p_min for p_min, _ in CALIBRATION_BINS]
+                + [CALIBRATION_BINS[-1][1]],
+                "user_ids": list(user_ids),
+                "resolved_after": now - timedelta(days=365 * 5),
+                "now": now,
+            },
+        )
+
+        for user_id, bin_number, count, weight, resolution_weight in cursor:
+            # width_bucket returns 0 and bins_count + 1 for values out of range
+            if not 1 <= bin_number <= bins_count:
+                continue
+
+            counts, weights, resolution_weights = bins[user_id]
+            counts[bin_number - 1] = count
+            weights[bin_number - 1] = weight
+            resolution_weights[bin_number - 1] = resolution_weight
+
+    return bins
+
+
+def refresh_users_stats(user_ids: list[int]) -> list[UserStats]:
+    """
+    Recalculates materialized profile stats of the given users
+    """
+
+    scores_map = generate_users_question_scores(
+        Score.objects.filter(
+            question__post__default_project__default_permission__isnull=False,
+            score_type=ScoreTypes.PEER,
+            user_id__in=user_ids,
+        )
+    )
+    forecasts_map = {
+        x["author_id"]: x
+        for x in Forecast.objects.filter(
+            post__default_project__default_permission__isnull=False,
+            author_id__in=user_ids,
+        )
+        .values("author_id")
+        .annotate(
+            forecasts_count=Count("id"),
+            questions_predicted_count=Count("question_id", distinct=True),
+        )
+    }
+    calibration_map = get_users_calibration_bins(user_ids)
+    now = timezone.now()
+
+    users_stats = []
+
+    for user_id in user_ids:
+        scores = scores_map.get(user_id, [])
+        counts, weights, resolution_weights = calibration_map[user_id]
+        forecasts = forecasts_map.get(user_id, {})
+
+        users_stats.append(
+            UserStats(
+                user_id=user_id,
+                **get_score_scatter_plot_data(scores=scores),
+                **get_score_histogram_data(scores=scores),
+                average_score=(
+                    np.average([s.score for s in scores]) if scores else None
+                ),
+                score_count=len(scores),
+                calibration_counts=counts,
+                calibration_weights=weights,
+                calibration_resolution_weights=resolution_weights,
+                forecasts_count=forecasts.get("forecasts_count", 0),
+                questions_predicted_count=forecasts.get("questions_predicted_count", 0),
+                updated_at=now,
+            )
+        )
+
+    UserStats.objects.bulk_create(
+        users_stats,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=[
+            f.name for f in UserStats._meta.concrete_fields if not f.primary_key
+        ],
     )
-    score_qs = score_qs.filter(user=user)
+    cache.delete_many([get_user_stats_cache_key(user_id) for user_id in user_ids])
+
+    return users_stats
+
+
+def refresh_stale_users_stats(
+    stale_after: timedelta = timedelta(days=30), batch_size: int = 200
+) -> int:
+    """
+    Refreshes stats which weren't touched by scoring for a while,
+    so questions resolved more than 5 years ago leave the calibration curve
+    """
+
+    user_ids = list(
+        UserStats.objects.filter(updated_at__lt=timezone.now() - stale_after)
+        .order_by("updated_at")
+        .values_list("user_id", flat=True)
+    )
+
+    for batch in batched(user_ids, batch_size):
+        refresh_users_stats(list(batch))
+
+    return len(user_ids)
+
+
+def schedule_users_stats_refresh(user_ids: Iterable[int]):
+    """
+    Marks stats of the given users as outdated and schedules their refresh.
+    Bursts of scoring are coalesced into a single refresh of every affected user
+    """
+
+    from users.tasks import run_refresh_pending_users_stats
+
+    user_ids = set(user_ids)
+
+    if not user_ids:
+        return
 
-    scores = generate_question_scores(score_qs)
-    data = {}
+    redis = get_redis_connection("default")
 
-    data.update(get_score_scatter_plot_data(scores=scores, user=user))
-    data.update(get_score_histogram_data(scores=scores, user=user))
-    data.update(get_calibration_curve_data(user=user))
-    data.update(get_forecasting_stats_data(scores=scores, user=user))
+    with redis.pipeline() as pipe:
+        pipe.sadd(PENDING_USER_STATS_KEY, *user_ids)
+        pipe.set(USER_STATS_SCHEDULED_KEY, 1, nx=True, px=USER_STATS_SCHEDULED_TTL)
+        _, is_scheduled = pipe.execute()
+
+    if is_scheduled:
+        run_refresh_pending_users_stats.send_with_options(
+            delay=USER_STATS_COALESCE_DELAY
+        )
+
+
+def pop_pending_users_stats() -> set[int]:
+    """
+    Atomically takes all users scheduled for the stats refresh
+    """
+
+    redis = get_redis_connection("default")
+
+    with redis.pipeline() as pipe:
+        pipe.smembers(PENDING_USER_STATS_KEY)
+        pipe.delete(PENDING_USER_STATS_KEY, USER_STATS_SCHEDULED_KEY)
+        pending, _ = pipe.execute()
+
+    return {int(user_id) for user_id in pending}
+
+
+def refresh_pending_users_stats(batch_size: int = 200):
+    user_ids = sorted(pop_pending_users_stats())
+
+    try:
+        for batch in batched(user_ids, batch_size):
+            refresh_users_stats(list(batch))
+    except Exception:
+        # Put users back, so they are picked up by the retry
+        if user_ids:
+            get_redis_connection("default").sadd(PENDING_USER_STATS_KEY, *user_ids)
+
+        raise
+
+
+def get_user_stats(user: User) -> UserStats:
+    """
+    Returns materialized stats of the user, calculating them on the first access
+    """
+
+    stats = UserStats.objects.filter(user=user).first()
+
+    if stats is None:
+        (stats,) = refresh_users_stats([user.id])
+
+    return stats
+
+
+def _serialize_user_stats(user: User):
+    stats = get_user_stats(user)
+
+    data = {
+        "score_scatter_plot": stats.score_scatter_plot,
+        "score_histogram": stats.score_histogram,
+        "calibration_curve": build_calibration_curve(
+            stats.calibration_counts,
+            stats.calibration_weights,
+            stats.calibration_resolution_weights,
+        ),
+        "average_score": stats.average_score,
+        "forecasts_count": stats.forecasts_count,
+        "questions_predicted_count": stats.questions_predicted_count,
+        "score_count": stats.score_count,
+    }
     data.update(get_authoring_stats_data(user))
 
     return data
 
 
+def get_user_stats_cache_key(user_id: int) -> str:
+    return f"serialize_user_stats:{user_id}"
+
+
 def serialize_user_stats(user: User):
     return cache_get_or_set(
-        f"serialize_user_stats:{user.id}",
+        get_user_stats_cache_key(user.id),
         lambda: _serialize_user_stats(user),
         # 1h
         timeout=3600,
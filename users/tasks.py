@@ -0,0 +1,12 @@
+import dramatiq
+
+from users.services.profile_stats import refresh_pending_users_stats
+
+
+@dramatiq.actor
+def run_refresh_pending_users_stats():
+    """
+    Refreshes stats of all users scored since the previous run
+    """
+
+    refresh_pending_users_stats()
@@ -2,9 +2,15 @@ import functools
 import hashlib
 import json
 import logging
-from typing import Callable, Protocol, TypeVar
+import math
+import random
+import threading
+import time
+import uuid
+from typing import Callable, Hashable, Iterable, NamedTuple, Protocol, TypeVar
 
 from django.core.cache import cache
+from django.db import connections
 from django.db.models import Model
 from django.utils.encoding import force_str
 
@@ -14,6 +20,254 @@ _SENTINEL = object()
 
 T = TypeVar("T")
 
+# Max time a worker holds the recomputation lock of a key
+CACHE_LOCK_TIMEOUT = 60
+# Max time workers wait for another one to compute a missing value
+# before computing it themselves
+CACHE_LOCK_WAIT_TIMEOUT = 10
+CACHE_LOCK_POLL_INTERVAL = 0.05
+# Early refresh aggressiveness, 1 is the optimal default of the XFetch algorithm
+CACHE_EARLY_REFRESH_BETA = 1.0
+
+
+class CacheEntry(NamedTuple):
+    """
+    Cached value stored along with its refresh metadata
+    """
+
+    value: object
+    # Timestamp after which the value is stale, None for values which never expire
+    expires_at: float | None
+    # Seconds it took to compute the value
+    delta: float
+
+
+def _should_refresh(entry: CacheEntry) -> bool:
+    """
+    Probabilistic early expiration (XFetch).
+    Values that are slow to compute are refreshed earlier as their expiry nears,
+    so a single worker usually refreshes a hot key before it expires for everyone.
+    """
+
+    if entry.expires_at is None:
+        return False
+
+    # 1 - random() is in (0, 1], so log() is never undefined
+    jitter = -entry.delta * CACHE_EARLY_REFRESH_BETA * math.log(1 - random.random())
+
+    return time.time() + jitter >= entry.expires_at
+
+
+def _make_entry(value, timeout: int | None, delta: float) -> CacheEntry:
+    return CacheEntry(
+        value=value,
+        expires_at=time.time() + timeout if timeout is not None else None,
+        delta=delta,
+    )
+
+
+def _storage_timeout(timeout: int | None, stale_timeout: int | None) -> int | None:
+    """
+    Stale values are kept for `stale_timeout` seconds past their expiry
+    """
+
+    if timeout is None:
+        return None
+
+    return timeout + (stale_timeout or 0)
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}:lock"
+
+
+def _acquire_locks(
+    keys: Iterable[str], version: int | None = None
+) -> tuple[str, set[str]]:
+    """
+    Acquires per-key recomputation locks.
+    Returns the lock token and the keys whose locks were acquired
+    """
+
+    token = uuid.uuid4().hex
+
+    return token, {
+        key
+        for key in keys
+        if cache.add(_lock_key(key), token, timeout=CACHE_LOCK_TIMEOUT, version=version)
+    }
+
+
+def _release_locks(token: str, keys: Iterable[str], version: int | None = None):
+    lock_keys = [_lock_key(key) for key in keys]
+    owned = [
+        lock_key
+        for lock_key, value in cache.get_many(lock_keys, version=version).items()
+        if value == token
+    ]
+
+    if owned:
+        cache.delete_many(owned, version=version)
+
+
+def _wait_for_entries(
+    keys: Iterable[str], version: int | None = None
+) -> dict[str, CacheEntry]:
+    """
+    Waits for other workers holding the locks to store the given keys.
+    Returns entries stored before the wait timeout, or before their lock was released
+    without storing them
+    """
+
+    pending = set(keys)
+    entries = {}
+    deadline = time.monotonic() + CACHE_LOCK_WAIT_TIMEOUT
+
+    while pending and time.monotonic() < deadline:
+        time.sleep(CACHE_LOCK_POLL_INTERVAL)
+
+        values = cache.get_many(
+            [*pending, *(_lock_key(key) for key in pending)], version=version
+        )
+
+        for key in list(pending):
+            entry = values.get(key)
+
+            if isinstance(entry, CacheEntry):
+                entries[key] = entry
+                pending.discard(key)
+            elif _lock_key(key) not in values:
+                # Lock holder failed to compute the value
+                pending.discard(key)
+
+    return entries
+
+
+def _run_in_background(fn: Callable, *args) -> None:
+    """
+    Runs the refresh in a daemon thread, releasing its DB connections afterward
+    """
+
+    def target():
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception("Background cache refresh failed")
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=target, name="cache-refresh", daemon=True).start()
+
+
+def _get_or_compute_many(
+    keys: dict[Hashable, str],
+    compute: Callable[[list[Hashable]], dict[Hashable, object]],
+    *,
+    timeout: int | None,
+    stale_timeout: int | None = None,
+    version: int | None = None,
+    cache_falsy: bool = True,
+) -> dict[Hashable, object]:
+    """
+    Stampede-proof get-or-compute of several keys at once.
+
+    - Only the worker holding a key's lock recomputes it;
+      others wait for the value to be stored.
+    - Values are refreshed early with a probability growing as they approach expiry.
+    - With `stale_timeout`, expired values are kept and served for that many seconds
+      while a single worker refreshes them in the background.
+    - Without `cache_falsy`, falsy values are returned but never stored,
+      so they are recomputed on the next call.
+
+    `keys` maps items to their cache keys, `compute` returns values of given items
+    """
+
+    storage_timeout = _storage_timeout(timeout, stale_timeout)
+    cached = cache.get_many(keys.values(), version=version)
+
+    result = {}
+    misses = []
+    refreshes = []
+
+    for item, key in keys.items():
+        entry = cached.get(key, _SENTINEL)
+
+        if entry is _SENTINEL:
+            misses.append(item)
+        elif not isinstance(entry, CacheEntry):
+            # Values stored before entries had refresh metadata
+            result[item] = entry
+        else:
+            result[item] = entry.value
+
+            if _should_refresh(entry):
+                refreshes.append(item)
+
+    if not misses and not refreshes:
+        return result
+
+    token, locked = _acquire_locks(
+        (keys[item] for item in misses + refreshes), version=version
+    )
+
+    def compute_and_store(items: list[Hashable]) -> dict[Hashable, object]:
+        try:
+            started_at = time.monotonic()
+            fresh = compute(items)
+            delta = time.monotonic() - started_at
+
+            cache.set_many(
+                {
+                    keys[item]: _make_entry(value, timeout, delta)
+                    for item, value in fresh.items()
+                    if cache_falsy or value
+                },
+                storage_timeout,
+                version=version,
+            )
+
+            return fresh
+        finally:
+            _release_locks(token, (keys[item] for item in items), version=version)
+
+    # Values being refreshed are still served to workers not holding the lock
+    refreshes = [item for item in refreshes if keys[item] in locked]
+
+    if stale_timeout and refreshes:
+        # Lock holder serves the stale value as well, and refreshes it in background
+        _run_in_background(compute_and_store, refreshes)
+        refreshes = []
+
+    to_compute = [item for item in misses if keys[item] in locked] + refreshes
+    to_wait = [item for item in misses if keys[item] not in locked]
+
+    if to_compute:
+        result.update(compute_and_store(to_compute))
+
+    if to_wait:
+        entries = _wait_for_entries((keys[item] for item in to_wait), version=version)
+        not_stored = []
+
+        for item in to_wait:
+            entry = entries.get(keys[item])
+
+            if entry:
+                result[item] = entry.value
+            else:
+                not_stored.append(item)
+
+        if not_stored:
+            # Falsy values aren't stored, so waiters compute them on their own
+            if cache_falsy:
+                logger.warning(
+                    f"Cache keys were not computed by their lock holders: "
+                    f"{[keys[item] for item in not_stored]}"
+                )
+
+            result.update(compute(not_stored))
+
+    return result
+
 
 class CachedFunction(Protocol[T]):
     cache_key: str
@@ -27,9 +281,14 @@ class CachedFunction(Protocol[T]):
 
 def cached_singleton(
     timeout: int | None = None,
+    *,
+    stale_timeout: int | None = None,
 ) -> Callable[[Callable[[], T]], CachedFunction[T]]:
     """
     Decorator for caching the result of a zero-argument function.
+    Recomputation is stampede-proof, see `_get_or_compute_many`.
+    With `stale_timeout`, the expired value is served for that many extra seconds
+    while it's refreshed in the background.
 
     Usage:
         @cached_singleton(timeout=3600)
@@ -52,18 +311,24 @@ def cached_singleton(
                     f"{fn.__qualname__}() is a cached zero-argument function "
                     f"and does not accept arguments"
                 )
-            result = cache.get(cache_key, _SENTINEL)
-            if result is _SENTINEL:
-                result = fn()
-                cache.set(cache_key, result, timeout)
-            return result
+            return _get_or_compute_many(
+                {None: cache_key},
+                lambda _: {None: fn()},
+                timeout=timeout,
+                stale_timeout=stale_timeout,
+            )[None]
 
         def clear_cache() -> None:
             cache.delete(cache_key)
 
         def refresh_cache() -> T:
+            started_at = time.monotonic()
             result = fn()
-            cache.set(cache_key, result, timeout)
+            cache.set(
+                cache_key,
+                _make_entry(result, timeout, time.monotonic() - started_at),
+                _storage_timeout(timeout, stale_timeout),
+            )
             return result
 
         wrapper.clear_cache = clear_cache
@@ -75,15 +340,27 @@ def cached_singleton(
     return decorator
 
 
-def cache_get_or_set(key, f: Callable, version: int = None, **kwargs):
-    # Try to get the result from the cache
-    result = cache.get(key, version=version)
-
-    if not result:
-        result = f()
-        cache.set(key, result, version=version, **kwargs)
+def cache_get_or_set(
+    key,
+    f: Callable,
+    version: int = None,
+    timeout: int | None = None,
+    stale_timeout: int | None = None,
+    cache_falsy: bool = False,
+):
+    """
+    Stampede-proof get or set of a single cache key, see `_get_or_compute_many`.
+    Falsy results are recomputed on every call unless `cache_falsy` is set
+    """
 
-    return result
+    return _get_or_compute_many(
+        {key: key},
+        lambda _: {key: f()},
+        timeout=timeout,
+        stale_timeout=stale_timeout,
+        version=version,
+        cache_falsy=cache_falsy,
+    )[key]
 
 
 def _default_key(func_name: str) -> Callable:
@@ -103,7 +380,14 @@ def cache_per_object(
     key_builder: Callable | None = None,  # ← was “callable | None”
     *,
     timeout: int | None = None,
+    stale_timeout: int | None = None,
 ):
+    """
+    Caches results of a function receiving a list of objects and returning
+    a {object: value} dict, per object.
+    Only missing objects are passed to the function, see `_get_or_compute_many`
+    """
+
     def decorator(fn):
         fqfn = f"{fn.__module__}.{fn.__qualname__}"
 
@@ -111,24 +395,12 @@ def cache_per_object(
         def wrapper(objects, *args, **kwargs) -> dict:
             kb = key_builder or _default_key(fqfn)
 
-            objs = list(objects)
-            keys = [kb(o, *args, **kwargs) for o in objs]
-            cached = cache.get_many(keys)
-
-            hits, misses, miss_keys = {}, [], {}
-            for o, k in zip(objs, keys):
-                if k in cached:
-                    hits[o] = cached[k]
-                else:
-                    misses.append(o)
-                    miss_keys[o] = k
-
-            if misses:
-                fresh = fn(misses, *args, **kwargs)
-                cache.set_many({miss_keys[o]: v for o, v in fresh.items()}, timeout)
-                hits.update(fresh)
-
-            return hits
+            return _get_or_compute_many(
+                {o: kb(o, *args, **kwargs) for o in objects},
+                lambda misses: fn(misses, *args, **kwargs),
+                timeout=timeout,
+                stale_timeout=stale_timeout,
+            )
 
         return wrapper
 
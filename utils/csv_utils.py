@@ -21,6 +21,7 @@ from questions.services.multiple_choice_handlers import get_all_options_from_his
 from questions.types import AggregationMethod
 from scoring.models import ArchivedScore, Score
 from users.models import User
+from utils.db import use_replica
 from utils.the_math.aggregations import get_aggregation_history
 from utils.the_math.formulas import (
     string_location_to_bucket_index,
@@ -29,6 +30,7 @@ from utils.the_math.formulas import (
 from utils.the_math.measures import percent_point_function
 
 
+@use_replica()
 def export_all_data_for_questions(
     questions: QuerySet[Question],
     aggregation_methods: list[AggregationMethod] | None = None,
@@ -117,6 +119,7 @@ def export_all_data_for_questions(
     )
 
 
+@use_replica()
 def export_data_for_questions(
     user_id: int | None,
     is_staff: bool,
@@ -0,0 +1,131 @@
+import json
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+DATA_EXPORT_CACHE_TIMEOUT = 60 * 30
+# Failed exports are kept shortly so polling clients get the error,
+# but a new request can be retried soon after
+DATA_EXPORT_FAILED_CACHE_TIMEOUT = 60
+DATA_EXPORTS_UPLOAD_TO = "data_exports"
+
+
+class DataExportStatus:
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
+def get_data_export_id(params: dict) -> str:
+    """
+    Generates id shared by identical data requests.
+    Salted with the SECRET_KEY, so ids can't be guessed from request params
+    and are safe to be polled without re-checking permissions
+    """
+
+    key_params = {
+        k: v for k, v in params.items() if k not in ("user_email", "filename")
+    }
+    key_params["question_ids"] = sorted(params["question_ids"])
+
+    # Exports of users without data access only contain their own forecasts
+    if (
+        params["is_staff"]
+        or params["has_data_access"]
+        or not params["include_user_data"]
+    ):
+        key_params["user_id"] = None
+
+    return salted_hmac(
+        "data_export", json.dumps(key_params, sort_keys=True, default=str)
+    ).hexdigest()
+
+
+def get_data_export_cache_key(export_id: str) -> str:
+    return f"data_export:{export_id}"
+
+
+def get_data_export(export_id: str) -> dict | None:
+    return cache.get(get_data_export_cache_key(export_id))
+
+
+def set_data_export(export_id: str, status: str, timeout: int, **kwargs) -> dict:
+    """
+    Updates the export status, keeping the rest of the stored export
+    """
+
+    export = {
+        **(get_data_export(export_id) or {}),
+        "id": export_id,
+        "status": status,
+        **kwargs,
+    }
+    cache.set(get_data_export_cache_key(export_id), export, timeout)
+
+    return export
+
+
+def get_data_export_file_name(filename: str) -> str:
+    """
+    Random storage path, so files can't be reached outside of the download view
+    """
+
+    return f"{DATA_EXPORTS_UPLOAD_TO}/{uuid.uuid4().hex}/{filename}"
+
+
+def request_data_export(params: dict, request_data: dict) -> dict:
+    """
+    Schedules export of validated data request params, see `validate_data_request`.
+    Identical requests are deduplicated and share the same result file.
+
+    The raw request data is stored along, so access to the export
+    can be re-checked for every user polling or downloading it
+    """
+
+    from utils.tasks import export_data_task
+
+    export_id = get_data_export_id(params)
+    export = {
+        "id": export_id,
+        "status": DataExportStatus.PENDING,
+        "request_data": request_data,
+    }
+
+    if cache.add(
+        get_data_export_cache_key(export_id), export, DATA_EXPORT_CACHE_TIMEOUT
+    ):
+        export_data_task.send(export_id, **params)
+
+        return export
+
+    return get_data_export(export_id) or export
+
+
+def delete_expired_data_exports() -> int:
+    """
+    Deletes export files which outlived their cache entries
+    """
+
+    expired_at = timezone.now() - timedelta(seconds=DATA_EXPORT_CACHE_TIMEOUT)
+    deleted = 0
+
+    try:
+        dirs, _ = default_storage.listdir(DATA_EXPORTS_UPLOAD_TO)
+    except FileNotFoundError:
+        return deleted
+
+    for dir_name in dirs:
+        path = f"{DATA_EXPORTS_UPLOAD_TO}/{dir_name}"
+
+        for filename in default_storage.listdir(path)[1]:
+            file_name = f"{path}/{filename}"
+
+            if default_storage.get_modified_time(file_name) < expired_at:
+                default_storage.delete(file_name)
+                deleted += 1
+
+    return deleted
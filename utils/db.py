@@ -1,6 +1,11 @@
-from contextlib import contextmanager
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 
-from django.db import connections, transaction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+REPLICA_DB_ALIAS = "replica"
 
 
 def paginate_cursor(
@@ -50,3 +55,130 @@ def transaction_repeatable_read(using: str = "default"):
             cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ;")
 
             yield
+
+
+@dataclass
+class _ReplicaRoutingState:
+    replica_enabled: bool = False
+    # Set once the current unit of work has written to the primary,
+    # so it keeps reading its own writes from there
+    primary_pinned: bool = False
+
+
+_replica_routing_state: ContextVar[_ReplicaRoutingState | None] = ContextVar(
+    "replica_routing_state", default=None
+)
+# Database being migrated, set by the migrate command signals
+_migrating_db_alias: ContextVar[str | None] = ContextVar(
+    "migrating_db_alias", default=None
+)
+
+
+def set_migrating_db_alias(alias: str | None):
+    _migrating_db_alias.set(alias)
+
+
+@contextmanager
+def replica_routing_scope(primary_pinned: bool = False):
+    """
+    Starts a unit of work (e.g. a request) whose writes pin its reads to the primary
+    """
+
+    token = _replica_routing_state.set(
+        _ReplicaRoutingState(primary_pinned=primary_pinned)
+    )
+
+    try:
+        yield
+    finally:
+        _replica_routing_state.reset(token)
+
+
+class use_replica(ContextDecorator):
+    """
+    Marks read-only code to read from the replica database, if one is configured.
+    Works as both a context manager and a decorator:
+
+        @use_replica()
+        def get_heavy_stats(): ...
+
+        with use_replica():
+            data = serialize_post_many(posts)
+
+    Reads stay on the primary once the enclosing request or unit of work has written.
+    """
+
+    def _recreate_cm(self):
+        # Decorated functions may run concurrently, so each call gets its own state
+        return self.__class__()
+
+    def __enter__(self):
+        self._scope = None
+        state = _replica_routing_state.get()
+
+        if state is None:
+            self._scope = replica_routing_scope()
+            self._scope.__enter__()
+            state = _replica_routing_state.get()
+
+        self._state = state
+        self._previous = state.replica_enabled
+        state.replica_enabled = True
+
+        return self
+
+    def __exit__(self, *exc):
+        self._state.replica_enabled = self._previous
+
+        if self._scope:
+            self._scope.__exit__(*exc)
+
+        return False
+
+
+def is_replica_configured() -> bool:
+    return settings.DATABASE_REPLICA_ENABLED and REPLICA_DB_ALIAS in settings.DATABASES
+
+
+class ReplicaRouter:
+    """
+    Sends reads of code marked with `use_replica` to the replica database.
+    All writes go to the primary, and pin reads of the current unit of work to it.
+
+    Data migrations query models without `using`, so while a database is migrated
+    (e.g. the replica test database), its queries are sent to it.
+    """
+
+    def db_for_read(self, model, **hints):
+        if migrating_db_alias := _migrating_db_alias.get():
+            return migrating_db_alias
+
+        state = _replica_routing_state.get()
+
+        if (
+            state
+            and state.replica_enabled
+            and not state.primary_pinned
+            and is_replica_configured()
+        ):
+            return REPLICA_DB_ALIAS
+
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if migrating_db_alias := _migrating_db_alias.get():
+            return migrating_db_alias
+
+        state = _replica_routing_state.get()
+
+        if state:
+            state.primary_pinned = True
+
+        # Objects read from the replica are written to the primary as well
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}:
+            return True
+
+        return None
@@ -2,7 +2,8 @@ import functools
 from typing import Callable
 
 from django.conf import settings
-from dramatiq import RateLimitExceeded
+from dramatiq import Middleware, RateLimitExceeded
+from dramatiq.middleware import SkipMessage
 from dramatiq.rate_limits import ConcurrentRateLimiter
 from dramatiq.rate_limits.backends import RedisBackend
 
@@ -49,3 +50,34 @@ def task_concurrent_limit(key: Callable | str, **limiter_kwargs):
         return wrapper
 
     return f
+
+
+class CronJobTelemetryMiddleware(Middleware):
+    """
+    Tracks runs of actors enqueued by the cron scheduler
+    with the `cron_job_id` message option, see `misc.services.cron.send_cron_job`
+    """
+
+    def __init__(self):
+        self.trackers = {}
+
+    def before_process_message(self, broker, message):
+        job_id = message.options.get("cron_job_id")
+
+        if not job_id:
+            return
+
+        from misc.services.cron import CronJobTracker
+
+        tracker = CronJobTracker(job_id)
+
+        if not tracker.start():
+            raise SkipMessage()
+
+        self.trackers[message.message_id] = tracker
+
+    def after_process_message(self, broker, message, *, result=None, exception=None):
+        if tracker := self.trackers.pop(message.message_id, None):
+            tracker.finish(result=result, exception=exception)
+
+    after_skip_message = after_process_message
@@ -1,4 +1,5 @@
 import logging
+import random
 
 from django.conf import settings
 from django.http import JsonResponse, HttpResponse, Http404
@@ -7,6 +8,8 @@ from django.utils.translation import activate
 from rest_framework.request import Request as DRFRequest
 from rest_framework.settings import api_settings
 
+from utils.db import replica_routing_scope
+
 logger = logging.getLogger(__name__)
 
 
@@ -122,3 +125,48 @@ class HealthCheckMiddleware(MiddlewareMixin):
     def process_request(self, request):
         if request.META["PATH_INFO"] == "/api/healthcheck/":
             return HttpResponse("ok")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Scopes replica routing to the request.
+    Unsafe requests, as well as requests which wrote to the primary,
+    read their own writes from the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with replica_routing_scope(
+            primary_pinned=request.method not in ("GET", "HEAD", "OPTIONS")
+        ):
+            return self.get_response(request)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a PROFILING_SAMPLE_RATE fraction of requests,
+    aggregating their stats per endpoint (see `endpoint_stats` command)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        from misc.services.profiling import RequestProfiler
+
+        profiler = RequestProfiler()
+        profiler.start()
+
+        try:
+            return self.get_response(request)
+        finally:
+            match = request.resolver_match
+            view_name = (
+                (match.view_name or match._func_path) if match else "<unresolved>"
+            )
+            profiler.finish(f"{request.method} {view_name}")
@@ -268,6 +268,19 @@ class ArrayLength(models.Func):
     function = "CARDINALITY"
 
 
+class PercentileCont(models.Aggregate):
+    """
+    Continuous percentile of the expression, e.g. PercentileCont("duration", 0.95)
+    """
+
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = models.FloatField()
+
+    def __init__(self, expression, percentile: float, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
 def model_update(
     *,
     instance: DjangoModelType,
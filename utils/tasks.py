@@ -4,6 +4,8 @@ import logging
 import dramatiq
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.mail import EmailMessage
 
 from questions.types import AggregationMethod
@@ -154,6 +156,51 @@ def email_data_task(
         email.send()
 
 
+@dramatiq.actor
+def export_data_task(
+    export_id: str,
+    filename: str,
+    joined_before_date: str | None = None,
+    **kwargs,
+):
+    from utils.csv_utils import export_data_for_questions
+    from utils.data_exports import (
+        DATA_EXPORT_CACHE_TIMEOUT,
+        DATA_EXPORT_FAILED_CACHE_TIMEOUT,
+        DataExportStatus,
+        get_data_export_file_name,
+        set_data_export,
+    )
+
+    try:
+        data = export_data_for_questions(
+            joined_before_date=(
+                datetime.datetime.fromisoformat(joined_before_date)
+                if joined_before_date
+                else None
+            ),
+            **kwargs,
+        )
+
+        assert data is not None, "No data generated"
+
+        file_name = default_storage.save(
+            get_data_export_file_name(filename), ContentFile(data)
+        )
+        set_data_export(
+            export_id,
+            DataExportStatus.READY,
+            DATA_EXPORT_CACHE_TIMEOUT,
+            file_name=file_name,
+            filename=filename,
+        )
+    except Exception:
+        logger.exception(f"Failed to generate data export {export_id}")
+        set_data_export(
+            export_id, DataExportStatus.FAILED, DATA_EXPORT_FAILED_CACHE_TIMEOUT
+        )
+
+
 @dramatiq.actor
 def email_user_their_data_task(user_id: int):
     from users.models import User
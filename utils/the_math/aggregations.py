@@ -790,6 +790,94 @@ def get_aggregations_at_time(
     return aggregations
 
 
+# Latest stored default aggregation of each (question, timestamp) lookup
+# that is still active at the timestamp.
+# Resolved with one index scan of (method, question, -start_time) per lookup.
+# Stored history is minimized, so a row can span several forecast updates.
+# It only matches when no forecast started or ended between the row's start
+# and the timestamp, i.e. the set of active forecasts is unchanged
+STORED_AGGREGATIONS_AT_TIMES_SQL = """
+SELECT af.*, q.type AS question_type, lookup.idx AS lookup_index
+FROM UNNEST(%(question_ids)s::int[], %(timestamps)s::timestamptz[])
+    WITH ORDINALITY AS lookup (question_id, ts, idx)
+JOIN {question_table} q ON q.id = lookup.question_id
+CROSS JOIN LATERAL (
+    SELECT *
+    FROM {aggregate_forecast_table} af
+    WHERE af.question_id = lookup.question_id
+      AND af.method = q.default_aggregation_method
+      AND af.start_time <= lookup.ts
+    ORDER BY af.start_time DESC
+    LIMIT 1
+) af
+WHERE (af.end_time IS NULL OR af.end_time > lookup.ts)
+  AND NOT EXISTS (
+    SELECT 1
+    FROM {forecast_table} f
+    WHERE f.question_id = lookup.question_id
+      AND f.start_time > af.start_time
+      AND f.start_time <= lookup.ts
+  )
+  AND NOT EXISTS (
+    SELECT 1
+    FROM {forecast_table} f
+    WHERE f.question_id = lookup.question_id
+      AND f.end_time > af.start_time
+      AND f.end_time <= lookup.ts
+  )
+""".format(
+    question_table=Question._meta.db_table,
+    aggregate_forecast_table=AggregateForecast._meta.db_table,
+    forecast_table=Forecast._meta.db_table,
+)
+
+
+def get_default_aggregations_at_times(
+    lookups: Sequence[tuple[Question, datetime]],
+    batch_size: int = 500,
+) -> list[AggregateForecast | None]:
+    """
+    Bulk version of `get_aggregations_at_time` for the default aggregation method
+    of each question, with stats.
+
+    Lookups are answered from the stored AggregateForecast history when it
+    matches the forecasts active at the timestamp, falling back to
+    live aggregation otherwise
+    """
+
+    results: list[AggregateForecast | None] = [None] * len(lookups)
+
+    for offset in range(0, len(lookups), batch_size):
+        batch = lookups[offset : offset + batch_size]
+        stored = AggregateForecast.objects.raw(
+            STORED_AGGREGATIONS_AT_TIMES_SQL,
+            {
+                "question_ids": [question.id for question, _ in batch],
+                "timestamps": [time for _, time in batch],
+            },
+        )
+
+        for aggregate_forecast in stored:
+            # ORDINALITY is 1-based
+            idx = offset + aggregate_forecast.lookup_index - 1
+            # Avoids a query per row when the question is accessed, e.g. by get_pmf
+            aggregate_forecast.question = lookups[idx][0]
+            results[idx] = aggregate_forecast
+
+    for idx, (question, time) in enumerate(lookups):
+        if results[idx] is None:
+            method = question.default_aggregation_method
+            results[idx] = get_aggregations_at_time(
+                question=question,
+                time=time,
+                aggregation_methods=[method],
+                include_stats=True,
+                include_bots=question.include_bots_in_aggregates,
+            ).get(method)
+
+    return results
+
+
 def summarize_array(
     array: list[float],
     size: int,
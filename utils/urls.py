@@ -13,6 +13,21 @@ urlpatterns = [
         views.email_data_view,
         name="email_data",
     ),
+    path(
+        "data/exports/",
+        views.data_export_create_view,
+        name="data_export_create",
+    ),
+    path(
+        "data/exports/<str:export_id>/",
+        views.data_export_detail_view,
+        name="data_export_detail",
+    ),
+    path(
+        "data/exports/<str:export_id>/download/",
+        views.data_export_download_view,
+        name="data_export_download",
+    ),
     path(
         "data/download/",
         views.download_data_view,
@@ -1,6 +1,9 @@
+from django.core.files.storage import default_storage
 from django.db.models import Q
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.exceptions import ValidationError, NotFound
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -17,6 +20,12 @@ from questions.models import Question
 from questions.serializers.common import serialize_question
 from users.models import User
 from utils.csv_utils import export_data_for_questions
+from utils.data_exports import (
+    DataExportStatus,
+    get_data_export,
+    get_data_export_id,
+    request_data_export,
+)
 from utils.serializers import DataGetRequestSerializer, DataPostRequestSerializer
 from utils.tasks import email_data_task
 from utils.the_math.aggregations import get_aggregation_history
@@ -119,8 +128,17 @@ def aggregation_explorer_api_view(request) -> Response:
     return Response(data)
 
 
-def validate_data_request(request: Request, **kwargs):
-    if request.method == "GET":
+def validate_data_request(request: Request, data: dict | None = None, **kwargs):
+    """
+    Validates data request of the current user.
+    Request payload can be overridden with `data`, e.g. to re-check a stored request
+    """
+
+    from_query_params = data is None and request.method == "GET"
+
+    if data is not None:
+        data = data.copy()
+    elif from_query_params:
         data = (request.GET or {}).copy()
     else:
         data = (request.data or {}).copy()
@@ -139,7 +157,7 @@ def validate_data_request(request: Request, **kwargs):
 
     # Handle multiple post_ids
     # For GET requests, use getlist to handle repeated query params (post_ids=1&post_ids=2)
-    if request.method == "GET":
+    if from_query_params:
         post_ids = request.GET.getlist("post_ids") or []
     else:
         post_ids = data.get("post_ids") or []
@@ -147,15 +165,21 @@ def validate_data_request(request: Request, **kwargs):
         post_ids = [post_id] + [pid for pid in post_ids if str(pid) != str(post_id)]
 
     if post_ids:
-        posts = list(Post.objects.filter(id__in=post_ids))
+        # Posts the user can't view are excluded by the permission annotation
+        posts = list(
+            Post.objects.filter(id__in=post_ids).annotate_user_permission(user=user)
+        )
         if len(posts) != len(post_ids):
-            found_ids = {p.id for p in posts}
+            found_ids = set(
+                Post.objects.filter(id__in=post_ids).values_list("id", flat=True)
+            )
             missing_ids = [pid for pid in post_ids if int(pid) not in found_ids]
-            raise NotFound(f"Posts not found: {missing_ids}")
+            if missing_ids:
+                raise NotFound(f"Posts not found: {missing_ids}")
+            ObjectPermission.can_view(None, raise_exception=True)
         # Check permissions for all posts
         for post in posts:
-            permission = get_post_permission_for_user(post, user=user)
-            ObjectPermission.can_view(permission, raise_exception=True)
+            ObjectPermission.can_view(post.user_permission, raise_exception=True)
     elif question:
         post = question.get_post()
         if post:
@@ -175,8 +199,12 @@ def validate_data_request(request: Request, **kwargs):
     # Context for the serializer
     is_staff = user.is_authenticated and user.is_staff
     project_ids = [project.id] if project else []
-    for post in posts:
-        project_ids.extend(post.projects.values_list("id", flat=True))
+    if posts:
+        project_ids.extend(
+            Post.projects.through.objects.filter(post__in=posts).values_list(
+                "project_id", flat=True
+            )
+        )
     data_access_entries = UserDataAccess.objects.filter(
         (Q(post__in=posts) if posts else Q())
         | (Q(project_id__in=project_ids) if project_ids else Q())
@@ -221,8 +249,7 @@ def validate_data_request(request: Request, **kwargs):
     if question:
         questions = [question]
     elif posts:
-        for post in posts:
-            questions.extend(post.get_questions())
+        questions = list(Question.objects.filter(post__in=posts))
     elif project:
         questions = list(
             Question.objects.filter(
@@ -280,6 +307,94 @@ def email_data_view(request: Request):
     return Response({"message": "Email scheduled to be sent"}, status=200)
 
 
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def data_export_create_view(request: Request):
+    """
+    Accepts data request as a background export job.
+    Clients poll `data_export_detail_view` until the download url is ready
+    """
+
+    validated_task_params = validate_data_request(request)
+    # Dramatiq uses JSON serialization, so convert datetime to ISO string
+    if validated_task_params.get("joined_before_date") is not None:
+        validated_task_params["joined_before_date"] = validated_task_params[
+            "joined_before_date"
+        ].isoformat()
+
+    export = request_data_export(validated_task_params, request.data.copy())
+
+    return Response(
+        serialize_data_export(request, export),
+        status=get_data_export_response_status(export),
+    )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def data_export_detail_view(request: Request, export_id: str):
+    export = get_data_export_for_user(request, export_id)
+
+    return Response(
+        serialize_data_export(request, export),
+        status=get_data_export_response_status(export),
+    )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def data_export_download_view(request: Request, export_id: str):
+    export = get_data_export_for_user(request, export_id)
+
+    if export["status"] != DataExportStatus.READY:
+        raise NotFound("Data export is not ready")
+
+    try:
+        file = default_storage.open(export["file_name"])
+    except FileNotFoundError:
+        raise NotFound("Data export not found or expired")
+
+    return FileResponse(file, as_attachment=True, filename=export["filename"])
+
+
+def get_data_export_for_user(request: Request, export_id: str) -> dict:
+    """
+    Export ids are derived from the access level of the requester,
+    so re-validating the stored request only matches the export
+    while the current user has the same access to its data
+    """
+
+    export = get_data_export(export_id)
+
+    if not export or "request_data" not in export:
+        raise NotFound("Data export not found or expired")
+
+    params = validate_data_request(request, data=export["request_data"])
+
+    if get_data_export_id(params) != export_id:
+        raise NotFound("Data export not found or expired")
+
+    return export
+
+
+def serialize_data_export(request: Request, export: dict) -> dict:
+    data = {"id": export["id"], "status": export["status"]}
+
+    if export["status"] == DataExportStatus.READY:
+        data["url"] = request.build_absolute_uri(
+            reverse("data_export_download", kwargs={"export_id": export["id"]})
+        )
+
+    return data
+
+
+def get_data_export_response_status(export: dict) -> int:
+    if export["status"] == DataExportStatus.PENDING:
+        return status.HTTP_202_ACCEPTED
+
+    return status.HTTP_200_OK
+
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def download_data_view(request: Request):